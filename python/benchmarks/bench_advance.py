@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Compares GildedRose.advance(days) with calling update_quality() once per day.
+
+Run from the python folder, e.g. for 10000 items:
+
+    python -m benchmarks.bench_advance 10000
+"""
+import random
+import sys
+import time
+
+from gilded_rose_enhanced import Item, GildedRose
+
+NAMES = [
+    "+5 Dexterity Vest",
+    "Aged Brie",
+    "Sulfuras, Hand of Ragnaros",
+    "Backstage passes to a TAFKAL80ETC concert",
+    "Conjured",
+]
+
+
+def make_items(count, seed=42):
+    rng = random.Random(seed)
+    return [Item(rng.choice(NAMES), rng.randint(-5, 30), rng.randint(0, 50)) for _ in range(count)]
+
+
+def time_loop(count, days):
+    gilded_rose = GildedRose(make_items(count))
+    start = time.perf_counter()
+    for _ in range(days):
+        gilded_rose.update_quality()
+    return time.perf_counter() - start
+
+
+def time_advance(count, days):
+    gilded_rose = GildedRose(make_items(count))
+    start = time.perf_counter()
+    gilded_rose.advance(days)
+    return time.perf_counter() - start
+
+
+def main(count=10000):
+    print("%d items" % count)
+    print("%6s %12s %12s %9s" % ("days", "loop (s)", "advance (s)", "speedup"))
+    for days in (30, 90, 365, 900):
+        loop = time_loop(count, days)
+        advance = time_advance(count, days)
+        print("%6d %12.4f %12.4f %8.1fx" % (days, loop, advance, loop / advance))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
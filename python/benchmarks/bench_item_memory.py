@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the memory used per item by the item representations.
+
+Run from the python folder, e.g. for 100000 items:
+
+    python -m benchmarks.bench_item_memory 100000
+"""
+import sys
+import tracemalloc
+
+from gilded_rose_enhanced import Item
+from compact_item import CompactItem, ItemColumns
+from benchmarks.bench_advance import make_items
+
+
+def as_list(item_type):
+    return lambda rows: [item_type(item.name, item.sell_in, item.quality) for item in rows]
+
+
+def measure(build, rows):
+    tracemalloc.start()
+    inventory = build(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del inventory
+    return size
+
+
+def main(count=100000):
+    rows = make_items(count)
+    print("%d items" % count)
+    print("%-14s %14s" % ("representation", "bytes per item"))
+    for label, build in (("Item", as_list(Item)),
+                         ("CompactItem", as_list(CompactItem)),
+                         ("ItemColumns", ItemColumns.from_items)):
+        print("%-14s %14.1f" % (label, measure(build, rows) / count))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
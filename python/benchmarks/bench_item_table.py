@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Compares one daily update of the columnar ItemTable with the object-based GildedRose.
+
+Run from the python folder; sizes default to 10k, 1M and 10M items:
+
+    python -m benchmarks.bench_item_table 10000 1000000 10000000
+"""
+import sys
+import time
+
+from gilded_rose_enhanced import GildedRose
+from item_table import ItemTable
+from benchmarks.bench_advance import make_items
+
+
+def time_objects(items):
+    gilded_rose = GildedRose(items)
+    start = time.perf_counter()
+    gilded_rose.update_quality()
+    return time.perf_counter() - start
+
+
+def time_table(table):
+    start = time.perf_counter()
+    table.update_quality()
+    return time.perf_counter() - start
+
+
+def main(sizes=(10000, 1000000, 10000000)):
+    print("%10s %12s %12s %9s" % ("items", "objects (s)", "table (s)", "speedup"))
+    for count in sizes:
+        items = make_items(count)
+        table = ItemTable.from_items(items)
+        objects = time_objects(items)
+        columns = time_table(table)
+        print("%10d %12.4f %12.4f %8.1fx" % (count, objects, columns, objects / columns))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or (10000, 1000000, 10000000))
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Measures the cost of the change feed and the undo journal against the plain update.
+
+Run from the python folder, e.g. for 100000 items:
+
+    python -m benchmarks.bench_journal 100000
+"""
+import sys
+import time
+
+from gilded_rose_enhanced import GildedRose
+from benchmarks.bench_advance import make_items
+
+
+def time_updates(gilded_rose, days):
+    start = time.perf_counter()
+    for _ in range(days):
+        gilded_rose.update_quality()
+    return (time.perf_counter() - start) / days
+
+
+def time_undo(gilded_rose, days):
+    start = time.perf_counter()
+    for _ in range(days):
+        gilded_rose.undo()
+    return (time.perf_counter() - start) / days
+
+
+def main(count=100000, days=10):
+    print("%d items, %d days" % (count, days))
+    print("%-14s %12s" % ("mode", "ms per day"))
+    plain = time_updates(GildedRose(make_items(count)), days)
+    print("%-14s %12.2f" % ("plain", plain * 1000))
+    print("%-14s %12.2f" % ("change feed", time_updates(GildedRose(make_items(count), change_feed=True), days) * 1000))
+    journaled = GildedRose(make_items(count), journal_size=days)
+    print("%-14s %12.2f" % ("journal", time_updates(journaled, days) * 1000))
+    print("%-14s %12.2f" % ("undo", time_undo(journaled, days) * 1000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
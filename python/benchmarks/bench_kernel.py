@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the compiled kernel with the legacy engine and the strategy dispatch.
+
+Run from the python folder, e.g. for 100000 items over 10 days:
+
+    python -m benchmarks.bench_kernel 100000 10
+"""
+import sys
+import time
+
+import gilded_rose
+from gilded_rose_enhanced import GildedRose
+from kernel_compiler import compile_kernel
+from benchmarks.bench_advance import make_items
+
+
+def time_days(update, days):
+    start = time.perf_counter()
+    for _ in range(days):
+        update()
+    return time.perf_counter() - start
+
+
+def main(count=100000, days=10):
+    start = time.perf_counter()
+    kernel = compile_kernel()
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    compile_kernel()
+    cached_time = time.perf_counter() - start
+
+    legacy = time_days(gilded_rose.GildedRose(make_items(count)).update_quality, days)
+    dispatch = time_days(GildedRose(make_items(count)).update_quality, days)
+    items = make_items(count)
+    compiled = time_days(lambda: kernel(items), days)
+
+    print("%d items, %d days (compile %.2f ms, cached %.2f ms)"
+          % (count, days, compile_time * 1000, cached_time * 1000))
+    print("%-22s %10s %9s" % ("engine", "time (s)", "speedup"))
+    for label, elapsed in (("legacy gilded_rose", legacy), ("strategy dispatch", dispatch),
+                           ("compiled kernel", compiled)):
+        print("%-22s %10.4f %8.2fx" % (label, elapsed, legacy / elapsed))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Measures how the process-pool update scales from 1 to N worker processes.
+
+Run from the python folder, e.g. for 1000000 items on up to 8 workers:
+
+    python -m benchmarks.bench_parallel 1000000 8
+"""
+import os
+import sys
+import time
+
+from gilded_rose_enhanced import GildedRose
+from gilded_rose_parallel import ParallelGildedRose
+from benchmarks.bench_advance import make_items
+
+
+def time_update(engine):
+    start = time.perf_counter()
+    engine.update_quality()
+    return time.perf_counter() - start
+
+
+def main(count=1000000, max_workers=None):
+    max_workers = max_workers or os.cpu_count() or 1
+    serial = time_update(GildedRose(make_items(count)))
+    print("%d items, serial update %.4f s" % (count, serial))
+    print("%8s %12s %9s" % ("workers", "update (s)", "speedup"))
+    for workers in range(1, max_workers + 1):
+        with ParallelGildedRose(make_items(count), workers=workers, serial_threshold=0) as parallel:
+            parallel.update_quality()  # start the workers
+            elapsed = time_update(parallel)
+        print("%8d %12.4f %8.2fx" % (workers, elapsed, serial / elapsed))
+    with ParallelGildedRose(make_items(count), workers=max_workers) as parallel:
+        print("measured serial threshold with %d workers: %s items" % (max_workers, parallel.calibrate()))
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
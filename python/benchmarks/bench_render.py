@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Compares printing the daily listings item by item with rendering them through DayRenderer.
+
+Both write the listings of the items for a number of days to the null device, updating
+the items after each day as the texttest fixture does; the update is timed with both. Run from the python folder,
+e.g. for 100000 items and 30 days:
+
+    python -m benchmarks.bench_render 100000 30
+"""
+import os
+import sys
+import time
+
+from gilded_rose_enhanced import GildedRose
+from item_renderer import DayRenderer
+from benchmarks.bench_advance import make_items
+
+
+def time_print(items, days):
+    gilded_rose = GildedRose(items)
+    with open(os.devnull, "w", encoding="utf-8") as stream:
+        start = time.perf_counter()
+        for day in range(days):
+            print("-------- day %s --------" % day, file=stream)
+            print("name, sellIn, quality", file=stream)
+            for item in items:
+                print(item, file=stream)
+            print("", file=stream)
+            gilded_rose.update_quality()
+        return time.perf_counter() - start
+
+
+def time_renderer(items, days):
+    gilded_rose = GildedRose(items)
+    with open(os.devnull, "wb") as stream:
+        start = time.perf_counter()
+        with DayRenderer(stream) as renderer:
+            for day in range(days):
+                renderer.render_day(day, items)
+                gilded_rose.update_quality()
+        return time.perf_counter() - start
+
+
+def main(count=100000, days=30):
+    print("%d items, %d days" % (count, days))
+    for label, render in (("print", time_print), ("renderer", time_renderer)):
+        print("%-10s %10.1f ms" % (label, min(render(make_items(count), days) for _ in range(3)) * 1000))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
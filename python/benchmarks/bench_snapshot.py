@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the memory kept by a year of daily snapshots with a year of deep copies.
+
+Run from the python folder, e.g. for 10000 items:
+
+    python -m benchmarks.bench_snapshot 10000
+"""
+import copy
+import sys
+import tracemalloc
+
+from gilded_rose_enhanced import GildedRose
+from benchmarks.bench_advance import make_items
+
+
+def measure(take, count, days):
+    gilded_rose = GildedRose(make_items(count))
+    tracemalloc.start()
+    kept = []
+    for _ in range(days):
+        gilded_rose.update_quality()
+        kept.append(take(gilded_rose))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def main(count=10000, days=365):
+    print("%d items, %d days" % (count, days))
+    print("%-10s %14s" % ("copies", "bytes per day"))
+    for label, take in (("deepcopy", lambda gilded_rose: copy.deepcopy(gilded_rose.items)),
+                        ("snapshot", lambda gilded_rose: gilded_rose.snapshot())):
+        print("%-10s %14.1f" % (label, measure(take, count, days) / days))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the SQL daily updates of an SQLite inventory.
+
+Times one day with the UPDATE statements of the kata's script (one scan of the table per
+statement), one day with the single CASE statement, and a number of days both as that
+many single statements and as one closed-form `:days` statement. Run from the python
+folder, e.g. with 1000000 items and 30 days:
+
+    python -m benchmarks.bench_sql_update 1000000 30
+"""
+import sys
+import time
+
+from sqlite_inventory import ADVANCE, UPDATE_QUALITY, UPDATE_QUALITY_STATEMENTS, SqliteInventory
+from benchmarks.bench_advance import make_items
+
+
+def timed(inventory, statements, parameters=()):
+    connection = inventory.connection
+    start = time.perf_counter()
+    with connection:
+        for statement in statements:
+            connection.execute(statement, parameters)
+    return time.perf_counter() - start
+
+
+def main(count=1000000, days=30):
+    with SqliteInventory.from_items(make_items(count)) as inventory:
+        statements = min(timed(inventory, UPDATE_QUALITY_STATEMENTS) for _ in range(3))
+        single = min(timed(inventory, [UPDATE_QUALITY]) for _ in range(3))
+        daily = timed(inventory, [UPDATE_QUALITY] * days)
+        advance = min(timed(inventory, [ADVANCE], {"days": days}) for _ in range(3))
+    print("%d items" % count)
+    for label, seconds in (("%d statements, 1 day" % len(UPDATE_QUALITY_STATEMENTS), statements),
+                           ("single statement, 1 day", single),
+                           ("single statement, %d days" % days, daily),
+                           (":days statement, %d days" % days, advance)):
+        print("%-28s %10.1f ms" % (label, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Compares the set-based SQL update of an SQLite inventory with Python updates, by size.
+
+For items stored in the table, the Python path reads them, updates them with GildedRose
+and writes them back, while the SQL path runs the UPDATE statement of sqlite_inventory.
+The update of items already held in memory is timed as well. For each Python path the
+script reports the smallest size at which SQL was faster, or that there was no crossover
+within the sizes measured, with the ratio at the largest. Run from the python folder,
+e.g. up to 1000000 items:
+
+    python -m benchmarks.bench_sqlite 1000000
+"""
+import sys
+import time
+
+from gilded_rose_enhanced import Item, GildedRose
+from sqlite_inventory import SqliteInventory
+from benchmarks.bench_advance import make_items
+
+
+def time_round_trip(inventory):
+    connection = inventory.connection
+    start = time.perf_counter()
+    rows = connection.execute("SELECT rowid, name, sellIn, quality FROM item").fetchall()
+    items = [Item(name, sell_in, quality) for _, name, sell_in, quality in rows]
+    GildedRose(items).update_quality()
+    with connection:
+        connection.executemany("UPDATE item SET sellIn = ?, quality = ? WHERE rowid = ?",
+                               ((item.sell_in, item.quality, row[0]) for item, row in zip(items, rows)))
+    return time.perf_counter() - start
+
+
+def time_objects(gilded_rose):
+    start = time.perf_counter()
+    gilded_rose.update_quality()
+    return time.perf_counter() - start
+
+
+def time_sql(inventory):
+    start = time.perf_counter()
+    inventory.update_quality()
+    return time.perf_counter() - start
+
+
+def main(largest=1000000):
+    print("%10s %14s %12s %12s" % ("items", "round trip ms", "objects ms", "sql ms"))
+    crossovers = {"round trip": None, "objects": None}
+    ratios = {}
+    measured = 0
+    count = 1
+    while count <= largest:
+        gilded_rose = GildedRose(make_items(count))
+        with SqliteInventory.from_items(make_items(count)) as inventory:
+            round_trip = min(time_round_trip(inventory) for _ in range(3))
+            objects = min(time_objects(gilded_rose) for _ in range(3))
+            sql = min(time_sql(inventory) for _ in range(3))
+        print("%10d %14.3f %12.3f %12.3f" % (count, round_trip * 1000, objects * 1000, sql * 1000))
+        for label, python in (("round trip", round_trip), ("objects", objects)):
+            if crossovers[label] is None and sql < python:
+                crossovers[label] = count
+            ratios[label] = sql / python
+        measured = count
+        count *= 10
+    for label, crossover in crossovers.items():
+        if crossover is None:
+            print("%s: no crossover within %d items, SQL %.1fx slower at %d" % (label, measured, ratios[label], measured))
+        else:
+            print("%s: SQL was faster from %d items" % (label, crossover))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
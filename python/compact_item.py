@@ -0,0 +1,156 @@
+
+"""
+    This module contains compact item representations for large Gilded Rose inventories.
+
+    Both types behave like `Item` (`name`, `sell_in`, `quality` and `__repr__`), so they can be
+    given to `GildedRose` in place of regular items.
+
+    Classes:
+        CompactItem: An item without a per-instance `__dict__`.
+        ItemColumns: An inventory stored as `array` columns with dictionary-encoded names.
+        ItemView: A flyweight view of one row of an ItemColumns inventory.
+
+"""
+from array import array
+
+from gilded_rose_enhanced import NameDictionary
+
+
+class CompactItem:
+    """
+    An item storing its attributes in `__slots__` instead of a per-instance `__dict__`.
+
+    Attributes:
+        name (str): The name of the item.
+        sell_in (int): The number of days we have to sell the item.
+        quality (int): The quality of the item.
+    """
+    __slots__ = ("name", "sell_in", "quality")
+
+    def __init__(self, name, sell_in, quality):
+        self.name = name
+        self.sell_in = sell_in
+        self.quality = quality
+
+    def __repr__(self):
+        return "%s, %s, %s" % (self.name, self.sell_in, self.quality)
+
+
+class ItemColumns:
+    """
+    An inventory stored as typed columns, one row per item.
+
+    The sell_in values live in an `array('i')`, the qualities in an `array('h')` and
+    the names are dictionary-encoded: each row stores the id of its name in a
+    `NameDictionary`. Indexing or iterating yields `ItemView` objects.
+
+    Attributes:
+        dictionary (NameDictionary): The distinct item names, by name id.
+        names (list): The distinct item names, indexed by name id.
+        name_ids (array): The name id of each row.
+        sell_in (array): The sell_in value of each row.
+        quality (array): The quality of each row.
+
+    Methods:
+        append(name, sell_in, quality): Adds a row.
+        from_items(items): Builds the columns from a list of items.
+        name_id(name): Returns the id of a name, adding it to the dictionary if needed.
+    """
+
+    def __init__(self):
+        self.dictionary = NameDictionary()
+        self.name_ids = array("I")
+        self.sell_in = array("i")
+        self.quality = array("h")
+
+    @classmethod
+    def from_items(cls, items):
+        """
+        Builds the columns from a list of items.
+
+        Args:
+            items (iterable): Objects with `name`, `sell_in` and `quality` attributes.
+
+        Returns:
+            ItemColumns: A new inventory holding a copy of the items.
+        """
+        columns = cls()
+        for item in items:
+            columns.append(item.name, item.sell_in, item.quality)
+        return columns
+
+    @property
+    def names(self):
+        return self.dictionary.names
+
+    def name_id(self, name):
+        """
+        Returns the id of the given name, adding it to the name dictionary if needed.
+        """
+        return self.dictionary.intern(name)
+
+    def append(self, name, sell_in, quality):
+        """
+        Adds a row for an item.
+
+        Raises:
+            OverflowError: If `sell_in` or `quality` does not fit in its column type.
+        """
+        self.sell_in.append(sell_in)
+        self.quality.append(quality)
+        self.name_ids.append(self.name_id(name))
+
+    def __len__(self):
+        return len(self.name_ids)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("item index out of range")
+        return ItemView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ItemView(self, index)
+
+
+class ItemView:
+    """
+    A view of one row of an ItemColumns inventory, behaving like an `Item`.
+
+    Reading or assigning `name`, `sell_in` or `quality` reads or writes the columns.
+    """
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    @property
+    def name(self):
+        columns = self._columns
+        return columns.names[columns.name_ids[self._index]]
+
+    @name.setter
+    def name(self, name):
+        self._columns.name_ids[self._index] = self._columns.name_id(name)
+
+    @property
+    def sell_in(self):
+        return self._columns.sell_in[self._index]
+
+    @sell_in.setter
+    def sell_in(self, sell_in):
+        self._columns.sell_in[self._index] = sell_in
+
+    @property
+    def quality(self):
+        return self._columns.quality[self._index]
+
+    @quality.setter
+    def quality(self, quality):
+        self._columns.quality[self._index] = quality
+
+    def __repr__(self):
+        return "%s, %s, %s" % (self.name, self.sell_in, self.quality)
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+The fixture server: answers fixture requests from a stream or a Unix socket, so that a
+test suite starts Python and imports the engine once rather than for every case. It is
+imported by `texttest_fixture.py --serve` only, keeping the plain fixture's start lean.
+
+A request is one line of JSON: {"days": 30, "inventory": null, "format": "texttest"}, each
+field optional, or {"stop": true} to stop the server. The answer is a line "STATUS LENGTH"
+followed by LENGTH bytes: the output of the fixture when STATUS is 0, an error message
+otherwise. When a source file of the fixture or of the engine modules it imported has
+changed since the server started, the server answers STATUS 2 and stops instead of running
+stale code.
+"""
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+
+from texttest_fixture import render
+
+STALE = 2  # answer status of a server whose sources changed
+
+
+def answer(request):
+    """
+    Returns the framed answer to one request.
+    """
+    output = io.BytesIO()
+    try:
+        render(output, request.get("days"), request.get("inventory"), request.get("format", "texttest"))
+    except Exception as error:  # the server outlives bad requests
+        message = ("%s: %s" % (type(error).__name__, error)).encode("utf-8")
+        return b"1 %d\n" % len(message) + message
+    return b"0 %d\n" % len(output.getvalue()) + output.getvalue()
+
+
+def source_stamps():
+    """
+    Returns the modification time of each loaded module from the fixture's directory.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    stamps = {}
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == directory:
+            path = os.path.abspath(path)
+            stamps[path] = os.stat(path).st_mtime_ns
+    return stamps
+
+
+def _sources_changed(stamps):
+    for path, mtime in stamps.items():
+        try:
+            if os.stat(path).st_mtime_ns != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def serve_stream(requests, answers, stamps=None):
+    """
+    Answers the request lines of a binary stream until it ends or asks to stop.
+
+    Args:
+        requests (file): A binary stream of request lines.
+        answers (file): A binary stream for the answers.
+        stamps (dict, optional): The `source_stamps()` of the server when it started; the
+            server stops on the first request after one of them changed.
+
+    Returns:
+        bool: Whether the server should stop.
+    """
+    for line in requests:
+        if not line.strip():
+            continue
+        if stamps and _sources_changed(stamps):
+            message = b"the fixture sources changed since the server started"
+            answers.write(b"%d %d\n" % (STALE, len(message)) + message)
+            answers.flush()
+            return True
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict):
+            message = b"ValueError: a request is one line holding a JSON object"
+            answers.write(b"1 %d\n" % len(message) + message)
+        elif request.get("stop"):
+            answers.write(b"0 0\n")
+            answers.flush()
+            return True
+        else:
+            answers.write(answer(request))
+        answers.flush()
+    return False
+
+
+class _FixtureServer(socketserver.ThreadingUnixStreamServer):
+
+    def server_bind(self):
+        super().server_bind()
+        os.chmod(self.server_address, 0o600)
+        self.inode = os.stat(self.server_address).st_ino
+        self.stamps = source_stamps()
+
+    def release(self):
+        """
+        Removes the socket file, unless a newer server has replaced it, so that clients
+        start a new server instead of queueing on this one.
+        """
+        try:
+            if os.stat(self.server_address).st_ino == self.inode:
+                os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        if serve_stream(self.rfile, self.wfile, self.server.stamps):
+            self.server.release()
+            self.server.shutdown()
+
+
+def serve_socket(path):
+    """
+    Answers requests on a Unix socket, one thread per connection, until interrupted or
+    asked to stop.
+
+    Raises:
+        OSError: If the platform has no Unix sockets, or a server already answers on `path`.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets are not available on this platform")
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX) as probe:
+            try:
+                probe.connect(path)
+            except OSError:  # left behind by a server that is gone
+                os.unlink(path)
+            else:
+                raise OSError("a fixture server is already answering on %s" % path)
+    with _FixtureServer(path, _RequestHandler) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.release()
@@ -0,0 +1,158 @@
+
+"""
+    This module contains an event-driven engine for the Gilded Rose inventory system.
+
+    Between thresholds (backstage bands, the sell-by date, the 0 and 50 quality caps) an
+    item changes by the same amount every day. The engine stores each item as a linear
+    function of the global day, as planned by its strategy (`ItemStrategy.plan`), and keeps
+    the day on which that plan ends in a calendar queue. A simulated day only re-plans the
+    items whose event fires on it, so its cost depends on the number of events rather than
+    on the number of items.
+
+    Classes:
+        CalendarGildedRose: Event-driven counterpart of `GildedRose`.
+
+"""
+import heapq
+
+from gilded_rose_enhanced import Item, default_registry
+
+
+class CalendarGildedRose:
+    """
+    Event-driven engine keeping every item as a linear function of the global day.
+
+    The items are only written when `items` is read; reading it also makes the next
+    update plan every item again, so the list can be modified in between.
+
+    Attributes:
+        items (list): The managed items, brought up to the current day when read.
+        registry (StrategyRegistry): Resolves item names to strategies.
+        day (int): The number of days simulated so far.
+
+    Methods:
+        update_quality(): Moves the inventory forward by one day.
+        advance(days): Moves the inventory forward by several days.
+    """
+
+    def __init__(self, items, registry=None):
+        """
+        Initializes the engine with a list of items.
+
+        Args:
+            items (list): A list of item objects to be managed.
+            registry (StrategyRegistry, optional): Resolves item names to strategies.
+                Defaults to `default_registry()`.
+        """
+        self._items = items
+        self.registry = registry if registry is not None else default_registry()
+        self.day = 0
+        self._planned = False
+
+    @property
+    def items(self):
+        self._materialize()
+        return self._items
+
+    @items.setter
+    def items(self, items):
+        self._materialize()
+        self._items = items
+
+    def _materialize(self):
+        """
+        Writes the state of every item on the current day and drops the plans.
+        """
+        if self._planned:
+            for index, item in enumerate(self._items):
+                item.sell_in, item.quality = self._state(index, self.day)
+            self._planned = False
+
+    def _state(self, index, day):
+        elapsed = day - self._base_day[index]
+        return (self._base_sell_in[index] + self._sell_in_slope[index] * elapsed,
+                self._base_quality[index] + self._quality_slope[index] * elapsed)
+
+    def _plan_all(self):
+        """
+        Plans every item from its current state and fills the calendar.
+        """
+        count = len(self._items)
+        self._strategies = [self.registry.resolve(item.name) for item in self._items]
+        self._base_day = [self.day] * count
+        self._base_sell_in = [item.sell_in for item in self._items]
+        self._base_quality = [item.quality for item in self._items]
+        self._sell_in_slope = [0] * count
+        self._quality_slope = [0] * count
+        self._calendar = []
+        for index, item in enumerate(self._items):
+            event_day = self._plan(index, item.sell_in, item.quality)
+            if event_day is not None:
+                self._calendar.append((event_day, index))
+        heapq.heapify(self._calendar)
+        self._planned = True
+
+    def _plan(self, index, sell_in, quality):
+        """
+        Starts a new linear segment for an item from its state on the current day.
+
+        A strategy without a linear plan gets a one-day segment measured by running its
+        `update_quality` on a scratch item.
+
+        Returns:
+            int: The day on which the segment ends, or None if it never ends.
+        """
+        strategy = self._strategies[index]
+        scratch = Item(self._items[index].name, sell_in, quality)
+        plan = strategy.plan(scratch)
+        if plan is None:
+            strategy.update_quality(scratch)
+            sell_in_slope, quality_slope, days = scratch.sell_in - sell_in, scratch.quality - quality, 1
+        else:
+            quality_slope, days = plan
+            sell_in_slope = -1 if strategy.ages else 0
+
+        self._base_day[index] = self.day
+        self._base_sell_in[index] = sell_in
+        self._base_quality[index] = quality
+        self._sell_in_slope[index] = sell_in_slope
+        self._quality_slope[index] = quality_slope
+        return self.day + days if days is not None else None
+
+    def advance(self, days):
+        """
+        Moves the inventory forward by the given number of days.
+
+        Only the items whose segment ends on one of the days are re-planned.
+
+        Args:
+            days (int): The number of days to move forward.
+
+        Raises:
+            ValueError: If `days` is negative.
+
+        Returns:
+            None
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        if not self._planned:
+            self._plan_all()
+        target = self.day + days
+        calendar = self._calendar
+        while calendar and calendar[0][0] <= target:
+            self.day, index = heapq.heappop(calendar)
+            sell_in, quality = self._state(index, self.day)
+            event_day = self._plan(index, sell_in, quality)
+            if event_day is not None:
+                heapq.heappush(calendar, (event_day, index))
+        self.day = target
+
+    def update_quality(self):
+        """
+        Moves the inventory forward by one day.
+
+        Returns:
+            None
+        """
+        self.advance(1)
@@ -4,15 +4,43 @@
 
     Classes:
         Item: Represents an item in the inventory.
+        ItemState: Immutable (name, sell_in, quality) state of an item, as projected by GildedRose.
         ItemStrategy: Abstract base class for item update strategies.
         NormalItemStrategy: Strategy for updating normal items.
         AgedBrieStrategy: Strategy for updating "Aged Brie" items.
         SulfurasStrategy: Strategy for updating "Sulfuras" items.
         BackstagePassesStrategy: Strategy for updating "Backstage passes" items.
         ConjuredItemStrategy: Strategy for updating "Conjured" items.
+        StrategyRegistry: Resolves item names to strategies by exact name, prefix or regex.
+        NameDictionary: Interns item names to small name ids and category codes.
+        InventorySnapshot: Immutable view of the item states on one day, sharing unchanged
+            chunks with the previous snapshot.
+        Change: One (index, old, new) entry of a change feed.
+        ChangeFeed: Items changed by the last update, in preallocated packed arrays.
         GildedRose: Manages the inventory and updates the quality of items using appropriate strategies.
 
+    Functions:
+        default_strategies: Builds the name to strategy mapping of the built-in categories.
+        default_registry: Builds a registry of the built-in categories, matched by exact name.
+        family_registry: Builds a registry that also matches the "Conjured " and
+            "Backstage passes to " name families by prefix.
+
+    Constants:
+        NORMAL, AGED_BRIE, SULFURAS, BACKSTAGE_PASSES, CONJURED: Category codes of the
+            built-in strategies, used by the columnar engines.
+
 """
+import re
+from array import array
+from collections import OrderedDict, deque, namedtuple
+
+NORMAL = 0
+AGED_BRIE = 1
+SULFURAS = 2
+BACKSTAGE_PASSES = 3
+CONJURED = 4
+
+
 class Item:
     """
     A class representing an item in the Gilded Rose inventory.
@@ -52,6 +80,17 @@ class Item:
         return "%s, %s, %s" % (self.name, self.sell_in, self.quality)
 
 
+class ItemState(namedtuple("ItemState", ["name", "sell_in", "quality"])):
+    """
+    An immutable snapshot of the name, sell_in and quality of an item.
+
+    It is printed like an `Item`.
+    """
+    __slots__ = ()
+
+    __repr__ = Item.__repr__
+
+
 class ItemStrategy:
     """
     A base class for item update strategies in the Gilded Rose inventory system.
@@ -62,16 +101,119 @@ class ItemStrategy:
 
     Methods:
         update_quality(item):
-            Abstract method to update the quality of the given item. 
+            Abstract method to update the quality of the given item.
             Must be implemented by subclasses.
+        advance(item, days):
+            Moves the given item forward by several days. The default applies
+            `update_quality` once per day; subclasses override it with a closed form.
+        is_quiescent(item):
+            Tells whether the item has reached a fixed point, where further updates only
+            decrease its sell_in (if `ages`). The default answers False.
+        plan(item):
+            Describes the coming days of the item as a linear segment, for event-driven
+            engines. The default answers None (no linear plan).
+
+    Attributes:
+        category (int): Category code of the strategy, or None for custom strategies.
+        ages (bool): Whether the sell_in of the items decreases by 1 each day.
 
     Raises:
-        NotImplementedError: If the `update_quality` method is not implemented 
+        NotImplementedError: If the `update_quality` method is not implemented
                              by a subclass.
     """
+    category = None
+    ages = True
+
     def update_quality(self, item):
         raise NotImplementedError("Subclasses must implement this method")
 
+    def is_quiescent(self, item):
+        """
+        Tells whether the item has reached a fixed point of `update_quality`.
+
+        Args:
+            item (Item): The item to check.
+
+        Returns:
+            bool: True if further updates only decrease the sell_in of the item.
+        """
+        return False
+
+    def plan(self, item):
+        """
+        Describes how the quality of the item changes over the coming days.
+
+        Over the next `days` days, each update changes the quality by exactly `slope`
+        (and the sell_in by -1 if `ages`). The segment ends where a threshold or a
+        quality cap would make the change differ.
+
+        Args:
+            item (Item): The item to plan.
+
+        Returns:
+            tuple: (slope, days), where days is None if the segment never ends, or
+                None if the strategy cannot describe the item with a linear segment.
+        """
+        return None
+
+    def advance(self, item, days):
+        """
+        Moves the given item forward by `days` days.
+
+        The result is the same as calling `update_quality(item)` `days` times.
+
+        Args:
+            item (Item): The item to update.
+            days (int): The number of days to move forward. Must not be negative.
+        """
+        for _ in range(days):
+            self.update_quality(item)
+
+
+def _days_in_range(sell_in, days, low, high):
+    """
+    Counts the days of an advance whose post-decrement sell_in lies in [low, high].
+
+    Over `days` days the sell_in values seen after each decrement are
+    sell_in - 1 down to sell_in - days.
+
+    Args:
+        sell_in (int): The sell_in value before the advance.
+        days (int): The number of days of the advance.
+        low (int): The lowest sell_in value of the range.
+        high (int): The highest sell_in value of the range.
+
+    Returns:
+        int: The number of days that fall in the range.
+    """
+    return max(0, min(high, sell_in - 1) - max(low, sell_in - days) + 1)
+
+
+def _degrading_plan(item, rate):
+    """
+    Plans a normal or conjured item losing `rate` points a day, twice that once expired.
+    """
+    if item.quality == 0:
+        return 0, None
+    if item.sell_in > 0:
+        slope, days = -rate, min(item.sell_in, item.quality // rate)
+    else:
+        slope, days = -2 * rate, item.quality // (2 * rate)
+    if days == 0:
+        # quality would go below 0 tomorrow, so it stops at 0
+        return -item.quality, 1
+    return slope, days
+
+
+def _quality_in_range(item):
+    """
+    Tells whether the item quality is within the 0..50 range kept by the clamps.
+
+    The closed forms only hold inside that range; an item outside of it is
+    brought back by one regular daily update first.
+    """
+    return 0 <= item.quality <= 50
+
 
 class NormalItemStrategy(ItemStrategy):
     """
@@ -83,7 +225,18 @@ class NormalItemStrategy(ItemStrategy):
             - Decreases the quality by 1 if it is greater than 0.
             - Decreases the sell-in value by 1.
             - If the sell-in value is less than 0 and the quality is greater than 0, decreases the quality by an additional 1.
+        advance(item, days):
+            Moves the given item forward by several days in constant time.
+        is_quiescent(item):
+            Tells whether further updates leave the quality unchanged.
+        plan(item):
+            Describes the coming days as a linear segment.
     """
+    category = NORMAL
+
+    def is_quiescent(self, item):
+        return item.quality == 0  # quality cannot drop any lower
+
     def update_quality(self, item):
 
         # decrease quality and sell_in by 1
@@ -102,6 +255,25 @@ class NormalItemStrategy(ItemStrategy):
         if item.quality > 50:
             item.quality = 50
 
+    def plan(self, item):
+        if not _quality_in_range(item):
+            return None
+        return _degrading_plan(item, 1)
+
+    def advance(self, item, days):
+        if days > 0 and not _quality_in_range(item):
+            self.update_quality(item)
+            days -= 1
+        if days <= 0:
+            return
+
+        # one point per day before the sell-by date, two points per day after it
+        fresh_days = _days_in_range(item.sell_in, days, 0, item.sell_in)
+        degradation = fresh_days + 2 * (days - fresh_days)
+
+        item.sell_in -= days
+        item.quality = max(0, item.quality - degradation)
+
 
 class AgedBrieStrategy(ItemStrategy):
     """
@@ -112,7 +284,15 @@ class AgedBrieStrategy(ItemStrategy):
 
     Methods:
         update_quality(item): Updates the quality and sell-in values of the given item.
+        advance(item, days): Moves the given item forward by several days in constant time.
+        is_quiescent(item): Tells whether further updates leave the quality unchanged.
+        plan(item): Describes the coming days as a linear segment.
     """
+    category = AGED_BRIE
+
+    def is_quiescent(self, item):
+        return item.quality == 50  # quality cannot rise any higher
+
     def update_quality(self, item):
         # aged-brie enhance quality with time:
         item.quality += 1
@@ -130,6 +310,34 @@ class AgedBrieStrategy(ItemStrategy):
         if item.quality > 50:
             item.quality = 50
 
+    def plan(self, item):
+        if not _quality_in_range(item):
+            return None
+        if item.quality == 50:
+            return 0, None
+        if item.sell_in > 0:
+            slope, days = 1, min(item.sell_in, 50 - item.quality)
+        else:
+            slope, days = 2, (50 - item.quality) // 2
+        if days == 0:
+            # quality would go above 50 tomorrow, so it stops at 50
+            return 50 - item.quality, 1
+        return slope, days
+
+    def advance(self, item, days):
+        if days > 0 and not _quality_in_range(item):
+            self.update_quality(item)
+            days -= 1
+        if days <= 0:
+            return
+
+        # one point per day before the sell-by date, two points per day after it
+        fresh_days = _days_in_range(item.sell_in, days, 0, item.sell_in)
+        enhancement = fresh_days + 2 * (days - fresh_days)
+
+        item.sell_in -= days
+        item.quality = min(50, item.quality + enhancement)
+
 
 class SulfurasStrategy(ItemStrategy):
     """
@@ -140,10 +348,28 @@ class SulfurasStrategy(ItemStrategy):
 
     Methods:
         update_quality(item): makes sure that Sulfuras quality is always 80 and sell_in is always 0.
+        advance(item, days): same as a single update, whatever the number of days.
+        is_quiescent(item): Tells whether the quality is already 80.
+        plan(item): Describes the coming days as a linear segment.
     """
+    category = SULFURAS
+    ages = False
+
+    def is_quiescent(self, item):
+        return item.quality == 80  # Sulfuras never changes
+
     def update_quality(self, item):
         item.quality = 80  # Sulfuras quality is always 80
 
+    def plan(self, item):
+        if item.quality == 80:
+            return 0, None
+        return 80 - item.quality, 1
+
+    def advance(self, item, days):
+        if days > 0:
+            self.update_quality(item)
+
 class BackstagePassesStrategy(ItemStrategy):
     """
     Strategy for updating the quality and sell_in values of Backstage Passes items.
@@ -160,7 +386,18 @@ class BackstagePassesStrategy(ItemStrategy):
     Methods:
         update_quality(item):
             Updates the quality and sell_in values of the given item according to the rules for Backstage Passes.
+        advance(item, days):
+            Moves the given item forward by several days in constant time.
+        is_quiescent(item):
+            Tells whether further updates leave the quality unchanged.
+        plan(item):
+            Describes the coming days as a linear segment.
     """
+    category = BACKSTAGE_PASSES
+
+    def is_quiescent(self, item):
+        return item.sell_in < 0 and item.quality == 0  # the concert is over
+
     def update_quality(self, item):
         
         # time passes
@@ -190,6 +427,54 @@ class BackstagePassesStrategy(ItemStrategy):
         if item.quality > 50:
             item.quality = 50
 
+    def plan(self, item):
+        if not _quality_in_range(item):
+            return None
+
+        # quality drops to 0 after the concert and stays there
+        if item.sell_in <= 0:
+            if item.sell_in < 0 and item.quality == 0:
+                return 0, None
+            return -item.quality, 1
+
+        # quality is at its cap until the concert
+        if item.quality == 50:
+            return 0, item.sell_in
+
+        # bands of 1, 2 and 3 points a day end when sell_in reaches 10, 5 and 0
+        if item.sell_in > 10:
+            slope, band_end = 1, 10
+        elif item.sell_in > 5:
+            slope, band_end = 2, 5
+        else:
+            slope, band_end = 3, 0
+        days = min(item.sell_in - band_end, (50 - item.quality) // slope)
+        if days == 0:
+            # quality would go above 50 tomorrow, so it stops at 50
+            return 50 - item.quality, 1
+        return slope, days
+
+    def advance(self, item, days):
+        if days > 0 and not _quality_in_range(item):
+            self.update_quality(item)
+            days -= 1
+        if days <= 0:
+            return
+
+        # quality drops to 0 after the concert and stays there
+        if item.sell_in - days < 0:
+            item.sell_in -= days
+            item.quality = 0
+            return
+
+        # one point per day above 10 days left, two up to 10 days, three up to 5 days
+        enhancement = (_days_in_range(item.sell_in, days, 10, item.sell_in)
+                       + 2 * _days_in_range(item.sell_in, days, 5, 9)
+                       + 3 * _days_in_range(item.sell_in, days, 0, 4))
+
+        item.sell_in -= days
+        item.quality = min(50, item.quality + enhancement)
+
 
 class ConjuredItemStrategy(ItemStrategy):
     """
@@ -201,7 +486,18 @@ class ConjuredItemStrategy(ItemStrategy):
     Methods:
         update_quality(item):
             Updates the quality and sell_in values of the given item according to the rules for Conjured items.
+        advance(item, days):
+            Moves the given item forward by several days in constant time.
+        is_quiescent(item):
+            Tells whether further updates leave the quality unchanged.
+        plan(item):
+            Describes the coming days as a linear segment.
     """
+    category = CONJURED
+
+    def is_quiescent(self, item):
+        return item.quality == 0  # quality cannot drop any lower
+
     def update_quality(self, item):
         # works like normal items but degrades twice as fast
 
@@ -221,6 +517,370 @@ class ConjuredItemStrategy(ItemStrategy):
         if item.quality > 50:
             item.quality = 50
 
+    def plan(self, item):
+        if not _quality_in_range(item):
+            return None
+        return _degrading_plan(item, 2)
+
+    def advance(self, item, days):
+        if days > 0 and not _quality_in_range(item):
+            self.update_quality(item)
+            days -= 1
+        if days <= 0:
+            return
+
+        # two points per day before the sell-by date, four points per day after it
+        fresh_days = _days_in_range(item.sell_in, days, 0, item.sell_in)
+        degradation = 2 * fresh_days + 4 * (days - fresh_days)
+
+        item.sell_in -= days
+        item.quality = max(0, item.quality - degradation)
+
+
+def default_strategies():
+    """
+    Builds the mapping of item names to the strategies of the built-in categories.
+
+    Items whose name is not in the mapping use NormalItemStrategy.
+
+    Returns:
+        dict: A new dictionary mapping item names to strategy objects.
+    """
+    return {
+        "Aged Brie": AgedBrieStrategy(),
+        "Sulfuras, Hand of Ragnaros": SulfurasStrategy(),
+        "Backstage passes to a TAFKAL80ETC concert": BackstagePassesStrategy(),
+        "Conjured": ConjuredItemStrategy()
+    }
+
+
+class StrategyRegistry:
+    """
+    Resolves item names to strategies.
+
+    Strategies can be registered for an exact name, a name prefix or a regular
+    expression that must match the whole name. An exact name wins over a prefix,
+    a longer prefix over a shorter one and any prefix over a regex; regexes are
+    tried in registration order. Names matching nothing resolve to the default
+    strategy.
+
+    The prefixes are compiled into a trie and the regexes into a single alternation,
+    and each resolved name is memoized, so classifying many repeated names costs one
+    dictionary lookup per name.
+
+    Attributes:
+        exact (dict): Mapping of exact item names to strategies.
+        default (ItemStrategy): The strategy of names matching nothing.
+
+    Methods:
+        register(name, strategy): Registers a strategy for an exact name.
+        register_prefix(prefix, strategy): Registers a strategy for names starting with a prefix.
+        register_pattern(pattern, strategy): Registers a strategy for names matching a regex.
+        resolve(name): Returns the strategy of the given name.
+        clear_cache(): Forgets the memoized names, e.g. after editing `exact` directly.
+        strategies(): Returns every distinct strategy of the registry.
+        with_strategies(wrap): Returns a copy of the registry with its strategies replaced.
+    """
+    _END = None  # trie key holding the strategy of a complete prefix
+
+    def __init__(self, exact=None, default=None):
+        """
+        Initializes a new registry.
+
+        Args:
+            exact (dict, optional): Mapping of exact item names to strategies.
+            default (ItemStrategy, optional): The strategy of names matching nothing.
+                Defaults to a NormalItemStrategy.
+        """
+        self.exact = dict(exact) if exact else {}
+        self.default = default if default is not None else NormalItemStrategy()
+        self._prefixes = []
+        self._patterns = []
+        self._trie = None
+        self._regex = None
+        self._regex_strategies = {}
+        self._cache = {}
+
+    def __getstate__(self):
+        # the compiled matchers and memoized names are rebuilt on demand after unpickling
+        state = dict(self.__dict__)
+        state.update(_trie=None, _regex=None, _regex_strategies={}, _cache={})
+        return state
+
+    def register(self, name, strategy):
+        """
+        Registers a strategy for items with exactly the given name.
+        """
+        self.exact[name] = strategy
+        self.clear_cache()
+
+    def register_prefix(self, prefix, strategy):
+        """
+        Registers a strategy for items whose name starts with the given prefix.
+        """
+        self._prefixes.append((prefix, strategy))
+        self._invalidate()
+
+    def register_pattern(self, pattern, strategy):
+        """
+        Registers a strategy for items whose whole name matches the given regex.
+
+        Args:
+            pattern (str): A regular expression. It must not use numbered backreferences,
+                since all patterns are combined into one expression.
+            strategy (ItemStrategy): The strategy of the matching items.
+
+        Raises:
+            re.error: If the pattern is not a valid regular expression.
+        """
+        re.compile(pattern)
+        self._patterns.append((pattern, strategy))
+        self._invalidate()
+
+    def clear_cache(self):
+        """
+        Forgets the memoized name to strategy resolutions.
+        """
+        self._cache.clear()
+
+    def strategies(self):
+        """
+        Returns every distinct strategy of the registry.
+
+        Returns:
+            list: The strategies for exact names, prefixes and regexes in registration
+                order, then the default strategy, each listed once.
+        """
+        strategies = []
+        candidates = list(self.exact.values())
+        candidates += [strategy for _, strategy in self._prefixes]
+        candidates += [strategy for _, strategy in self._patterns]
+        candidates.append(self.default)
+        for strategy in candidates:
+            if not any(strategy is known for known in strategies):
+                strategies.append(strategy)
+        return strategies
+
+    def with_strategies(self, wrap):
+        """
+        Builds a registry matching the same names, with every strategy replaced.
+
+        Args:
+            wrap (function): Called once per distinct strategy, returns its replacement.
+
+        Returns:
+            StrategyRegistry: A new registry.
+        """
+        replacements = {id(strategy): wrap(strategy) for strategy in self.strategies()}
+        registry = StrategyRegistry({name: replacements[id(strategy)] for name, strategy in self.exact.items()},
+                                    replacements[id(self.default)])
+        for prefix, strategy in self._prefixes:
+            registry.register_prefix(prefix, replacements[id(strategy)])
+        for pattern, strategy in self._patterns:
+            registry.register_pattern(pattern, replacements[id(strategy)])
+        return registry
+
+    def _invalidate(self):
+        self._trie = None
+        self._regex = None
+        self.clear_cache()
+
+    def _compile(self):
+        """
+        Builds the prefix trie and the combined regex from the registered families.
+        """
+        trie = {}
+        for prefix, strategy in self._prefixes:
+            node = trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[self._END] = strategy
+        self._trie = trie
+
+        alternatives = []
+        self._regex_strategies = {}
+        for index, (pattern, strategy) in enumerate(self._patterns):
+            group = "p%d" % index
+            alternatives.append("(?P<%s>%s)" % (group, pattern))
+            self._regex_strategies[group] = strategy
+        self._regex = re.compile("|".join(alternatives)) if alternatives else None
+
+    def resolve(self, name):
+        """
+        Returns the strategy of the given item name.
+
+        Args:
+            name (str): The name of the item.
+
+        Returns:
+            ItemStrategy: The strategy registered for the name, or the default strategy.
+        """
+        strategy = self._cache.get(name)
+        if strategy is None:
+            strategy = self._match(name)
+            self._cache[name] = strategy
+        return strategy
+
+    def _match(self, name):
+        strategy = self.exact.get(name)
+        if strategy is not None:
+            return strategy
+        if self._trie is None:
+            self._compile()
+
+        # the longest registered prefix wins
+        node = self._trie
+        strategy = node.get(self._END)
+        for char in name:
+            node = node.get(char)
+            if node is None:
+                break
+            strategy = node.get(self._END, strategy)
+        if strategy is not None:
+            return strategy
+
+        if self._regex is not None:
+            match = self._regex.fullmatch(name)
+            if match is not None:
+                return self._regex_strategies[match.lastgroup]
+        return self.default
+
+
+def default_registry():
+    """
+    Builds a registry of the built-in categories, matching item names exactly.
+
+    This is the classification used by GildedRose by default, so e.g. "Conjured Mana Cake"
+    is a normal item, as recorded in the texttest approval output.
+
+    Returns:
+        StrategyRegistry: A new registry.
+    """
+    return StrategyRegistry(default_strategies())
+
+
+def family_registry():
+    """
+    Builds a registry of the built-in categories that also matches name families.
+
+    On top of `default_registry()`, any name starting with "Conjured " is a conjured
+    item and any name starting with "Backstage passes to " is a backstage pass.
+
+    Returns:
+        StrategyRegistry: A new registry.
+    """
+    registry = default_registry()
+    registry.register_prefix("Conjured ", registry.exact["Conjured"])
+    registry.register_prefix("Backstage passes to ",
+                             registry.exact["Backstage passes to a TAFKAL80ETC concert"])
+    return registry
+
+
+class NameDictionary:
+    """
+    Interns item names to name ids and category codes.
+
+    Attributes:
+        registry (StrategyRegistry): Resolves the category code of new names.
+        names (list): The interned names, indexed by name id.
+        categories (list): The category code of each name id, None for strategies without one.
+
+    Methods:
+        intern(name): Returns the name id of a name, adding it if needed.
+        encode(items): Returns the name ids of a list of items.
+        name_of(name_id): Returns the name of a name id.
+        category_of(name_id): Returns the category code of a name id.
+        to_dict(): Returns the content of the dictionary as JSON-compatible data.
+        from_dict(data, registry=None): Builds a dictionary from `to_dict` data.
+    """
+
+    def __init__(self, registry=None):
+        """
+        Initializes an empty dictionary.
+
+        Args:
+            registry (StrategyRegistry, optional): Resolves the category code of new names.
+                Defaults to `default_registry()`.
+        """
+        self.registry = registry if registry is not None else default_registry()
+        self.names = []
+        self.categories = []
+        self._ids = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def intern(self, name):
+        """
+        Returns the name id of a name, adding the name if it is new.
+
+        Args:
+            name (str): The item name.
+
+        Returns:
+            int: The name id.
+        """
+        name_id = self._ids.get(name)
+        if name_id is None:
+            name_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+            self.categories.append(self.registry.resolve(name).category)
+        return name_id
+
+    def encode(self, items):
+        """
+        Returns the name id of each item, interning the new names.
+
+        Returns:
+            array.array: The name ids, in item order.
+        """
+        intern = self.intern
+        return array("I", [intern(item.name) for item in items])
+
+    def name_of(self, name_id):
+        return self.names[name_id]
+
+    def category_of(self, name_id):
+        return self.categories[name_id]
+
+    def to_dict(self):
+        """
+        Returns the names and category codes as JSON-compatible data.
+
+        Returns:
+            dict: {"names": [...], "categories": [...]}, indexed by name id.
+        """
+        return {"names": list(self.names), "categories": list(self.categories)}
+
+    @classmethod
+    def from_dict(cls, data, registry=None):
+        """
+        Builds a dictionary from data returned by `to_dict`, keeping its name ids.
+
+        Args:
+            data (dict): The saved names and category codes.
+            registry (StrategyRegistry, optional): Resolves the category code of names
+                interned afterwards.
+
+        Raises:
+            ValueError: If the names and category codes differ in number, or a name repeats.
+
+        Returns:
+            NameDictionary: A new dictionary.
+        """
+        names, categories = data["names"], data["categories"]
+        if len(names) != len(categories):
+            raise ValueError("a name dictionary needs one category code per name")
+        dictionary = cls(registry)
+        dictionary.names = list(names)
+        dictionary.categories = list(categories)
+        dictionary._ids = {name: name_id for name_id, name in enumerate(names)}
+        if len(dictionary._ids) != len(names):
+            raise ValueError("a name dictionary holds each name once")
+        return dictionary
 
 
 class GildedRose:
@@ -230,52 +890,648 @@ class GildedRose:
 
     Attributes:
         items (list): A list of items to be managed.
-        strategies (dict): A dictionary mapping item names to their respective
-                           quality update strategies.
+        registry (StrategyRegistry): Resolves item names to their respective
+                                     quality update strategies.
+        strategies (dict): A dictionary mapping exact item names to their respective
+                           quality update strategies (the registry's `exact` mapping).
+        track_quiescent (bool): Whether items at a fixed point are left out of the updates.
+        names (NameDictionary): Interns the item names; shareable between inventories.
+        changes (ChangeFeed): The changes made by the last update, or None when the
+                              change feed is off.
+        journal_size (int): Number of updates kept for `undo()`, 0 when the journal is off.
+        projection_cache_size (int): Number of days whose projected states are kept.
 
     Methods:
         update_quality():
             Updates the quality of all items in the collection using their
-            respective strategies.
+            respective strategies. Returns the change feed when it is on.
+        advance(days):
+            Moves all items forward by several days at once.
+        rebind():
+            Resolves the strategy of every item again, e.g. after changing `strategies`
+            or the registry.
+        state_at(index_or_item, day):
+            Returns the state of one item a number of days from now.
+        states_at(day):
+            Returns the states of all items a number of days from now.
+        snapshot():
+            Returns an immutable view of the current item states.
+        undo():
+            Rolls back the last journaled update.
+        redo():
+            Applies again the last update rolled back.
     """
+    projection_cache_size = 8
+    snapshot_chunk_size = 64
 
-    def __init__(self, items):
+    def __init__(self, items, registry=None, track_quiescent=False, names=None, change_feed=False,
+                 journal_size=0):
         """
         Initializes the GildedRose class with a list of items and their corresponding update strategies.
 
+        The name of each item is interned once here into a name id, and the strategy of
+        each name id is resolved once; both are kept in tables parallel to `items`. They
+        are looked up again for an item whose name changes, and for all items when the
+        length of `items` changes.
+
+        With `track_quiescent`, an item whose strategy reports it at a fixed point (e.g.
+        Sulfuras, Aged Brie at 50, a normal item at 0) moves to a frozen partition that
+        the updates skip. The days passed since are applied to its sell_in when `items`
+        is read, which also moves every item back to the updated set; the list must
+        therefore be read and modified through `items` in this mode. Readers that only
+        look at the states, e.g. a report of every day, should use `snapshot()` or
+        `states_at(0)` instead, which leave the frozen items out of the updates.
+
         Args:
             items (list): A list of item objects to be managed by the GildedRose class.
+            registry (StrategyRegistry, optional): Resolves item names to strategies.
+                Defaults to `default_registry()`; use `family_registry()` to also match
+                e.g. "Conjured Mana Cake" by prefix.
+            track_quiescent (bool, optional): Whether to skip items at a fixed point.
+                Defaults to False.
+            names (NameDictionary, optional): The dictionary interning the item names.
+                A new one is created when omitted.
+            change_feed (bool, optional): Whether updates record the items they change in
+                `changes`. Defaults to False.
+            journal_size (int, optional): Number of updates that `undo()` can roll back;
+                the oldest are dropped beyond it. Turns the change feed on. Defaults to 0,
+                no journal.
 
         Attributes:
             items (list): Stores the list of items.
+            registry (StrategyRegistry): Resolves item names to strategies.
             strategies (dict): A dictionary mapping item names to their corresponding update strategy objects.
                 - "Aged Brie": Uses AgedBrieStrategy.
                 - "Sulfuras, Hand of Ragnaros": Uses SulfurasStrategy.
                 - "Backstage passes to a TAFKAL80ETC concert": Uses BackstagePassesStrategy.
                 - "Conjured": Uses ConjuredItemStrategy.
         """
-        self.items = items
-        self.strategies = {
-            "Aged Brie": AgedBrieStrategy(),
-            "Sulfuras, Hand of Ragnaros": SulfurasStrategy(),
-            "Backstage passes to a TAFKAL80ETC concert": BackstagePassesStrategy(),
-            "Conjured": ConjuredItemStrategy()
-        }
+        self._items = items
+        self.registry = registry if registry is not None else default_registry()
+        self.strategies = self.registry.exact
+        self.track_quiescent = track_quiescent
+        self.names = names if names is not None else NameDictionary(self.registry)
+        self._strategies_by_id = []  # name id -> strategy, None until resolved
+        self._day = 0  # days applied so far, the frozen items lag behind it
+        self._active = None  # indices of the items still updated, None when all are
+        self._frozen = {}  # index of a frozen item -> day it was frozen on
+        self._projections = OrderedDict()  # day -> (source states, projected states), least recent first
+        self._snapshot = None  # the last snapshot, whose chunks the next one reuses
+        self.changes = ChangeFeed(self.names, len(items)) if change_feed or journal_size else None
+        self.journal_size = journal_size
+        self._journal = deque(maxlen=journal_size)  # (days, item count, packed changes), oldest first
+        self._redo = []  # entries rolled back by undo(), most recent last
+        self._bind()
+
+    @property
+    def items(self):
+        self._thaw()
+        return self._items
+
+    @items.setter
+    def items(self, items):
+        self._thaw()
+        self._inventory_changed()
+        self._items = items
+
+    def _inventory_changed(self):
+        self._projections.clear()
+
+    def rebind(self):
+        """
+        Resolves the strategy of every item again.
+
+        Needed only after `strategies` or the registry has been changed; renamed,
+        added or removed items are picked up automatically.
+
+        Returns:
+            None
+        """
+        self._thaw()
+        self._inventory_changed()
+        self.registry.clear_cache()
+        self._strategies_by_id = []
+        self._bind()
+
+    def _resolve(self, name):
+        """
+        Returns the name id of a name and its strategy, resolved once per name id.
+        """
+        name_id = self.names.intern(name)
+        strategies = self._strategies_by_id
+        if name_id >= len(strategies):
+            strategies.extend([None] * (name_id + 1 - len(strategies)))
+        strategy = strategies[name_id]
+        if strategy is None:
+            strategy = strategies[name_id] = self.registry.resolve(name)
+        return name_id, strategy
+
+    def _bind(self):
+        self._bound_names = [item.name for item in self._items]
+        bound = [self._resolve(name) for name in self._bound_names]
+        self._bound_ids = [name_id for name_id, _ in bound]
+        self._bound_strategies = [strategy for _, strategy in bound]
+
+    def _rebind_item(self, index, name):
+        self._bound_names[index] = name
+        self._bound_ids[index], self._bound_strategies[index] = self._resolve(name)
+
+    def _item_strategies(self):
+        """
+        Returns the strategies of the items, in item order.
+
+        The bound table is refreshed first for items whose name is no longer the one
+        their strategy was resolved for.
+        """
+        items = self._items
+        if len(items) != len(self._bound_names):
+            self._bind()
+            return self._bound_strategies
+        names = self._bound_names
+        for index, item in enumerate(items):
+            if item.name is not names[index]:
+                self._rebind_item(index, item.name)
+        return self._bound_strategies
+
+    def _thaw(self):
+        """
+        Applies the pending days to the frozen items and makes every item active again.
+        """
+        if self._frozen:
+            items, strategies, day = self._items, self._bound_strategies, self._day
+            for index, frozen_on in self._frozen.items():
+                if strategies[index].ages:
+                    items[index].sell_in -= day - frozen_on
+            self._frozen = {}
+        self._active = None
+
+    def _update_active(self, days):
+        """
+        Moves the active items forward by `days` days and freezes those at a fixed point.
+        """
+        if self._active is None or len(self._items) != len(self._bound_names):
+            self._thaw()
+            self._item_strategies()
+            self._active = range(len(self._items))
+        items, names, strategies = self._items, self._bound_names, self._bound_strategies
+        day = self._day + days
+        frozen = self._frozen
+        feed = self.changes
+        if feed is not None:
+            feed._reset(len(items), day)
+        active = []
+        for index in self._active:
+            item = items[index]
+            if item.name is not names[index]:
+                self._rebind_item(index, item.name)
+            strategy = strategies[index]
+            sell_in, quality = item.sell_in, item.quality
+            if days == 1:
+                strategy.update_quality(item)
+            else:
+                strategy.advance(item, days)
+            if feed is not None and (item.quality != quality or
+                                     item.sell_in != (sell_in - days if strategy.ages else sell_in)):
+                feed._record(index, self._bound_ids[index], sell_in, quality, item.sell_in, item.quality)
+            if strategy.is_quiescent(item):
+                frozen[index] = day
+            else:
+                active.append(index)
+        self._active = active
+        self._day = day
 
     def update_quality(self):
         """
         Updates the quality of all items in the inventory using their respective strategies.
 
-        Iterates through each item in the inventory and applies the appropriate strategy
-        to update its quality. If an item does not have a specific strategy, the default
-        NormalItemStrategy is used.
+        Applies the bound strategy of each item in the inventory to update its quality.
+        If an item does not have a specific strategy, the default NormalItemStrategy is used.
+
+        Returns:
+            ChangeFeed: The items changed by the update when the change feed is on, else None.
+        """
+        self._inventory_changed()
+        if self.track_quiescent:
+            self._update_active(1)
+        elif self.changes is not None:
+            self._update_recording(1)
+        else:
+            for item, strategy in zip(self._items, self._item_strategies()):
+                strategy.update_quality(item)
+            self._day += 1
+            return None
+        self._log(1)
+        return self.changes
+
+    def advance(self, days):
+        """
+        Moves all items in the inventory forward by the given number of days.
+
+        Gives the same result as calling `update_quality()` `days` times, but each
+        strategy computes the final sell_in and quality of an item in one step.
+
+        Args:
+            days (int): The number of days to move forward.
+
+        Raises:
+            ValueError: If `days` is negative.
+
+        Returns:
+            ChangeFeed: The items changed by the advance when the change feed is on, else None.
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        self._inventory_changed()
+        if self.track_quiescent:
+            self._update_active(days)
+        elif self.changes is not None:
+            self._update_recording(days)
+        else:
+            for item, strategy in zip(self._items, self._item_strategies()):
+                strategy.advance(item, days)
+            self._day += days
+            return None
+        self._log(days)
+        return self.changes
+
+    def _log(self, days):
+        if self.journal_size:
+            self._journal.append((days, len(self._items), self.changes.packed()))
+            self._redo.clear()
+
+    def undo(self):
+        """
+        Rolls back the last journaled `update_quality()` or `advance(days)`.
+
+        The recorded items get their previous sell_in and quality back, and every other
+        ageing item gets its sell_in back. Up to `journal_size` updates can be rolled back;
+        items must not be added, removed or renamed in between.
+
+        Raises:
+            ValueError: If there is no update to roll back, or the inventory changed size.
 
         Returns:
             None
         """
-        for item in self.items:
-            strategy = self.strategies.get(item.name, NormalItemStrategy())
-            strategy.update_quality(item)
+        if not self._journal:
+            raise ValueError("no update to undo")
+        self._replay(self._journal[-1], backward=True)
+        self._redo.append(self._journal.pop())
+
+    def redo(self):
+        """
+        Applies again the last update rolled back by `undo()`.
+
+        A new update drops the updates that could be redone.
+
+        Raises:
+            ValueError: If there is no update to redo, or the inventory changed size.
+
+        Returns:
+            None
+        """
+        if not self._redo:
+            raise ValueError("no update to redo")
+        self._replay(self._redo[-1], backward=False)
+        self._journal.append(self._redo.pop())
+
+    def _replay(self, entry, backward):
+        """
+        Moves the inventory from one side of a journaled update to the other.
+        """
+        days, count, changes = entry
+        if len(self._items) != count:
+            raise ValueError("the inventory changed size since the update, %s items instead of %s"
+                             % (len(self._items), count))
+        self._thaw()
+        self._inventory_changed()
+        items = self._items
+        shift = days if backward else -days
+        for item, strategy in zip(items, self._item_strategies()):
+            if strategy.ages:
+                item.sell_in += shift
+        side = "old_" if backward else "new_"
+        for index, sell_in, quality in zip(changes["index"], changes[side + "sell_in"], changes[side + "quality"]):
+            item = items[index]
+            item.sell_in = sell_in
+            item.quality = quality
+        self._day -= shift
+
+    def _update_recording(self, days):
+        """
+        Moves every item forward by `days` days and records the changed ones in `changes`.
+
+        An item counts as changed when its quality changes, or its sell_in changes other
+        than by the days passed (or not at all for strategies that do not age).
+        """
+        items, strategies, name_ids = self._items, self._item_strategies(), self._bound_ids
+        self._day += days
+        feed = self.changes
+        feed._reset(len(items), self._day)
+        index_column, name_id_column = feed._index, feed._name_id
+        old_sell_in, old_quality, new_sell_in, new_quality = feed._old_sell_in, feed._old_quality, \
+            feed._new_sell_in, feed._new_quality
+        count = 0
+        for index, item in enumerate(items):
+            strategy = strategies[index]
+            sell_in, quality = item.sell_in, item.quality
+            if days == 1:
+                strategy.update_quality(item)
+            else:
+                strategy.advance(item, days)
+            if item.quality != quality or item.sell_in != (sell_in - days if strategy.ages else sell_in):
+                index_column[count] = index
+                name_id_column[count] = name_ids[index]
+                old_sell_in[count] = sell_in
+                old_quality[count] = quality
+                new_sell_in[count] = item.sell_in
+                new_quality[count] = item.quality
+                count += 1
+        feed._count = count
+        return feed
+
+    def state_at(self, index_or_item, day):
+        """
+        Returns the state of one item a number of days from now, leaving the item unchanged.
+
+        The state comes from the cached projection of that day if there is one and the item
+        is still in the state it was projected from, otherwise it is computed for this item
+        alone with its strategy's `advance`. Frozen items stay frozen.
+
+        Args:
+            index_or_item (int or Item): The index of the item in `items`, or the item itself.
+            day (int): The number of days from the current state.
+
+        Raises:
+            ValueError: If `day` is negative or the item is not in the inventory.
+            IndexError: If the index is out of range.
+
+        Returns:
+            ItemState: The projected state of the item.
+        """
+        if day < 0:
+            raise ValueError("day must not be negative, got %s" % day)
+        index = self._index_of(index_or_item)
+        cached = self._projections.get(day)
+        if cached is not None:
+            sources, projection = cached
+            if index < len(sources) and sources[index] == self._state_of(index, self._items[index]):
+                self._projections.move_to_end(day)
+                return projection[index]
+        strategy = self._item_strategies()[index]
+        return self._project(self._state_of(index, self._items[index]), strategy, day)
+
+    def states_at(self, day):
+        """
+        Returns the states of all items a number of days from now, leaving the items unchanged.
+
+        The projections of the last `projection_cache_size` days asked for are cached until
+        an update, an advance or a rebind. A cached projection is only used while the items
+        are still in the states it was made from, so changes made directly to `items` or
+        to the list passed in are picked up. Frozen items stay frozen.
+
+        Args:
+            day (int): The number of days from the current state.
+
+        Raises:
+            ValueError: If `day` is negative.
+
+        Returns:
+            list: The projected ItemState of every item, in item order.
+        """
+        if day < 0:
+            raise ValueError("day must not be negative, got %s" % day)
+        strategies = self._item_strategies()
+        if self._frozen:
+            sources = [self._state_of(index, item) for index, item in enumerate(self._items)]
+        else:
+            sources = [(item.name, item.sell_in, item.quality) for item in self._items]
+        cached = self._projections.get(day)
+        if cached is not None and cached[0] == sources:
+            self._projections.move_to_end(day)
+            return list(cached[1])
+        projection = [self._project(source, strategy, day) for source, strategy in zip(sources, strategies)]
+        self._projections[day] = (sources, projection)
+        if len(self._projections) > self.projection_cache_size:
+            self._projections.popitem(last=False)
+        return list(projection)
+
+    def snapshot(self):
+        """
+        Returns an immutable view of the current state of every item.
+
+        Snapshots store the states in chunks of `snapshot_chunk_size` items, and a chunk
+        whose items did not change since the previous snapshot is shared with it. The
+        sell_in of an ageing item is stored relative to the day, so that items which only
+        age (e.g. at a quality cap) do not count as changed. Keeping a snapshot of every
+        day of a mostly static inventory therefore costs little more than one copy.
+
+        Returns:
+            InventorySnapshot: The states of the items, in item order.
+        """
+        strategies = self._item_strategies()
+        items, day, frozen = self._items, self._day, self._frozen
+        size = self.snapshot_chunk_size
+        previous = self._snapshot._chunks if self._snapshot is not None else ()
+        chunks = []
+        for start in range(0, len(items), size):
+            old = previous[len(chunks)] if len(chunks) < len(previous) else ()
+            rows = []
+            for offset, item in enumerate(items[start:start + size]):
+                index = start + offset
+                if strategies[index].ages:
+                    # a frozen item lags behind by the days since it was frozen
+                    row = (item.name, item.sell_in + frozen.get(index, day), item.quality, True)
+                else:
+                    row = (item.name, item.sell_in, item.quality, False)
+                if offset < len(old) and old[offset] == row:
+                    row = old[offset]
+                rows.append(row)
+            if len(rows) == len(old) and all(row is kept for row, kept in zip(rows, old)):
+                chunks.append(old)
+            else:
+                chunks.append(tuple(rows))
+        self._snapshot = InventorySnapshot(day, tuple(chunks), size)
+        return self._snapshot
+
+    def _index_of(self, index_or_item):
+        if isinstance(index_or_item, int):
+            index = index_or_item + len(self._items) if index_or_item < 0 else index_or_item
+            if not 0 <= index < len(self._items):
+                raise IndexError("item index out of range")
+            return index
+        for index, item in enumerate(self._items):
+            if item is index_or_item:
+                return index
+        raise ValueError("%r is not in the inventory" % (index_or_item,))
+
+    def _state_of(self, index, item):
+        """
+        Returns the current (name, sell_in, quality) of an item, a frozen one included.
+        """
+        frozen_on = self._frozen.get(index)
+        if frozen_on is not None and self._bound_strategies[index].ages:
+            # a frozen item lags behind by the days since it was frozen
+            return item.name, item.sell_in - (self._day - frozen_on), item.quality
+        return item.name, item.sell_in, item.quality
+
+    @staticmethod
+    def _project(state, strategy, day):
+        scratch = Item(*state)
+        strategy.advance(scratch, day)
+        return ItemState(scratch.name, scratch.sell_in, scratch.quality)
+
+
+class InventorySnapshot:
+    """
+    An immutable view of the states of an inventory on one day.
+
+    Returned by `GildedRose.snapshot()`. The states are stored in chunks shared with other
+    snapshots of the same inventory, as (name, sell_in + day or sell_in, quality, ages) rows.
+
+    Attributes:
+        day (int): The number of days the inventory had been updated by when it was taken.
+
+    Methods:
+        to_items(): Returns new items in the recorded states.
+    """
+    __slots__ = ("day", "_chunks", "_chunk_size")
+
+    def __init__(self, day, chunks, chunk_size):
+        self.day = day
+        self._chunks = chunks
+        self._chunk_size = chunk_size
+
+    def __len__(self):
+        return sum(len(chunk) for chunk in self._chunks)
+
+    def _state(self, row):
+        name, sell_in, quality, ages = row
+        return ItemState(name, sell_in - self.day if ages else sell_in, quality)
+
+    def __getitem__(self, index):
+        """
+        Returns the state of the item at the given index.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if index < 0:
+            index += len(self)
+        if index < 0:
+            raise IndexError("snapshot index out of range")
+        chunk, offset = divmod(index, self._chunk_size)
+        if chunk >= len(self._chunks) or offset >= len(self._chunks[chunk]):
+            raise IndexError("snapshot index out of range")
+        return self._state(self._chunks[chunk][offset])
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            for row in chunk:
+                yield self._state(row)
+
+    def to_items(self):
+        """
+        Returns the recorded states as new items.
+
+        Returns:
+            list: New Item objects, in item order.
+        """
+        return [Item(*state) for state in self]
+
+
+class Change(namedtuple("Change", ["index", "old", "new"])):
+    """
+    One entry of a change feed: the index of an item and its states before and after.
+    """
+    __slots__ = ()
+
+
+class ChangeFeed:
+    """
+    The items changed by the last update of a GildedRose, in packed arrays.
+
+    The arrays are allocated once for the size of the inventory and reused by every update,
+    so recording allocates nothing per change. Only the first `len(feed)` entries are valid.
+    Sell_in values are signed 32-bit integers, so they must stay within that range.
+
+    Attributes:
+        names (NameDictionary): Decodes the recorded name ids.
+        day (int): The number of days the inventory had been updated by after the update.
+
+    Methods:
+        packed(): Returns the recorded columns as arrays.
+    """
+
+    def __init__(self, names, capacity=0):
+        """
+        Initializes an empty feed.
+
+        Args:
+            names (NameDictionary): Decodes the recorded name ids.
+            capacity (int, optional): The number of changes to allocate room for.
+        """
+        self.names = names
+        self.day = 0
+        self._count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self._capacity = capacity
+        self._index = array("I", [0]) * capacity
+        self._name_id = array("I", [0]) * capacity
+        self._old_sell_in = array("i", [0]) * capacity
+        self._old_quality = array("i", [0]) * capacity
+        self._new_sell_in = array("i", [0]) * capacity
+        self._new_quality = array("i", [0]) * capacity
+
+    def _reset(self, capacity, day):
+        if capacity > self._capacity:
+            self._allocate(capacity)
+        self._count = 0
+        self.day = day
+
+    def _record(self, index, name_id, old_sell_in, old_quality, new_sell_in, new_quality):
+        count = self._count
+        self._index[count] = index
+        self._name_id[count] = name_id
+        self._old_sell_in[count] = old_sell_in
+        self._old_quality[count] = old_quality
+        self._new_sell_in[count] = new_sell_in
+        self._new_quality[count] = new_quality
+        self._count = count + 1
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        """
+        Yields a Change for each changed item, in item order.
+        """
+        name_of = self.names.name_of
+        for entry in range(self._count):
+            name = name_of(self._name_id[entry])
+            yield Change(self._index[entry],
+                         ItemState(name, self._old_sell_in[entry], self._old_quality[entry]),
+                         ItemState(name, self._new_sell_in[entry], self._new_quality[entry]))
+
+    def packed(self):
+        """
+        Returns copies of the recorded columns, one entry per changed item.
+
+        Returns:
+            dict: "index", "name_id", "old_sell_in", "old_quality", "new_sell_in" and
+                "new_quality" arrays (array.array).
+        """
+        count = self._count
+        return {
+            "index": self._index[:count],
+            "name_id": self._name_id[:count],
+            "old_sell_in": self._old_sell_in[:count],
+            "old_quality": self._old_quality[:count],
+            "new_sell_in": self._new_sell_in[:count],
+            "new_quality": self._new_quality[:count],
+        }
 
 
 # Example usage
@@ -298,4 +1554,4 @@ if __name__ == "__main__":
     
     # Print the updated items
     for item in items:
-        print(item)
\ No newline at end of file
+        print(item)
@@ -0,0 +1,259 @@
+
+"""
+    This module contains a multi-process execution mode for large Gilded Rose inventories.
+
+    The items are split into shards of (name, sell_in, quality) rows, which persistent worker
+    processes update with the strategies of a `StrategyRegistry`. The results are written
+    back to the items in their original order. Small inventories are updated in the calling
+    process, below a size threshold measured on first use, and so are inventories whose
+    registry cannot be pickled.
+
+    Classes:
+        ParallelGildedRose: GildedRose counterpart running the updates in a process pool.
+
+"""
+import math
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from gilded_rose_enhanced import Item, GildedRose, default_registry
+
+_worker_registry = None
+
+
+def _init_worker(registry):
+    global _worker_registry
+    _worker_registry = registry
+
+
+def _update_shard(rows, days):
+    """
+    Updates a shard of (name, sell_in, quality) rows in a worker process.
+
+    Returns:
+        list: The (sell_in, quality) of each row after `days` days.
+    """
+    resolve = _worker_registry.resolve
+    results = []
+    for name, sell_in, quality in rows:
+        item = Item(name, sell_in, quality)
+        strategy = resolve(name)
+        if days == 1:
+            strategy.update_quality(item)
+        else:
+            strategy.advance(item, days)
+        results.append((item.sell_in, item.quality))
+    return results
+
+
+def _copies(items):
+    return [Item(item.name, item.sell_in, item.quality) for item in items]
+
+
+class ParallelGildedRose:
+    """
+    Updates an inventory in a pool of worker processes, or serially when it is small.
+
+    Strategies run in the workers on copies of the items, so they may only change the
+    sell_in and quality of an item. The workers are started on the first parallel update
+    and kept until `close()`; the object can be used as a context manager.
+
+    The workers get a pickled copy of the registry when they start. Before each parallel
+    update the registry is pickled again, and the workers are restarted when it differs,
+    so changes made to the registry or its strategies in the calling process reach them.
+    A registry that cannot be pickled is never sent: the updates run serially instead.
+
+    Attributes:
+        items (list): The managed items.
+        registry (StrategyRegistry): Resolves item names to strategies, in every process.
+        workers (int): The number of worker processes.
+        serial_threshold (int): Inventories with fewer items are updated serially. Measured
+            by `calibrate()` on the first update of at least `2 * min_chunk_size` items when
+            not given; smaller inventories are always updated serially.
+        shards_per_worker (int): How many shards each worker gets per update, to even out
+            the load.
+
+    Methods:
+        update_quality(): Moves the inventory forward by one day.
+        advance(days): Moves the inventory forward by several days.
+        calibrate(): Measures the serial threshold.
+        chunk_size(count): Returns the shard size used for `count` items.
+        close(): Stops the worker processes.
+    """
+    shards_per_worker = 4
+    min_chunk_size = 1000
+
+    def __init__(self, items, registry=None, workers=None, serial_threshold=None):
+        """
+        Initializes the parallel engine.
+
+        Args:
+            items (list): A list of item objects to be managed.
+            registry (StrategyRegistry, optional): Resolves item names to strategies.
+                Defaults to `default_registry()`. It must be picklable.
+            workers (int, optional): The number of worker processes. Defaults to the
+                number of CPUs.
+            serial_threshold (int, optional): Inventories with fewer items are updated
+                serially. Measured on first use when not given.
+        """
+        self.registry = registry if registry is not None else default_registry()
+        self.workers = workers or os.cpu_count() or 1
+        self.serial_threshold = serial_threshold
+        self._serial = GildedRose(items, self.registry)
+        self._executor = None
+        self._pickled_registry = None  # the registry the workers were started with
+
+    @property
+    def items(self):
+        return self._serial.items
+
+    @items.setter
+    def items(self, items):
+        self._serial.items = items
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Stops the worker processes, if they were started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pool(self):
+        """
+        Returns the process pool, started with the current registry, or None when the
+        registry cannot be pickled.
+        """
+        try:
+            pickled = pickle.dumps(self.registry)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            self.close()
+            return None
+        if self._executor is not None and pickled != self._pickled_registry:
+            self.close()  # the registry changed since the workers started
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                 initargs=(self.registry,))
+            self._pickled_registry = pickled
+        return self._executor
+
+    def chunk_size(self, count):
+        """
+        Returns the number of items per shard for an inventory of `count` items.
+
+        Each worker gets `shards_per_worker` shards, but no shard is smaller than
+        `min_chunk_size` items, so that the per-task overhead stays small.
+        """
+        shards = self.workers * self.shards_per_worker
+        return max(self.min_chunk_size, math.ceil(count / shards))
+
+    def calibrate(self, sample_size=20000):
+        """
+        Measures the inventory size from which the parallel update is faster.
+
+        Times a serial update and parallel updates of two sample sizes, and solves
+        serial_cost * n = overhead + parallel_cost * n for n. If the parallel path costs
+        more per item, or the registry cannot be pickled, the threshold is infinite and the
+        updates stay serial.
+
+        Args:
+            sample_size (int, optional): Number of items in the larger sample.
+
+        Returns:
+            int or float: The measured threshold, also stored in `serial_threshold`.
+        """
+        sample = _copies(self.items[:sample_size])
+        sample += [Item("+5 Dexterity Vest", 10, 20) for _ in range(sample_size - len(sample))]
+        small = sample[:sample_size // 4]
+
+        serial = GildedRose(_copies(sample), self.registry)
+        start = time.perf_counter()
+        serial.update_quality()
+        serial_cost = (time.perf_counter() - start) / sample_size
+
+        if not self._update_parallel(_copies(small), 1):  # start the workers
+            self.serial_threshold = math.inf
+            return self.serial_threshold
+        timings = []
+        for shard in (small, sample):
+            shard = _copies(shard)
+            start = time.perf_counter()
+            self._update_parallel(shard, 1)
+            timings.append(time.perf_counter() - start)
+        parallel_cost = (timings[1] - timings[0]) / (len(sample) - len(small))
+        overhead = max(0.0, timings[0] - parallel_cost * len(small))
+
+        if parallel_cost >= serial_cost:
+            self.serial_threshold = math.inf
+        else:
+            self.serial_threshold = math.ceil(overhead / (serial_cost - parallel_cost))
+        return self.serial_threshold
+
+    def _update_parallel(self, items, days):
+        """
+        Updates the items in the worker processes.
+
+        Returns:
+            bool: False, leaving the items unchanged, when the registry cannot be pickled.
+        """
+        pool = self._pool()
+        if pool is None:
+            return False
+        size = self.chunk_size(len(items))
+        shards = [[(item.name, item.sell_in, item.quality) for item in items[start:start + size]]
+                  for start in range(0, len(items), size)]
+        results = pool.map(_update_shard, shards, [days] * len(shards))
+        index = 0
+        for shard in results:
+            for sell_in, quality in shard:
+                item = items[index]
+                item.sell_in = sell_in
+                item.quality = quality
+                index += 1
+        return True
+
+    def _run(self, days):
+        items = self.items
+        if len(items) >= 2 * self.min_chunk_size:  # smaller inventories fit in one shard
+            if self.serial_threshold is None:
+                self.calibrate()
+            if len(items) >= self.serial_threshold and self._update_parallel(items, days):
+                return
+        if days == 1:
+            self._serial.update_quality()
+        else:
+            self._serial.advance(days)
+
+    def update_quality(self):
+        """
+        Moves the inventory forward by one day.
+
+        Returns:
+            None
+        """
+        self._run(1)
+
+    def advance(self, days):
+        """
+        Moves the inventory forward by the given number of days.
+
+        Args:
+            days (int): The number of days to move forward.
+
+        Raises:
+            ValueError: If `days` is negative.
+
+        Returns:
+            None
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        self._run(days)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+    This module contains the golden master of the texttest fixture, for tests comparing
+    the engines with it.
+
+    Constants:
+        THIRTY_DAYS: The approved output of `texttest_fixture.py 30`.
+
+    Functions:
+        render_days: Renders the daily listings of the fixture for any engine.
+
+"""
+import os
+
+THIRTY_DAYS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "texttests", "ThirtyDays", "stdout.gr")
+
+
+def render_days(items, update, days=30):
+    """
+    Returns the listings the texttest fixture prints, for an engine.
+
+    Args:
+        items (function): Returns the current items.
+        update (function): Advances the items by one day.
+        days (int, optional): The last day shown. Defaults to 30.
+
+    Returns:
+        str: The listings of days 0 to `days`.
+    """
+    lines = ["OMGHAI!"]
+    for day in range(days + 1):
+        lines.append("-------- day %s --------" % day)
+        lines.append("name, sellIn, quality")
+        lines.extend(repr(item) for item in items())
+        lines.append("")
+        update()
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,152 @@
+
+"""
+    This module contains a multiset inventory for the Gilded Rose system.
+
+    Large inventories hold many units sharing the same (name, sell_in, quality) state. An
+    `ItemHistogram` stores one count per distinct state, and a daily update maps every state
+    to its next state once, merging the counts of states that meet. Its cost depends on the
+    number of distinct states, not on the number of units; since quality is bounded (0..50,
+    80 for Sulfuras) states keep merging as items saturate.
+
+    The histogram is sparse: sell_in is not bounded, so the counts are kept in a dictionary
+    keyed by state rather than in a dense array.
+
+    Classes:
+        ItemHistogram: Inventory stored as counts of distinct item states.
+
+"""
+from gilded_rose_enhanced import Item, default_registry
+
+
+class ItemHistogram:
+    """
+    An inventory stored as the number of units in each distinct (name, sell_in, quality) state.
+
+    Each state also keeps the position of its first unit, so that `to_items()` lists the
+    units in the order they were added; units whose states merged are listed together, at
+    the position of the earliest one.
+
+    Attributes:
+        registry (StrategyRegistry): Resolves item names to strategies.
+
+    Methods:
+        from_items(items, registry=None): Builds a histogram from a list of items.
+        add(name, sell_in, quality, count=1): Adds units in a given state.
+        states(): Returns (name, sell_in, quality, count) for every distinct state.
+        to_items(): Expands the histogram to a list of items.
+        update_quality(): Moves every state forward by one day.
+        advance(days): Moves every state forward by several days.
+    """
+
+    def __init__(self, registry=None):
+        """
+        Initializes an empty histogram.
+
+        Args:
+            registry (StrategyRegistry, optional): Resolves item names to strategies.
+                Defaults to `default_registry()`.
+        """
+        self.registry = registry if registry is not None else default_registry()
+        self._counts = {}  # (name, sell_in, quality) -> [position of the first unit, count]
+        self._units = 0
+
+    @classmethod
+    def from_items(cls, items, registry=None):
+        """
+        Builds a histogram from a list of items.
+
+        Args:
+            items (iterable): The items to count.
+            registry (StrategyRegistry, optional): Resolves item names to strategies.
+
+        Returns:
+            ItemHistogram: A new histogram.
+        """
+        histogram = cls(registry)
+        for item in items:
+            histogram.add(item.name, item.sell_in, item.quality)
+        return histogram
+
+    def add(self, name, sell_in, quality, count=1):
+        """
+        Adds `count` units in the given state.
+
+        Raises:
+            ValueError: If `count` is not positive.
+        """
+        if count <= 0:
+            raise ValueError("count must be positive, got %s" % count)
+        entry = self._counts.get((name, sell_in, quality))
+        if entry is None:
+            self._counts[(name, sell_in, quality)] = [self._units, count]
+        else:
+            entry[1] += count
+        self._units += count
+
+    def __len__(self):
+        return self._units
+
+    def states(self):
+        """
+        Returns every distinct state with its number of units, in unit order.
+
+        Returns:
+            list: (name, sell_in, quality, count) tuples.
+        """
+        ordered = sorted(self._counts.items(), key=lambda state: state[1][0])
+        return [(name, sell_in, quality, count) for (name, sell_in, quality), (_, count) in ordered]
+
+    def to_items(self):
+        """
+        Expands the histogram to one item per unit.
+
+        Returns:
+            list: New Item objects, in unit order.
+        """
+        return [Item(name, sell_in, quality)
+                for name, sell_in, quality, count in self.states()
+                for _ in range(count)]
+
+    def _remap(self, days):
+        resolve = self.registry.resolve
+        counts = {}
+        for (name, sell_in, quality), (position, count) in self._counts.items():
+            item = Item(name, sell_in, quality)
+            strategy = resolve(name)
+            if days == 1:
+                strategy.update_quality(item)
+            else:
+                strategy.advance(item, days)
+            entry = counts.get((item.name, item.sell_in, item.quality))
+            if entry is None:
+                counts[(item.name, item.sell_in, item.quality)] = [position, count]
+            else:
+                entry[0] = min(entry[0], position)
+                entry[1] += count
+        self._counts = counts
+
+    def update_quality(self):
+        """
+        Moves every state forward by one day, merging the states that meet.
+
+        Returns:
+            None
+        """
+        self._remap(1)
+
+    def advance(self, days):
+        """
+        Moves every state forward by the given number of days.
+
+        Args:
+            days (int): The number of days to move forward.
+
+        Raises:
+            ValueError: If `days` is negative.
+
+        Returns:
+            None
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        self._remap(days)
@@ -0,0 +1,135 @@
+
+"""
+    This module renders the daily item listings of the texttest fixture in bulk.
+
+    Printing one `Item` per line formats each line with `Item.__repr__` and writes it
+    separately. `DayRenderer` formats a whole day into one bytes buffer instead, and the
+    buffer goes to the binary stream in large writes. The encoded "name, " prefix of each
+    name is built once, and so is each encoded line: an inventory holds few distinct
+    (name, sell_in, quality) states, so most lines of a day are cache hits. The bytes written
+    are those `print` writes with UTF-8 and "\n" line endings.
+
+    Classes:
+        DayRenderer: Buffered writer of "name, sellIn, quality" listings.
+
+"""
+import sys
+from collections import OrderedDict
+
+
+class _PrefixCache(dict):
+    """
+    Maps each name to its encoded "name, " prefix, encoding names on first sight.
+    """
+
+    def __init__(self, encoding):
+        super().__init__()
+        self.encoding = encoding
+
+    def __missing__(self, name):
+        prefix = self[name] = ("%s, " % name).encode(self.encoding)
+        return prefix
+
+
+class _LineCache(OrderedDict):
+    """
+    Maps each (name, sell_in, quality) state to its encoded line, holding at most
+    `max_lines` lines; the oldest line makes room for a new one.
+    """
+
+    def __init__(self, prefixes, max_lines):
+        super().__init__()
+        self.prefixes = prefixes
+        self.max_lines = max_lines
+
+    def __missing__(self, state):
+        name, sell_in, quality = state
+        line = self.prefixes[name] + ("%s, %s\n" % (sell_in, quality)).encode(self.prefixes.encoding)
+        if len(self) >= self.max_lines:
+            self.popitem(last=False)
+        self[state] = line
+        return line
+
+
+class DayRenderer:
+    """
+    Writes the listings of the texttest fixture to a binary stream, a day at a time.
+
+    Lines are cached by value, so sell_in and quality must be integers, as the engines keep
+    them (1.0 would print as the cached line of 1).
+
+    Attributes:
+        stream (file): The binary stream written to.
+        chunk_size (int): The number of buffered bytes that triggers a write.
+
+    Methods:
+        write_line(text): Buffers a line of text.
+        render_day(day, items): Buffers the listing of the items on a day.
+        flush(): Writes the buffered bytes to the stream.
+    """
+
+    header = b"name, sellIn, quality\n"
+
+    def __init__(self, stream=None, encoding="utf-8", chunk_size=1 << 16, max_lines=1 << 16):
+        """
+        Initializes a renderer.
+
+        Args:
+            stream (file, optional): A binary stream. Defaults to `sys.stdout.buffer`.
+            encoding (str, optional): The encoding of the names and lines. Defaults to UTF-8.
+            chunk_size (int, optional): The number of buffered bytes that triggers a write.
+            max_lines (int, optional): The number of encoded lines kept for reuse.
+        """
+        if stream is None:
+            sys.stdout.flush()
+            stream = sys.stdout.buffer
+        self.stream = stream
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self._lines = _LineCache(_PrefixCache(encoding), max_lines)
+        self._buffer = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def write_line(self, text):
+        """
+        Buffers a line of text, followed by a newline.
+        """
+        self._buffer += text.encode(self.encoding)
+        self._buffer += b"\n"
+        self._write_full()
+
+    def render_day(self, day, items):
+        """
+        Buffers the listing of the items on a day, as the texttest fixture prints it.
+
+        Args:
+            day (int): The day number of the heading.
+            items (iterable): Objects with name, sell_in and quality attributes, e.g. a
+                `GildedRose.snapshot()`, which reads an inventory tracking quiescent
+                items without moving them back into the updates.
+        """
+        lines = self._lines
+        buffer = self._buffer
+        buffer += ("-------- day %s --------\n" % day).encode(self.encoding)
+        buffer += self.header
+        buffer += b"".join([lines[item.name, item.sell_in, item.quality] for item in items])
+        buffer += b"\n"
+        self._write_full()
+
+    def _write_full(self):
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered bytes to the stream and flushes it.
+        """
+        if self._buffer:
+            self.stream.write(self._buffer)
+            self._buffer = bytearray()
+        self.stream.flush()
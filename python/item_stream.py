@@ -0,0 +1,227 @@
+
+"""
+    This module streams item records through the Gilded Rose strategies, for inventories
+    too large to load as a list of items.
+
+    Records are read one at a time from a CSV file (with a header row) or a JSON Lines file,
+    classified with the strategies of a registry, advanced by a number of days and written
+    out in input order, one chunk at a time. Memory use depends on the chunk size, not on
+    the size of the file. Each record needs "name", "sell_in" and "quality" fields, the
+    latter two integers; a malformed record is reported with its line number. Other fields
+    are written out unchanged: JSON Lines records keep them, and CSV output has a fixed
+    header, "name,sell_in,quality" or the header of the CSV input.
+
+    Run from the command line, e.g. to advance a CSV file by 30 days:
+
+        python item_stream.py items.csv advanced.csv --days 30
+
+    Functions:
+        read_records: Yields the records of a CSV or JSON Lines stream.
+        advance_records: Advances a stream of records, chunk by chunk.
+        write_records: Writes records to a CSV or JSON Lines stream.
+        run: Streams records from one file to another and measures the throughput.
+        main: Command-line entry point.
+
+"""
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+
+from gilded_rose_enhanced import Item, default_registry, family_registry
+
+FORMATS = ("csv", "jsonl")
+FIELDS = ("name", "sell_in", "quality")
+
+
+def _format_of(path, fmt):
+    if fmt is not None:
+        return fmt
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def _csv_records(stream):
+    reader = csv.DictReader(stream)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def _jsonl_records(stream):
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            try:
+                yield number, json.loads(line)
+            except ValueError as error:
+                raise ValueError("line %d is not valid JSON: %s" % (number, error)) from None
+
+
+def read_records(stream, fmt="csv"):
+    """
+    Yields the records of a stream, one dict per row or line, with integer sell_in and quality.
+
+    Args:
+        stream (file): A text stream.
+        fmt (str, optional): "csv" for a file with a header row, or "jsonl".
+
+    Raises:
+        ValueError: If the format is unknown, or a record lacks a field or holds a sell_in
+            or quality that is not an integer. The message gives the line number.
+
+    Yields:
+        dict: The fields of each record, in file order.
+    """
+    if fmt == "csv":
+        records = _csv_records(stream)
+    elif fmt == "jsonl":
+        records = _jsonl_records(stream)
+    else:
+        raise ValueError("unknown record format %r, expected one of %s" % (fmt, ", ".join(FORMATS)))
+    for number, record in records:
+        if not isinstance(record, dict):
+            raise ValueError("line %d holds no record object" % number)
+        missing = [field for field in FIELDS if record.get(field) is None]
+        if missing:
+            raise ValueError("line %d has no %s" % (number, ", ".join(missing)))
+        for field in ("sell_in", "quality"):
+            try:
+                record[field] = int(record[field])
+            except (TypeError, ValueError):
+                raise ValueError("line %d: %s must be an integer, got %r" % (number, field, record[field])) from None
+        yield record
+
+
+def advance_records(records, days=1, registry=None, chunk_size=10000):
+    """
+    Advances a stream of records by a number of days, chunk by chunk.
+
+    Each chunk is read, updated and handed on before the next one is read, so at most
+    `chunk_size` records are held at a time.
+
+    Args:
+        records (iterable): Dicts with "name", "sell_in" and "quality" fields, as read by
+            `read_records`.
+        days (int, optional): The number of days to advance. Defaults to 1.
+        registry (StrategyRegistry, optional): Resolves the names to strategies.
+            Defaults to `default_registry()`.
+        chunk_size (int, optional): The number of records per chunk.
+
+    Raises:
+        ValueError: If `days` is negative.
+
+    Yields:
+        list: The updated records of each chunk, in input order.
+    """
+    if days < 0:
+        raise ValueError("days must not be negative, got %s" % days)
+    resolve = (registry if registry is not None else default_registry()).resolve
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+        for record in chunk:
+            item = Item(record["name"], record["sell_in"], record["quality"])
+            resolve(item.name).advance(item, days)
+            record["sell_in"] = item.sell_in
+            record["quality"] = item.quality
+        yield chunk
+
+
+def write_records(chunks, stream, fmt="csv", fields=FIELDS):
+    """
+    Writes chunks of records to a stream.
+
+    Args:
+        chunks (iterable): Lists of records.
+        stream (file): A text stream.
+        fmt (str, optional): "csv" or "jsonl".
+        fields (sequence, optional): The header of CSV output, "name", "sell_in" and
+            "quality" by default. Fields a record lacks are written empty.
+
+    Raises:
+        ValueError: If a record has a field outside the CSV header.
+
+    Returns:
+        int: The number of records written.
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=list(fields), lineterminator="\n")
+        writer.writeheader()
+        header = set(fields)
+    for chunk in chunks:
+        if fmt == "csv":
+            for number, record in enumerate(chunk, count + 1):
+                if not header.issuperset(record):
+                    raise ValueError("record %d has fields outside the CSV header: %s"
+                                     % (number, ", ".join(sorted(set(record) - header))))
+            writer.writerows(chunk)
+        else:
+            stream.write("".join(json.dumps(record) + "\n" for record in chunk))
+        count += len(chunk)
+    return count
+
+
+def run(source, target, days=1, fmt=None, output_format=None, registry=None, chunk_size=10000):
+    """
+    Streams the records of one file through the strategies into another file.
+
+    CSV output of CSV input keeps the header of the input.
+
+    Args:
+        source (str): The input file, or "-" for standard input.
+        target (str): The output file, or "-" for standard output.
+        days (int, optional): The number of days to advance.
+        fmt (str, optional): The input format; guessed from the extension when omitted.
+        output_format (str, optional): The output format; the input format when omitted.
+        registry (StrategyRegistry, optional): Resolves the names to strategies.
+        chunk_size (int, optional): The number of records per chunk.
+
+    Returns:
+        tuple: (number of records, seconds taken).
+    """
+    fmt = _format_of(source, fmt)
+    output_format = output_format or (fmt if target == "-" else _format_of(target, None))
+    start = time.perf_counter()
+    source_file = sys.stdin if source == "-" else open(source, newline="", encoding="utf-8")
+    target_file = sys.stdout if target == "-" else open(target, "w", newline="", encoding="utf-8")
+    try:
+        lines, fields = source_file, FIELDS
+        if fmt == "csv" and output_format == "csv":
+            # CSV to CSV keeps the columns of the input
+            header = source_file.readline()
+            lines = itertools.chain([header], source_file)
+            fields = next(csv.reader([header]), None) or FIELDS
+        chunks = advance_records(read_records(lines, fmt), days, registry, chunk_size)
+        count = write_records(chunks, target_file, output_format, fields)
+    finally:
+        if source_file is not sys.stdin:
+            source_file.close()
+        if target_file is not sys.stdout:
+            target_file.close()
+    return count, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Advance a CSV or JSON Lines item file by a number of days.")
+    parser.add_argument("source", help='input file, "-" for standard input')
+    parser.add_argument("target", help='output file, "-" for standard output')
+    parser.add_argument("--days", type=int, default=1, help="days to advance (default 1)")
+    parser.add_argument("--format", choices=FORMATS, help="input format (default from the extension)")
+    parser.add_argument("--output-format", choices=FORMATS, help="output format (default the input format)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="records per chunk (default 10000)")
+    parser.add_argument("--families", action="store_true",
+                        help='also match the "Conjured " and "Backstage passes to " name families')
+    args = parser.parse_args(argv)
+    registry = family_registry() if args.families else default_registry()
+    count, seconds = run(args.source, args.target, args.days, args.format, args.output_format,
+                         registry, args.chunk_size)
+    print("%d rows in %.2f s (%.0f rows/s)" % (count, seconds, count / seconds if seconds else 0),
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+
+"""
+    This module contains a columnar inventory for the Gilded Rose system, backed by NumPy arrays.
+
+    Instead of one `Item` object per item, an `ItemTable` keeps one array per attribute and
+    updates the whole inventory with masked array operations. It follows the rules of the
+    strategies in `gilded_rose_enhanced`.
+
+    Classes:
+        ItemTable: Columnar inventory with a vectorized daily update.
+
+    Functions:
+        update_columns: Applies the daily update to sell_in, quality and category arrays.
+
+"""
+import numpy as np
+
+from gilded_rose_enhanced import (
+    Item, default_registry,
+    NORMAL, AGED_BRIE, SULFURAS, BACKSTAGE_PASSES, CONJURED,
+)
+
+# daily quality change of each category before the sell-by date, indexed by category code;
+# the change doubles once the sell-by date has passed (backstage passes are handled apart)
+_BASE_CHANGE = np.zeros(CONJURED + 1, dtype=np.int32)
+_BASE_CHANGE[NORMAL] = -1
+_BASE_CHANGE[AGED_BRIE] = 1
+_BASE_CHANGE[CONJURED] = -2
+
+
+def _category_of(registry, name):
+    category = registry.resolve(name).category
+    if category is None:
+        raise ValueError("strategy for %r has no category code" % name)
+    return category
+
+
+class ItemTable:
+    """
+    A columnar inventory holding the item attributes in NumPy arrays.
+
+    Attributes:
+        names (list): The name of each item.
+        sell_in (numpy.ndarray): The sell_in value of each item (int32).
+        quality (numpy.ndarray): The quality of each item (int32).
+        category (numpy.ndarray): The category code of each item (int8).
+        kernel (function): Updates the columns by one day, `update_columns` when None.
+
+    Methods:
+        from_items(items, registry=None, kernel=None): Builds a table from a list of items.
+        to_items(): Returns the content of the table as a list of items.
+        update_quality(): Updates all items of the table by one day.
+    """
+    kernel = None
+
+    def __init__(self, names, sell_in, quality, category, kernel=None):
+        """
+        Initializes a new table from its columns.
+
+        Args:
+            names (list): The name of each item.
+            sell_in (array-like): The sell_in value of each item.
+            quality (array-like): The quality of each item.
+            category (array-like): The category code of each item.
+            kernel (function, optional): Updates the columns by one day, for category codes
+                other than the built-in ones. Defaults to `update_columns`.
+
+        Raises:
+            ValueError: If the columns do not all have the same length.
+        """
+        self.names = list(names)
+        self.sell_in = np.array(sell_in, dtype=np.int32)
+        self.quality = np.array(quality, dtype=np.int32)
+        self.category = np.array(category, dtype=np.int8)
+        if not len(self.names) == len(self.sell_in) == len(self.quality) == len(self.category):
+            raise ValueError("all columns must have the same length")
+        if kernel is not None:
+            self.kernel = kernel
+
+    @classmethod
+    def from_items(cls, items, registry=None, kernel=None):
+        """
+        Builds a table from a list of items.
+
+        Args:
+            items (list): The items to copy into the table.
+            registry (StrategyRegistry, optional): Resolves the item names to strategies,
+                whose category codes are stored. Defaults to `default_registry()`.
+            kernel (function, optional): Updates the columns by one day, for registries
+                using other category codes. Defaults to `update_columns`.
+
+        Raises:
+            ValueError: If an item resolves to a strategy without a category code.
+
+        Returns:
+            ItemTable: A new table holding the items.
+        """
+        if registry is None:
+            registry = default_registry()
+        return cls(
+            [item.name for item in items],
+            [item.sell_in for item in items],
+            [item.quality for item in items],
+            [_category_of(registry, item.name) for item in items],
+            kernel,
+        )
+
+    def to_items(self):
+        """
+        Returns the content of the table as a list of items.
+
+        Returns:
+            list: A new list of Item objects, in table order.
+        """
+        return [Item(name, sell_in, quality)
+                for name, sell_in, quality in zip(self.names, self.sell_in.tolist(), self.quality.tolist())]
+
+    def __len__(self):
+        return len(self.names)
+
+    def update_quality(self):
+        """
+        Updates the sell_in and quality of every item in the table by one day.
+
+        Returns:
+            None
+        """
+        kernel = self.kernel or update_columns
+        kernel(self.sell_in, self.quality, self.category)
+
+
+def update_columns(sell_in, quality, category):
+    """
+    Updates columns of sell_in, quality and category codes in place by one day.
+
+    The arrays may be views, e.g. slices of a larger table.
+
+    Args:
+        sell_in (numpy.ndarray): The sell_in values, updated in place.
+        quality (numpy.ndarray): The qualities, updated in place.
+        category (numpy.ndarray): The category codes.
+
+    Returns:
+        None
+    """
+    sulfuras = category == SULFURAS
+    backstage = category == BACKSTAGE_PASSES
+
+    # time passes, except for Sulfuras
+    np.subtract(sell_in, 1, out=sell_in, where=~sulfuras)
+    expired = sell_in < 0
+
+    # once the sell-by date has passed, quality changes twice as fast
+    change = _BASE_CHANGE[category] * (1 + expired)
+
+    # backstage passes enhance quality by 1, 2 or 3 as the concert approaches
+    bands = 1 + (sell_in < 10) + (sell_in < 5)
+    np.copyto(change, bands, where=backstage)
+    quality += change
+
+    # quality drops to 0 after the concert
+    quality[backstage & expired] = 0
+
+    # quality is never negative and never more than 50
+    np.clip(quality, 0, 50, out=quality)
+
+    # Sulfuras quality is always 80
+    quality[sulfuras] = 80
@@ -0,0 +1,234 @@
+
+"""
+    This module tabulates custom strategies so that they advance many days in O(log days).
+
+    The built-in strategies advance with closed forms; a custom `ItemStrategy` subclass only
+    has `update_quality`, so advancing it D days takes D calls. `TabulatedStrategy` probes
+    the `update_quality` of such a strategy over a bounded domain (sell_in in a window,
+    quality in 0..80) and records the next state of every state. Binary lifting over that
+    table gives the state after 2^k days for every k, so any number of days is a product
+    of at most log2(D) table lookups.
+
+    Tabulation only holds for strategies that are pure functions of (sell_in, quality), keep
+    the quality in the tabulated range, change sell_in by the same amount (-1 or 0) every day
+    and behave the same for every sell_in beyond the window. Probing checks these properties
+    on the domain and on sample sell_in values far beyond it; when a check fails the wrapper
+    keeps advancing step by step.
+
+    Classes:
+        JumpTable: Binary lifting over a finite successor function.
+        TabulatedStrategy: ItemStrategy wrapper advancing through jump tables.
+
+    Functions:
+        tabulated_registry: Wraps the strategies of a registry that have no closed form.
+
+"""
+from gilded_rose_enhanced import Item, ItemStrategy, default_registry
+
+
+class JumpTable:
+    """
+    The iterates of a function mapping states 0..n-1 to states 0..n-1.
+
+    Level k maps each state to its image after 2^k applications; levels are built on demand.
+
+    Methods:
+        jump(state, steps): Returns the state after `steps` applications.
+    """
+
+    def __init__(self, successors):
+        """
+        Initializes a jump table.
+
+        Args:
+            successors (list): The image of each state.
+        """
+        self._levels = [list(successors)]
+
+    def _level(self, k):
+        levels = self._levels
+        while len(levels) <= k:
+            previous = levels[-1]
+            levels.append([previous[successor] for successor in previous])
+        return levels[k]
+
+    def jump(self, state, steps):
+        """
+        Returns the state reached from `state` after `steps` applications of the function.
+        """
+        k = 0
+        while steps:
+            if steps & 1:
+                state = self._level(k)[state]
+            steps >>= 1
+            k += 1
+        return state
+
+
+class TabulatedStrategy(ItemStrategy):
+    """
+    Wraps a strategy and advances its items through jump tables when it can be tabulated.
+
+    The states are the quality of an item in 0..`max_quality` combined with a sell_in bucket:
+    one bucket per sell_in from `min_sell_in` to `max_sell_in`, and one for every lower
+    sell_in. Items with a higher sell_in first go through a table of the quality alone,
+    until they enter the window.
+
+    Attributes:
+        strategy (ItemStrategy): The wrapped strategy.
+        tabulated (bool): Whether the strategy passed the checks and advances through tables.
+        reason (str): Why the strategy was not tabulated, or None.
+        category (int): The category code of the wrapped strategy.
+        ages (bool): Whether the wrapped strategy decreases sell_in.
+    """
+
+    # sell_in values beyond the window probed by the boundedness check, as offsets
+    far_probes = tuple(2 ** k for k in range(21))
+
+    def __init__(self, strategy, min_sell_in=-16, max_sell_in=64, max_quality=80, probe_name=""):
+        """
+        Probes a strategy and builds its jump tables.
+
+        Args:
+            strategy (ItemStrategy): The strategy to tabulate.
+            min_sell_in (int, optional): The lowest sell_in with a bucket of its own.
+            max_sell_in (int, optional): The highest sell_in with a bucket of its own.
+            max_quality (int, optional): The highest tabulated quality.
+            probe_name (str, optional): The name of the items passed to the strategy
+                while probing.
+
+        Raises:
+            ValueError: If the sell_in window is empty or max_quality is negative.
+        """
+        if min_sell_in > max_sell_in:
+            raise ValueError("min_sell_in must not exceed max_sell_in")
+        if max_quality < 0:
+            raise ValueError("max_quality must not be negative, got %s" % max_quality)
+        self.strategy = strategy
+        self.category = strategy.category
+        self.ages = strategy.ages
+        self.min_sell_in = min_sell_in
+        self.max_sell_in = max_sell_in
+        self.max_quality = max_quality
+        self.probe_name = probe_name
+        self._window = self._above = None
+        self._step = 0
+        try:
+            self.reason = self._tabulate()
+        except Exception as error:  # a strategy failing on part of the domain is not tabulated
+            self.reason = "update_quality raised %r" % error
+        self.tabulated = self.reason is None
+
+    def _probe(self, sell_in):
+        """
+        Returns the (sell_in change, next quality) of each quality at the given sell_in,
+        or a string describing the failed check.
+        """
+        row = []
+        for quality in range(self.max_quality + 1):
+            results = set()
+            for _ in range(2):
+                item = Item(self.probe_name, sell_in, quality)
+                self.strategy.update_quality(item)
+                results.add((item.name, item.sell_in - sell_in, item.quality))
+            if len(results) != 1:
+                return "update_quality is not deterministic"
+            name, change, next_quality = results.pop()
+            if name != self.probe_name:
+                return "update_quality renames items"
+            if not 0 <= next_quality <= self.max_quality:
+                return "quality leaves 0..%s" % self.max_quality
+            if change not in (0, -1):
+                return "sell_in changes by %s" % change
+            row.append((change, next_quality))
+        return row
+
+    def _tabulate(self):
+        low, high = self.min_sell_in, self.max_sell_in
+        qualities = self.max_quality + 1
+        below = self._probe(low - 1)
+        above = self._probe(high + 1)
+        rows = [below] + [self._probe(sell_in) for sell_in in range(low, high + 1)]
+        for row in rows + [above]:
+            if isinstance(row, str):
+                return row
+        for probe in self.far_probes:
+            for row, expected in ((self._probe(low - 1 - probe), below), (self._probe(high + 1 + probe), above)):
+                if isinstance(row, str):
+                    return row
+                if row != expected:
+                    return "update_quality depends on sell_in beyond %s..%s" % (low, high)
+        changes = {change for row in rows + [above] for change, _ in row}
+        if len(changes) != 1:
+            return "sell_in changes by different amounts"
+        step = self._step = changes.pop()
+
+        successors = []
+        for bucket, row in enumerate(rows):
+            # bucket 0 holds every sell_in below the window, bucket b the sell_in low + b - 1
+            next_bucket = max(0, bucket + step) if bucket else 0
+            successors.extend(next_bucket * qualities + next_quality for _, next_quality in row)
+        self._window = JumpTable(successors)
+        self._above = JumpTable([next_quality for _, next_quality in above])
+        return None
+
+    def update_quality(self, item):
+        self.strategy.update_quality(item)
+
+    def is_quiescent(self, item):
+        return self.strategy.is_quiescent(item)
+
+    def plan(self, item):
+        return self.strategy.plan(item)
+
+    def advance(self, item, days):
+        """
+        Moves the given item forward by `days` days through the jump tables.
+
+        Falls back to the `advance` of the wrapped strategy when it was not tabulated or the
+        quality of the item is outside the tabulated range.
+        """
+        if not self.tabulated or not 0 <= item.quality <= self.max_quality:
+            self.strategy.advance(item, days)
+            return
+        sell_in, quality, step = item.sell_in, item.quality, self._step
+        if sell_in > self.max_sell_in:
+            # the quality follows the far future row until sell_in enters the window
+            above_days = days if step == 0 else min(days, sell_in - self.max_sell_in)
+            quality = self._above.jump(quality, above_days)
+            sell_in += step * above_days
+            days -= above_days
+        if days:
+            qualities = self.max_quality + 1
+            bucket = max(0, sell_in - self.min_sell_in + 1)
+            state = self._window.jump(bucket * qualities + quality, days)
+            quality = state % qualities
+            sell_in += step * days
+        item.sell_in = sell_in
+        item.quality = quality
+
+
+def tabulated_registry(registry=None, **domain):
+    """
+    Builds a copy of a registry whose strategies without a closed form are tabulated.
+
+    Strategies overriding `advance` (like the built-in ones) are kept; the others are
+    wrapped in a `TabulatedStrategy`, so that `GildedRose.advance` jumps over the days.
+
+    Args:
+        registry (StrategyRegistry, optional): The registry to copy. Defaults to
+            `default_registry()`.
+        **domain: min_sell_in, max_sell_in and max_quality of the tabulated domains.
+
+    Returns:
+        StrategyRegistry: A new registry.
+    """
+    if registry is None:
+        registry = default_registry()
+
+    def wrap(strategy):
+        if type(strategy).advance is not ItemStrategy.advance:
+            return strategy
+        return TabulatedStrategy(strategy, **domain)
+
+    return registry.with_strategies(wrap)
@@ -0,0 +1,149 @@
+
+"""
+    This module compiles the strategies of a registry into one specialized update function.
+
+    The generated function classifies each item name once into a branch number and runs the
+    branch inline: the rules of the built-in strategies are written out in the function body,
+    and any other strategy is called through a pre-bound local. The generated code only depends
+    on the sequence of branch kinds (the registry fingerprint), so it is compiled once per
+    fingerprint and reused for every registry sharing it.
+
+    Functions:
+        compile_kernel: Builds the specialized update function of a registry.
+        registry_fingerprint: Returns the key under which the code of a registry is cached.
+
+"""
+from gilded_rose_enhanced import (
+    NormalItemStrategy, AgedBrieStrategy, SulfurasStrategy, BackstagePassesStrategy,
+    ConjuredItemStrategy, default_registry,
+)
+
+_DEGRADING = """\
+quality = item.quality - {rate}
+sell_in = item.sell_in - 1
+if sell_in < 0 and quality > 0:
+    quality -= {rate}
+if quality < 0:
+    quality = 0
+elif quality > 50:
+    quality = 50
+item.sell_in = sell_in
+item.quality = quality
+"""
+
+# inlined body of each built-in strategy, run with the current item bound to `item`
+_INLINE = {
+    NormalItemStrategy: _DEGRADING.format(rate=1),
+    ConjuredItemStrategy: _DEGRADING.format(rate=2),
+    AgedBrieStrategy: """\
+quality = item.quality + 1
+sell_in = item.sell_in - 1
+if sell_in < 0 and quality < 50:
+    quality += 1
+if quality < 0:
+    quality = 0
+elif quality > 50:
+    quality = 50
+item.sell_in = sell_in
+item.quality = quality
+""",
+    SulfurasStrategy: """\
+item.quality = 80
+""",
+    BackstagePassesStrategy: """\
+sell_in = item.sell_in - 1
+quality = item.quality
+if quality < 50:
+    quality += 1
+    if sell_in < 10:
+        quality += 1
+    if sell_in < 5:
+        quality += 1
+if sell_in < 0 or quality < 0:
+    quality = 0
+elif quality > 50:
+    quality = 50
+item.sell_in = sell_in
+item.quality = quality
+""",
+}
+
+# compiled factory code, by registry fingerprint
+_code_cache = {}
+
+
+def registry_fingerprint(registry):
+    """
+    Returns the key under which the generated code of a registry is cached.
+
+    Args:
+        registry (StrategyRegistry): The registry to compile.
+
+    Returns:
+        tuple: For each distinct strategy, the name of its inlined class, or None when
+            it is called instead.
+    """
+    return tuple(type(strategy).__name__ if type(strategy) in _INLINE else None
+                 for strategy in registry.strategies())
+
+
+def _indent(code, depth):
+    return "".join("    " * depth + line + "\n" for line in code.splitlines())
+
+
+def _factory_source(strategies):
+    """
+    Generates the source of a factory binding the branch table and called strategies.
+    """
+    bound = ["branches_get", "classify"] + ["call_%d" % branch for branch, strategy in enumerate(strategies)
+                                            if type(strategy) not in _INLINE]
+    lines = ["def factory(%s):" % ", ".join(bound),
+             "    def update_quality(items, %s):" % ", ".join("%s=%s" % (name, name) for name in bound),
+             "        for item in items:",
+             "            branch = branches_get(item.name)",
+             "            if branch is None:",
+             "                branch = classify(item.name)"]
+    for branch, strategy in enumerate(strategies):
+        keyword = "if" if branch == 0 else "elif"
+        lines.append("            %s branch == %d:" % (keyword, branch))
+        body = _INLINE.get(type(strategy), "call_%d(item)\n" % branch)
+        lines.append(_indent(body, 4).rstrip("\n"))
+    lines.append("    return update_quality")
+    return "\n".join(lines) + "\n"
+
+
+def compile_kernel(registry=None):
+    """
+    Builds a function updating a list of items by one day with the strategies of a registry.
+
+    The function gives the same results as `GildedRose(items, registry).update_quality()`.
+    It resolves each distinct name through the registry once; recompile after changing the
+    registry.
+
+    Args:
+        registry (StrategyRegistry, optional): The strategies to compile. Defaults to
+            `default_registry()`.
+
+    Returns:
+        function: A function taking a list of items and updating them in place.
+    """
+    if registry is None:
+        registry = default_registry()
+    strategies = registry.strategies()
+    fingerprint = registry_fingerprint(registry)
+    code = _code_cache.get(fingerprint)
+    if code is None:
+        code = _code_cache[fingerprint] = compile(_factory_source(strategies),
+                                                  "<gilded rose kernel>", "exec")
+    namespace = {}
+    exec(code, namespace)
+
+    branch_of = {id(strategy): branch for branch, strategy in enumerate(strategies)}
+    branches = {}
+
+    def classify(name):
+        branch = branches[name] = branch_of[id(registry.resolve(name))]
+        return branch
+
+    calls = [strategy.update_quality for strategy in strategies if type(strategy) not in _INLINE]
+    return namespace["factory"](branches.get, classify, *calls)
@@ -0,0 +1,207 @@
+
+"""
+    This module contains a binary inventory file, updated in place through a memory map.
+
+    The file holds a header, the name dictionary and one fixed-width record per item. It is
+    opened with `mmap` and its records are exposed as NumPy columns, so `update_quality`
+    changes the file in place without parsing or loading it; the operating system reads
+    and writes the pages as they are touched.
+
+    File layout (little-endian, version 1):
+        header: magic b"GRIT", format version (uint16), record size (uint16), item count
+            (int64), size of the name dictionary (int64).
+        name dictionary: UTF-8 JSON of `NameDictionary.to_dict()`, padded to 8 bytes.
+        records: name id (uint32), sell_in (int32), quality (int32), category (int8) and
+            3 bytes of padding per item.
+
+    Classes:
+        MappedItemTable: ItemTable whose columns are views of a memory-mapped file.
+
+"""
+import ctypes
+import json
+import mmap
+import struct
+
+import numpy as np
+
+from gilded_rose_enhanced import NameDictionary
+from item_table import ItemTable, _category_of
+
+MAGIC = b"GRIT"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHqq")  # magic, version, record size, item count, dictionary size
+_RECORD = np.dtype([("name_id", "<u4"), ("sell_in", "<i4"), ("quality", "<i4"), ("category", "i1")],
+                   align=True)
+_RECORD_SIZE = 16
+
+
+def _aligned(offset):
+    return (offset + 7) // 8 * 8
+
+
+class MappedItemTable(ItemTable):
+    """
+    An ItemTable whose columns are views of the records of a memory-mapped file.
+
+    Changes to the columns are changes to the file; call `flush()` to write them to disk
+    before other processes read it, and `close()` when done. Views taken from the columns
+    or `records` (e.g. `table.sell_in[:10]`) keep the file mapped and must be deleted
+    before `close()`.
+
+    Attributes:
+        path (str): The mapped file.
+        dictionary (NameDictionary): The name dictionary stored in the file.
+        records (memoryview): The raw records, 16 bytes per item.
+        name_id (numpy.ndarray): The name id of each item (uint32 view).
+        names (list): The name of each item, decoded from the name ids.
+
+    Methods:
+        create(path, items, registry=None): Writes items to a new file and maps it.
+        open(path): Maps an existing file.
+        flush(): Writes the changed pages to the file.
+        close(): Unmaps the file.
+    """
+
+    def __init__(self, path, file, mapping, kernel=None):
+        """
+        Initializes a table over a mapped file; use `create` or `open` instead.
+
+        Raises:
+            ValueError: If the file is not an inventory file of a known version.
+        """
+        self.path = path
+        self._file = file
+        self._mapping = mapping
+        if len(mapping) < _HEADER.size:
+            raise ValueError("%s is not an inventory file" % path)
+        magic, version, record_size, count, dictionary_size = _HEADER.unpack_from(mapping, 0)
+        if magic != MAGIC:
+            raise ValueError("%s is not an inventory file" % path)
+        if version != VERSION or record_size != _RECORD_SIZE:
+            raise ValueError("%s has format version %s, expected %s" % (path, version, VERSION))
+        start = _HEADER.size
+        self.dictionary = NameDictionary.from_dict(json.loads(bytes(mapping[start:start + dictionary_size])))
+        offset = _aligned(start + dictionary_size)
+        if len(mapping) < offset + count * _RECORD_SIZE:
+            raise ValueError("%s is truncated" % path)
+        self._offset = offset
+        self._count = count
+        self._map_columns()
+        if kernel is not None:
+            self.kernel = kernel
+
+    def _map_columns(self):
+        offset, count = self._offset, self._count
+        self.records = memoryview(self._mapping)[offset:offset + count * _RECORD_SIZE]
+        # NumPy keeps no buffer export of an mmap, so the mapping could be closed under a
+        # view of the columns; a ctypes array holds one for as long as any view lives
+        exported = (ctypes.c_char * (count * _RECORD_SIZE)).from_buffer(self._mapping, offset)
+        table = np.frombuffer(exported, dtype=_RECORD, count=count)
+        self.name_id = table["name_id"]
+        self.sell_in = table["sell_in"]
+        self.quality = table["quality"]
+        self.category = table["category"]
+
+    @classmethod
+    def create(cls, path, items, registry=None, kernel=None):
+        """
+        Writes items to a new inventory file and maps it.
+
+        Args:
+            path (str): The file to write; an existing file is replaced.
+            items (list): The items to store.
+            registry (StrategyRegistry, optional): Resolves the names to category codes.
+                Defaults to `default_registry()`.
+            kernel (function, optional): Updates the columns by one day, see `ItemTable`.
+
+        Raises:
+            ValueError: If an item resolves to a strategy without a category code.
+
+        Returns:
+            MappedItemTable: The mapped table.
+        """
+        dictionary = NameDictionary(registry)
+        table = np.zeros(len(items), dtype=_RECORD)
+        table["name_id"] = dictionary.encode(items)
+        table["sell_in"] = [item.sell_in for item in items]
+        table["quality"] = [item.quality for item in items]
+        table["category"] = [_category_of(dictionary.registry, item.name) for item in items]
+        encoded = json.dumps(dictionary.to_dict()).encode("utf-8")
+        with open(path, "wb") as inventory_file:
+            inventory_file.write(_HEADER.pack(MAGIC, VERSION, _RECORD_SIZE, len(items), len(encoded)))
+            inventory_file.write(encoded)
+            inventory_file.write(bytes(_aligned(_HEADER.size + len(encoded)) - _HEADER.size - len(encoded)))
+            inventory_file.write(table.tobytes())
+        return cls.open(path, kernel)
+
+    @classmethod
+    def open(cls, path, kernel=None):
+        """
+        Maps an existing inventory file for reading and writing.
+
+        Args:
+            path (str): The file to map.
+            kernel (function, optional): Updates the columns by one day, see `ItemTable`.
+
+        Raises:
+            ValueError: If the file is not an inventory file of a known version.
+
+        Returns:
+            MappedItemTable: The mapped table.
+        """
+        inventory_file = open(path, "r+b")
+        try:
+            mapping = mmap.mmap(inventory_file.fileno(), 0)
+        except BaseException:
+            inventory_file.close()
+            raise
+        try:
+            return cls(path, inventory_file, mapping, kernel)
+        except BaseException:
+            mapping.close()
+            inventory_file.close()
+            raise
+
+    @property
+    def names(self):
+        names = self.dictionary.names
+        return [names[name_id] for name_id in self.name_id.tolist()]
+
+    def __len__(self):
+        return len(self.sell_in)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def flush(self):
+        """
+        Writes the changed pages of the mapping to the file.
+        """
+        self._mapping.flush()
+
+    def close(self):
+        """
+        Flushes and unmaps the file. The table cannot be used afterwards.
+
+        Raises:
+            BufferError: If a view taken from the columns or `records` is still held. The
+                table stays open and usable; delete the view and close again.
+        """
+        if self._file.closed:
+            return
+        self._mapping.flush()
+        self.records.release()
+        self.records = self.name_id = self.sell_in = self.quality = self.category = None
+        try:
+            self._mapping.close()
+        except BufferError:
+            self._map_columns()
+            raise BufferError("%s is still mapped by a view of its columns or records (e.g. "
+                              "table.sell_in[:10]); delete the views taken from the table before "
+                              "closing it" % self.path) from None
+        self._file.close()
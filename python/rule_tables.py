@@ -0,0 +1,249 @@
+
+"""
+    This module contains declarative rule tables for the Gilded Rose item categories.
+
+    A rule file (JSON) lists the categories, each with the names it matches and how its
+    quality changes every day. A rule set compiles to object-mode strategies for
+    `GildedRose` and to a NumPy kernel for `ItemTable`. The built-in categories are
+    described in `gilded_rose_rules.json`.
+
+    Category fields:
+        name (str): Label of the category, for error messages.
+        match (dict): Lists of "exact" names, name "prefix"es and whole-name regex "pattern"s.
+        default (bool): Whether names matching no category belong to this one (exactly one).
+        daily_delta (int): Quality change per day. Defaults to 0.
+        expired_multiplier (int): Factor of the change once the sell-by date has passed.
+            Defaults to 1.
+        bands (list): {"below": n, "delta": d} entries: while sell_in is below n after the
+            day's decrement, the change is d instead. The lowest matching band wins.
+        reset_at_expiry (bool): Whether the quality drops to 0 once the sell-by date has passed.
+        min_quality, max_quality (int): Quality caps. Default to 0 and 50.
+        immutable (bool): Whether sell_in and quality never change.
+        fixed_quality (int): For immutable categories, the quality they are set to.
+
+    Classes:
+        Rule: One category of a rule set.
+        RuleStrategy: ItemStrategy applying a rule.
+        RuleSet: A list of rules, compiled to a registry or a NumPy kernel.
+
+"""
+import json
+import os
+
+from gilded_rose_enhanced import ItemStrategy, StrategyRegistry
+
+try:
+    import numpy as np
+except ImportError:  # the NumPy kernel is optional
+    np = None
+
+BUILTIN_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gilded_rose_rules.json")
+
+_FIELDS = {"name", "match", "default", "daily_delta", "expired_multiplier", "bands",
+           "reset_at_expiry", "min_quality", "max_quality", "immutable", "fixed_quality"}
+_MATCH_KINDS = {"exact", "prefix", "pattern"}
+
+
+class Rule:
+    """
+    One category of a rule set, with the defaults of the rule format filled in.
+
+    Attributes:
+        name (str): Label of the category.
+        match (dict): Lists of exact names, prefixes and patterns, by kind.
+        default (bool): Whether unmatched names belong to this category.
+        daily_delta (int): Quality change per day.
+        expired_multiplier (int): Factor of the change once the sell-by date has passed.
+        bands (list): (below, delta) pairs, highest threshold first.
+        reset_at_expiry (bool): Whether the quality drops to 0 once expired.
+        min_quality (int): Lowest quality.
+        max_quality (int): Highest quality.
+        immutable (bool): Whether sell_in and quality never change.
+        fixed_quality (int): The quality of immutable items, or None to keep it.
+    """
+
+    def __init__(self, fields):
+        """
+        Initializes a rule from its fields in the rule file.
+
+        Raises:
+            ValueError: If a field or match kind is unknown.
+        """
+        unknown = set(fields) - _FIELDS
+        if unknown:
+            raise ValueError("unknown rule fields: %s" % ", ".join(sorted(unknown)))
+        self.name = fields.get("name", "")
+        self.match = dict(fields.get("match", {}))
+        unknown = set(self.match) - _MATCH_KINDS
+        if unknown:
+            raise ValueError("unknown match kinds in rule %r: %s" % (self.name, ", ".join(sorted(unknown))))
+        self.default = bool(fields.get("default", False))
+        self.daily_delta = int(fields.get("daily_delta", 0))
+        self.expired_multiplier = int(fields.get("expired_multiplier", 1))
+        self.bands = sorted(((int(band["below"]), int(band["delta"])) for band in fields.get("bands", [])),
+                            reverse=True)
+        self.reset_at_expiry = bool(fields.get("reset_at_expiry", False))
+        self.min_quality = int(fields.get("min_quality", 0))
+        self.max_quality = int(fields.get("max_quality", 50))
+        self.immutable = bool(fields.get("immutable", False))
+        fixed_quality = fields.get("fixed_quality")
+        self.fixed_quality = int(fixed_quality) if fixed_quality is not None else None
+
+
+class RuleStrategy(ItemStrategy):
+    """
+    Strategy updating items according to a rule.
+
+    Attributes:
+        rule (Rule): The rule applied.
+        category (int): The index of the rule in its rule set.
+        ages (bool): False for immutable rules.
+    """
+
+    def __init__(self, rule, category):
+        self.rule = rule
+        self.category = category
+        self.ages = not rule.immutable
+
+    def update_quality(self, item):
+        rule = self.rule
+        if rule.immutable:
+            if rule.fixed_quality is not None:
+                item.quality = rule.fixed_quality
+            return
+
+        # time passes
+        item.sell_in -= 1
+        expired = item.sell_in < 0
+
+        # quality changes by the daily delta, the band delta close to the sell-by date
+        change = rule.daily_delta * (rule.expired_multiplier if expired else 1)
+        for below, delta in rule.bands:
+            if item.sell_in < below:
+                change = delta
+        quality = item.quality + change
+
+        if expired and rule.reset_at_expiry:
+            quality = 0
+
+        item.quality = min(max(quality, rule.min_quality), rule.max_quality)
+
+
+class RuleSet:
+    """
+    A list of category rules, compiled to strategies or to a NumPy kernel.
+
+    The category code of an item is the index of its rule in the list.
+
+    Attributes:
+        rules (list): The rules, in file order.
+
+    Methods:
+        load(path=BUILTIN_RULES): Reads a rule set from a JSON file.
+        from_dict(data): Builds a rule set from parsed JSON.
+        registry(): Builds a StrategyRegistry of RuleStrategy objects.
+        kernel(): Builds a NumPy function updating ItemTable columns.
+    """
+
+    def __init__(self, rules):
+        """
+        Initializes a rule set.
+
+        Raises:
+            ValueError: If there is not exactly one default rule, or more than 127 rules.
+        """
+        self.rules = list(rules)
+        if sum(rule.default for rule in self.rules) != 1:
+            raise ValueError("a rule set needs exactly one default rule")
+        if len(self.rules) > 127:
+            raise ValueError("a rule set holds at most 127 rules")
+
+    @classmethod
+    def load(cls, path=BUILTIN_RULES):
+        """
+        Reads a rule set from a JSON file, by default the built-in categories.
+        """
+        with open(path, encoding="utf-8") as rule_file:
+            return cls.from_dict(json.load(rule_file))
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a rule set from parsed JSON, a dict with a "categories" list.
+        """
+        return cls(Rule(fields) for fields in data["categories"])
+
+    def registry(self):
+        """
+        Builds a registry resolving names to one RuleStrategy per rule.
+
+        Returns:
+            StrategyRegistry: A new registry.
+        """
+        strategies = [RuleStrategy(rule, category) for category, rule in enumerate(self.rules)]
+        default = next(strategy for strategy in strategies if strategy.rule.default)
+        registry = StrategyRegistry(default=default)
+        for strategy in strategies:
+            for name in strategy.rule.match.get("exact", []):
+                registry.register(name, strategy)
+            for prefix in strategy.rule.match.get("prefix", []):
+                registry.register_prefix(prefix, strategy)
+            for pattern in strategy.rule.match.get("pattern", []):
+                registry.register_pattern(pattern, strategy)
+        return registry
+
+    def kernel(self):
+        """
+        Builds a function updating sell_in, quality and category columns in place by one day.
+
+        The category codes must come from `registry()`, e.g. through
+        `ItemTable.from_items(items, rule_set.registry(), rule_set.kernel())`.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+
+        Returns:
+            function: kernel(sell_in, quality, category).
+        """
+        if np is None:
+            raise ImportError("the rule kernel needs numpy")
+        rules = self.rules
+
+        def column(values, dtype=np.int32):
+            return np.array(values, dtype=dtype)
+
+        immutable = column([rule.immutable for rule in rules], bool)
+        keeps_quality = column([rule.immutable and rule.fixed_quality is None for rule in rules], bool)
+        fixed_quality = column([rule.fixed_quality or 0 for rule in rules])
+        daily_delta = column([rule.daily_delta for rule in rules])
+        expired_multiplier = column([rule.expired_multiplier for rule in rules])
+        reset_at_expiry = column([rule.reset_at_expiry for rule in rules], bool)
+        min_quality = column([rule.min_quality for rule in rules])
+        max_quality = column([rule.max_quality for rule in rules])
+
+        # band k of every rule, highest threshold first; rules with fewer bands never match
+        band_count = max([len(rule.bands) for rule in rules] or [0])
+        never = np.iinfo(np.int32).min
+        band_below = [column([rule.bands[k][0] if k < len(rule.bands) else never for rule in rules])
+                      for k in range(band_count)]
+        band_delta = [column([rule.bands[k][1] if k < len(rule.bands) else 0 for rule in rules])
+                      for k in range(band_count)]
+
+        def kernel(sell_in, quality, category):
+            frozen = immutable[category]
+
+            # time passes, except for immutable items
+            np.subtract(sell_in, 1, out=sell_in, where=~frozen)
+            expired = sell_in < 0
+
+            change = daily_delta[category] * np.where(expired, expired_multiplier[category], 1)
+            for below, delta in zip(band_below, band_delta):
+                np.copyto(change, delta[category], where=sell_in < below[category])
+            updated = quality + change
+            updated[expired & reset_at_expiry[category]] = 0
+            np.clip(updated, min_quality[category], max_quality[category], out=updated)
+
+            updated = np.where(frozen, fixed_quality[category], updated)
+            np.copyto(quality, updated, where=~keeps_quality[category], casting="unsafe")
+
+        return kernel
@@ -0,0 +1,291 @@
+
+"""
+    This module contains an ItemTable stored in shared memory, for multi-process updates.
+
+    All columns live in one `multiprocessing.shared_memory` segment, so worker processes
+    update disjoint slices of the table in place and readers attach to it without copying.
+    The segment layout is a header (row count, size of the name dictionary and a random
+    token identifying the table), the name dictionary as UTF-8 JSON, then the sell_in,
+    quality and name id columns (int32) and the category column (int8).
+
+    Lifecycle: the owner calls `SharedItemTable.create(...)`, other processes call
+    `SharedItemTable.attach(name)`; every process calls `close()` when done, and the owner
+    finally calls `unlink()` to free the segment. Worker processes attach for the length of
+    one task and check the token, so a segment unlinked and created again under the same
+    name is never confused with the old one. They map the segment without registering it
+    with the resource tracker, which forked workers share with the owner.
+
+    The kernel of the copied table updates the shared one too. Workers receive it by
+    pickling, so tables with a closure kernel, such as `RuleSet.kernel()`, are updated in
+    this process only.
+
+    Classes:
+        SharedItemTable: ItemTable backed by a shared memory segment.
+
+"""
+import ctypes
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from gilded_rose_enhanced import NameDictionary
+from item_table import ItemTable, update_columns
+
+try:
+    import _posixshmem
+except ImportError:  # Windows
+    _posixshmem = None
+
+_HEADER = struct.Struct("<qq16s")  # row count, size of the name dictionary in bytes, token
+_ALIGNMENT = 8
+
+
+def _aligned(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _layout(count, dictionary_size):
+    """
+    Returns the offsets of the sell_in, quality, name id and category columns, and the segment size.
+    """
+    sell_in = _aligned(_HEADER.size + dictionary_size)
+    quality = _aligned(sell_in + 4 * count)
+    name_id = _aligned(quality + 4 * count)
+    category = _aligned(name_id + 4 * count)
+    return sell_in, quality, name_id, category, max(1, category + count)
+
+
+class _Attachment:
+    """
+    A mapping of an existing POSIX segment, with the `name`, `buf` and `close()` of a
+    SharedMemory object.
+
+    Before Python 3.13, `SharedMemory(name)` registers the segment with the resource
+    tracker, which would unlink it when this process exits, as if it were the owner.
+    """
+
+    def __init__(self, name):
+        fd = _posixshmem.shm_open("/" + name, os.O_RDWR, mode=0o600)
+        try:
+            self._mmap = mmap.mmap(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
+        self.name = name
+        self.buf = memoryview(self._mmap)
+
+    def close(self):
+        self.buf.release()
+        self._mmap.close()
+
+
+def _column(buffer, dtype, count, offset):
+    """
+    Returns a column over the buffer and a weak reference that is dead once no view of it lives.
+    """
+    # NumPy keeps no buffer export of shared memory, so the segment could be closed under a
+    # view of a column; a ctypes array holds one for as long as any view lives
+    dtype = np.dtype(dtype)
+    exported = (ctypes.c_char * (count * dtype.itemsize)).from_buffer(buffer, offset)
+    return np.frombuffer(exported, dtype=dtype, count=count), weakref.ref(exported)
+
+
+def _open_segment(name):
+    """
+    Attaches to an existing segment without registering it for cleanup by this process.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    if _posixshmem is None:  # Windows segments are not tracked
+        return shared_memory.SharedMemory(name)
+    return _Attachment(name)
+
+
+def _update_slice(segment_name, token, start, stop, kernel=None):
+    """
+    Updates rows [start, stop) of a shared table in a worker process.
+
+    Raises:
+        ValueError: If the segment now holds another table than the one with `token`.
+    """
+    table = SharedItemTable.attach(segment_name, kernel)
+    try:
+        if table.token != token:
+            raise ValueError("segment %s holds another table" % segment_name)
+        kernel = table.kernel or update_columns
+        kernel(table.sell_in[start:stop], table.quality[start:stop], table.category[start:stop])
+    finally:
+        table.close()
+
+
+class SharedItemTable(ItemTable):
+    """
+    An ItemTable whose columns are views of a shared memory segment.
+
+    Attributes:
+        name (str): The name of the segment, used by other processes to attach.
+        owner (bool): Whether this object created the segment.
+        token (bytes): Random bytes written at creation, distinguishing tables that
+            reuse a segment name.
+        dictionary (NameDictionary): The name dictionary stored in the segment.
+        name_id (numpy.ndarray): The name id of each item (int32).
+        names (list): The name of each item, decoded from the name ids.
+
+    Methods:
+        create(table, name=None, registry=None): Copies a table into a new segment.
+        attach(name, kernel=None): Attaches to an existing segment.
+        update_quality(executor=None, shards=None): Updates the table, optionally in workers.
+        close(): Detaches from the segment.
+        unlink(): Frees the segment.
+    """
+
+    def __init__(self, segment, owner, kernel=None):
+        """
+        Initializes a table over a segment; use `create` or `attach` instead.
+        """
+        self._segment = segment
+        self.owner = owner
+        if kernel is not None:
+            self.kernel = kernel
+        buffer = segment.buf
+        count, dictionary_size, self.token = _HEADER.unpack_from(buffer, 0)
+        self.dictionary = NameDictionary.from_dict(json.loads(bytes(buffer[_HEADER.size:_HEADER.size + dictionary_size])))
+        self._count = count
+        self._offsets = _layout(count, dictionary_size)[:4]
+        self._map_columns()
+
+    def _map_columns(self):
+        buffer, count = self._segment.buf, self._count
+        sell_in, quality, name_id, category = self._offsets
+        self.sell_in, sell_in = _column(buffer, np.int32, count, sell_in)
+        self.quality, quality = _column(buffer, np.int32, count, quality)
+        self.name_id, name_id = _column(buffer, np.int32, count, name_id)
+        self.category, category = _column(buffer, np.int8, count, category)
+        self._exports = (sell_in, quality, name_id, category)
+
+    @classmethod
+    def create(cls, table, name=None, registry=None):
+        """
+        Copies a table into a new shared memory segment, keeping its kernel.
+
+        Args:
+            table (ItemTable): The table to copy, e.g. from `ItemTable.from_items(items)`.
+            name (str, optional): The segment name. A unique name is chosen when omitted.
+            registry (StrategyRegistry, optional): Resolves the category codes of the name
+                dictionary. Defaults to `default_registry()`.
+
+        Returns:
+            SharedItemTable: The owner of the new segment.
+        """
+        dictionary = NameDictionary(registry)
+        name_ids = [dictionary.intern(item_name) for item_name in table.names]
+        encoded = json.dumps(dictionary.to_dict()).encode("utf-8")
+        count = len(table)
+        sell_in, quality, name_id, category, size = _layout(count, len(encoded))
+
+        segment = shared_memory.SharedMemory(name, create=True, size=size)
+        buffer = segment.buf
+        _HEADER.pack_into(buffer, 0, count, len(encoded), os.urandom(16))
+        buffer[_HEADER.size:_HEADER.size + len(encoded)] = encoded
+        np.ndarray(count, dtype=np.int32, buffer=buffer, offset=sell_in)[:] = table.sell_in
+        np.ndarray(count, dtype=np.int32, buffer=buffer, offset=quality)[:] = table.quality
+        np.ndarray(count, dtype=np.int32, buffer=buffer, offset=name_id)[:] = name_ids
+        np.ndarray(count, dtype=np.int8, buffer=buffer, offset=category)[:] = table.category
+        return cls(segment, owner=True, kernel=table.kernel)
+
+    @classmethod
+    def attach(cls, name, kernel=None):
+        """
+        Attaches to the segment of an existing shared table, without copying it.
+
+        Args:
+            name (str): The segment name, from the `name` of the owner.
+            kernel (function, optional): Updates the columns by one day, as the `kernel`
+                of the owner. Defaults to `update_columns`.
+
+        Returns:
+            SharedItemTable: A table reading and writing the same memory.
+        """
+        return cls(_open_segment(name), owner=False, kernel=kernel)
+
+    @property
+    def name(self):
+        return self._segment.name
+
+    @property
+    def names(self):
+        names = self.dictionary.names
+        return [names[name_id] for name_id in self.name_id.tolist()]
+
+    def __len__(self):
+        return len(self.sell_in)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def update_quality(self, executor=None, shards=None):
+        """
+        Updates every item of the table by one day, in place.
+
+        Args:
+            executor (concurrent.futures.Executor, optional): A process pool whose workers
+                each update a slice of the table. The update runs in this process when omitted.
+            shards (int, optional): The number of slices. Defaults to the number of CPUs.
+
+        Raises:
+            ValueError: If an executor is given and the kernel cannot be pickled.
+
+        Returns:
+            None
+        """
+        kernel = self.kernel
+        if executor is None:
+            (kernel or update_columns)(self.sell_in, self.quality, self.category)
+            return
+        if kernel is not None:
+            try:
+                pickle.dumps(kernel)
+            except (pickle.PicklingError, AttributeError, TypeError):
+                raise ValueError("the kernel %r cannot be sent to worker processes, update the table "
+                                 "without an executor" % kernel) from None
+        count = len(self)
+        shards = shards or os.cpu_count() or 1
+        bounds = [count * shard // shards for shard in range(shards + 1)]
+        futures = [executor.submit(_update_slice, self.name, self.token, start, stop, kernel)
+                   for start, stop in zip(bounds, bounds[1:]) if start < stop]
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """
+        Detaches this object from the segment. The table cannot be used afterwards.
+
+        Raises:
+            BufferError: If a view taken from the columns (e.g. `table.quality[:10]`) is
+                still held. The table stays usable; delete the view and close again.
+        """
+        if self.sell_in is None:
+            return
+        self.sell_in = self.quality = self.name_id = self.category = None
+        if any(export() is not None for export in self._exports):
+            self._map_columns()
+            raise BufferError("segment %s is still mapped by a view of its columns (e.g. table.quality[:10]); "
+                              "delete the views taken from the table before closing it" % self.name)
+        self._segment.close()
+
+    def unlink(self):
+        """
+        Frees the segment once every process has closed it. Called by the owner.
+        """
+        self._segment.unlink()
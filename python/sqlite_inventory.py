@@ -0,0 +1,244 @@
+
+"""
+    This module contains an inventory stored in SQLite and updated with set-based SQL.
+
+    The `item` table is created from the PostgreSQL schema of the SQL version of the kata
+    (`sql/structure/postgreSQL/create.sql`), without its database-level statements, and the
+    daily update runs as bulk SQL over the whole table instead of one Python call per item.
+    SQLite stands in locally for PostgreSQL.
+
+    `UPDATE_QUALITY_STATEMENTS` follow `sql/code/update_quality.sql`, which mirrors the nested
+    conditions of the legacy `gilded_rose.GildedRose` one statement per branch. That script
+    lacks the first branch, where Aged Brie and backstage passes gain 1 quality, so it is
+    added here; with it the results are those of the legacy engine. Each statement scans the
+    table, so the update uses `UPDATE_QUALITY`, one statement computing the same result with
+    CASE expressions in a single scan, and `ADVANCE`, which moves the table forward by
+    `:days` days at once with closed-form arithmetic.
+
+    Classes:
+        SqliteInventory: Inventory held in an SQLite `item` table.
+
+    Functions:
+        load_schema: Reads the `item` table definition from the kata's SQL schema.
+
+    Constants:
+        SCHEMA: Path of the PostgreSQL schema of the SQL version of the kata.
+        UPDATE_QUALITY_STATEMENTS: The statements of one daily update, in order.
+        UPDATE_QUALITY: One statement applying the daily update in a single scan.
+        ADVANCE: One statement applying `:days` daily updates.
+
+"""
+import os
+import sqlite3
+
+from gilded_rose_enhanced import Item
+
+SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      "..", "sql", "structure", "postgreSQL", "create.sql")
+
+_AGED_BRIE = "'Aged Brie'"
+_BACKSTAGE_PASSES = "'Backstage passes to a TAFKAL80ETC concert'"
+_SULFURAS = "'Sulfuras, Hand of Ragnaros'"
+
+UPDATE_QUALITY_STATEMENTS = tuple(statement.format(brie=_AGED_BRIE, passes=_BACKSTAGE_PASSES, sulfuras=_SULFURAS)
+                                  for statement in (
+    # most items lose 1 quality
+    "UPDATE item SET quality = quality - 1"
+    " WHERE name <> {brie} AND name <> {passes} AND quality > 0 AND name <> {sulfuras}",
+    # Aged Brie and backstage passes gain 1 (missing from sql/code/update_quality.sql)
+    "UPDATE item SET quality = quality + 1"
+    " WHERE (name = {brie} OR name = {passes}) AND quality < 50",
+    # backstage passes gain 1 more 10 days or less before the concert, and 1 more 5 days or less
+    "UPDATE item SET quality = quality + 1"
+    " WHERE name = {passes} AND quality < 50 AND sellIn < 11",
+    "UPDATE item SET quality = quality + 1"
+    " WHERE name = {passes} AND quality < 50 AND sellIn < 6",
+    # time passes
+    "UPDATE item SET sellIn = sellIn - 1 WHERE name <> {sulfuras}",
+    # once the sell-by date has passed, quality changes twice as fast
+    "UPDATE item SET quality = quality - 1"
+    " WHERE sellIn < 0 AND name <> {brie} AND name <> {passes} AND quality > 0 AND name <> {sulfuras}",
+    "UPDATE item SET quality = 0 WHERE sellIn < 0 AND name = {passes}",
+    "UPDATE item SET quality = quality + 1 WHERE sellIn < 0 AND name = {brie} AND quality < 50",
+))
+
+# the nested branches of the legacy engine, resolved for each category in one expression;
+# comparisons with a NULL sellIn are never true, as in the statements above
+UPDATE_QUALITY = """\
+UPDATE item SET
+    quality = CASE
+        WHEN name = {sulfuras} THEN quality
+        WHEN name = {brie} THEN CASE
+            WHEN quality >= 50 THEN quality
+            WHEN quality < 49 AND sellIn < 1 THEN quality + 2
+            ELSE quality + 1
+        END
+        WHEN name = {passes} THEN CASE
+            WHEN sellIn < 1 THEN 0
+            WHEN quality >= 50 THEN quality
+            WHEN sellIn < 6 AND quality < 48 THEN quality + 3
+            WHEN sellIn < 6 THEN 50
+            WHEN sellIn < 11 AND quality < 49 THEN quality + 2
+            WHEN sellIn < 11 THEN 50
+            ELSE quality + 1
+        END
+        WHEN quality <= 0 THEN quality
+        WHEN sellIn < 1 AND quality > 1 THEN quality - 2
+        WHEN sellIn < 1 THEN 0
+        ELSE quality - 1
+    END,
+    sellIn = CASE WHEN name = {sulfuras} THEN sellIn ELSE sellIn - 1 END
+""".format(brie=_AGED_BRIE, passes=_BACKSTAGE_PASSES, sulfuras=_SULFURAS)
+
+# over :days days, an item spends MIN(MAX(sellIn, 0), :days) days before its sell-by date
+# (all of them when sellIn is NULL) and the rest after it, where changes count twice;
+# backstage passes get 1 more per day from 10 days before the concert and 1 more from 5,
+# and are worth 0 once it has passed. MIN and MAX are the scalar SQLite functions
+# (LEAST and GREATEST in PostgreSQL).
+ADVANCE = """\
+UPDATE item SET
+    quality = CASE
+        WHEN name = {sulfuras} THEN quality
+        WHEN name = {brie} THEN CASE
+            WHEN quality >= 50 THEN quality
+            ELSE MIN(50, quality + 2 * :days - IFNULL(MIN(MAX(sellIn, 0), :days), :days))
+        END
+        WHEN name = {passes} THEN CASE
+            WHEN :days > sellIn THEN 0
+            WHEN quality >= 50 THEN quality
+            ELSE MIN(50, quality + :days
+                         + IFNULL(MIN(MAX(10 - sellIn + :days, 0), :days), 0)
+                         + IFNULL(MIN(MAX(5 - sellIn + :days, 0), :days), 0))
+        END
+        WHEN quality <= 0 THEN quality
+        ELSE MAX(0, quality - 2 * :days + IFNULL(MIN(MAX(sellIn, 0), :days), :days))
+    END,
+    sellIn = CASE WHEN name = {sulfuras} THEN sellIn ELSE sellIn - :days END
+WHERE :days > 0
+""".format(brie=_AGED_BRIE, passes=_BACKSTAGE_PASSES, sulfuras=_SULFURAS)
+
+
+def load_schema(path=SCHEMA):
+    """
+    Reads a schema file, leaving out the statements SQLite has no equivalent for.
+
+    `CREATE DATABASE` statements and psql `\\connect` commands are dropped: an SQLite
+    database is the file it is opened from.
+
+    Args:
+        path (str, optional): The schema file. Defaults to `SCHEMA`.
+
+    Returns:
+        str: The remaining SQL script.
+    """
+    with open(path, encoding="utf-8") as schema_file:
+        lines = schema_file.read().splitlines()
+    kept = [line for line in lines
+            if not line.lstrip().upper().startswith("CREATE DATABASE") and not line.lstrip().startswith("\\")]
+    return "\n".join(kept) + "\n"
+
+
+class SqliteInventory:
+    """
+    An inventory held in the `item` table of an SQLite database.
+
+    Items keep their insertion order (the rowid order), like the items of a list.
+
+    Attributes:
+        connection (sqlite3.Connection): The database connection.
+
+    Methods:
+        from_items(items, database=":memory:"): Creates an inventory holding the items.
+        insert(items): Adds items to the table.
+        to_items(): Returns the content of the table as a list of items.
+        update_quality(): Updates every item by one day with one UPDATE statement.
+        advance(days): Updates every item by several days with one UPDATE statement.
+        close(): Closes the connection.
+    """
+
+    def __init__(self, database=":memory:", schema=SCHEMA):
+        """
+        Opens a database, creating the `item` table if it does not exist.
+
+        Args:
+            database (str, optional): The SQLite database file. Defaults to an in-memory database.
+            schema (str, optional): The schema file creating the `item` table.
+        """
+        self.connection = sqlite3.connect(database)
+        exists = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'item'").fetchone()
+        if not exists:
+            self.connection.executescript(load_schema(schema))
+
+    @classmethod
+    def from_items(cls, items, database=":memory:"):
+        """
+        Creates an inventory holding the given items.
+
+        Returns:
+            SqliteInventory: A new inventory.
+        """
+        inventory = cls(database)
+        inventory.insert(items)
+        return inventory
+
+    def insert(self, items):
+        """
+        Adds items to the end of the table.
+        """
+        with self.connection:
+            self.connection.executemany("INSERT INTO item (name, sellIn, quality) VALUES (?, ?, ?)",
+                                        ((item.name, item.sell_in, item.quality) for item in items))
+
+    def to_items(self):
+        """
+        Returns the content of the table as a list of items.
+
+        Returns:
+            list: New Item objects, in insertion order.
+        """
+        return [Item(name, sell_in, quality) for name, sell_in, quality
+                in self.connection.execute("SELECT name, sellIn, quality FROM item ORDER BY rowid")]
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM item").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def update_quality(self):
+        """
+        Updates every item by one day, with one scan of the table.
+
+        Returns:
+            None
+        """
+        with self.connection:
+            self.connection.execute(UPDATE_QUALITY)
+
+    def advance(self, days):
+        """
+        Updates every item by the given number of days, with one scan of the table.
+
+        Args:
+            days (int): The number of days to move forward.
+
+        Raises:
+            ValueError: If `days` is negative.
+
+        Returns:
+            None
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        with self.connection:
+            self.connection.execute(ADVANCE, {"days": days})
+
+    def close(self):
+        """
+        Closes the connection. Changes are committed by each update.
+        """
+        self.connection.close()
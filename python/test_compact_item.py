@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from gilded_rose_enhanced import Item, GildedRose
+from compact_item import CompactItem, ItemColumns
+
+
+def make_items(item_type=Item):
+    return [item_type(name, sell_in, quality)
+            for name in ("+5 Dexterity Vest", "Aged Brie", "Sulfuras, Hand of Ragnaros",
+                         "Backstage passes to a TAFKAL80ETC concert", "Conjured")
+            for sell_in in (-1, 0, 4, 9, 12)
+            for quality in (0, 1, 49, 50, 80)]
+
+
+class CompactItemTest(unittest.TestCase):
+    def test_has_no_instance_dict(self):
+        self.assertFalse(hasattr(CompactItem("foo", 1, 2), "__dict__"))
+
+    def test_engine_gives_same_result_for_every_representation(self):
+        items = make_items()
+        compact = make_items(CompactItem)
+        columns = ItemColumns.from_items(make_items())
+        for inventory in (items, compact, columns):
+            gilded_rose = GildedRose(inventory)
+            for _ in range(12):
+                gilded_rose.update_quality()
+
+        expected = [repr(item) for item in items]
+        self.assertEqual(expected, [repr(item) for item in compact])
+        self.assertEqual(expected, [repr(item) for item in columns])
+
+
+class ItemColumnsTest(unittest.TestCase):
+    def test_names_are_dictionary_encoded(self):
+        columns = ItemColumns.from_items([Item("Aged Brie", 2, 0), Item("foo", 1, 1), Item("Aged Brie", 5, 3)])
+        self.assertEqual(["Aged Brie", "foo"], columns.names)
+        self.assertEqual([0, 1, 0], list(columns.name_ids))
+        self.assertEqual("foo", columns.dictionary.name_of(1))
+
+    def test_view_writes_through_to_columns(self):
+        columns = ItemColumns.from_items([Item("foo", 1, 1)])
+        view = columns[-1]
+        view.name = "Aged Brie"
+        view.quality = 7
+        self.assertEqual("Aged Brie, 1, 7", repr(columns[0]))
+        with self.assertRaises(IndexError):
+            columns[1]
+
+
+if __name__ == '__main__':
+    unittest.main()
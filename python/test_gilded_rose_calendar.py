@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from gilded_rose_enhanced import Item, GildedRose, ItemStrategy, StrategyRegistry
+from gilded_rose_calendar import CalendarGildedRose
+from test_gilded_rose_enhanced import make_items, as_tuples
+
+
+class HalvingStrategy(ItemStrategy):
+    def update_quality(self, item):
+        item.sell_in -= 1
+        item.quality //= 2
+
+
+class CalendarGildedRoseTest(unittest.TestCase):
+    def test_matches_daily_updates(self):
+        expected = make_items()
+        gilded_rose = GildedRose(expected)
+        calendar = CalendarGildedRose(make_items())
+        for day in range(1, 40):
+            gilded_rose.update_quality()
+            calendar.update_quality()
+            if day % 9 == 0:
+                self.assertEqual(as_tuples(expected), as_tuples(calendar.items), "day=%s" % day)
+
+        gilded_rose.advance(100)
+        calendar.advance(100)
+        self.assertEqual(as_tuples(expected), as_tuples(calendar.items))
+        self.assertEqual(139, calendar.day)
+
+    def test_strategy_without_plan_is_stepped_daily(self):
+        registry = StrategyRegistry({"Halving": HalvingStrategy()})
+        calendar = CalendarGildedRose([Item("Halving", 3, 40)], registry)
+        calendar.advance(3)
+        self.assertEqual([("Halving", 0, 5)], as_tuples(calendar.items))
+
+    def test_items_can_be_changed_between_updates(self):
+        calendar = CalendarGildedRose([Item("foo", 5, 10)])
+        calendar.update_quality()
+        calendar.items[0].name = "Aged Brie"
+        calendar.update_quality()
+        self.assertEqual([("Aged Brie", 3, 10)], as_tuples(calendar.items))
+
+
+if __name__ == '__main__':
+    unittest.main()
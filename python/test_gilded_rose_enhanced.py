@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest import mock
+
+from gilded_rose_enhanced import (
+    Item, GildedRose, ItemStrategy, StrategyRegistry, NormalItemStrategy, AgedBrieStrategy,
+    ConjuredItemStrategy, BackstagePassesStrategy, NameDictionary, family_registry,
+    NORMAL, AGED_BRIE, CONJURED,
+)
+
+NAMES = [
+    "+5 Dexterity Vest",
+    "Aged Brie",
+    "Sulfuras, Hand of Ragnaros",
+    "Backstage passes to a TAFKAL80ETC concert",
+    "Conjured",
+]
+
+
+def make_items():
+    return [Item(name, sell_in, quality)
+            for name in NAMES
+            for sell_in in range(-3, 16)
+            for quality in (-2, 0, 1, 7, 48, 49, 50, 80)]
+
+
+def as_tuples(items):
+    return [(item.name, item.sell_in, item.quality) for item in items]
+
+
+class GildedRoseAdvanceTest(unittest.TestCase):
+    def test_advance_matches_daily_updates(self):
+        for days in (0, 1, 2, 5, 6, 10, 11, 17, 60):
+            stepped = make_items()
+            gilded_rose = GildedRose(stepped)
+            for _ in range(days):
+                gilded_rose.update_quality()
+
+            advanced = make_items()
+            GildedRose(advanced).advance(days)
+
+            self.assertEqual(as_tuples(stepped), as_tuples(advanced), "days=%s" % days)
+
+    def test_advance_rejects_negative_days(self):
+        with self.assertRaises(ValueError):
+            GildedRose([Item("foo", 0, 0)]).advance(-1)
+
+
+class GildedRoseStrategyBindingTest(unittest.TestCase):
+    def test_daily_update_creates_no_strategy_objects(self):
+        created = []
+
+        def counting_init(strategy):
+            created.append(type(strategy).__name__)
+
+        gilded_rose = GildedRose(make_items())
+        with mock.patch.object(ItemStrategy, "__init__", counting_init):
+            for _ in range(3):
+                gilded_rose.update_quality()
+            gilded_rose.advance(5)
+        self.assertEqual([], created)
+
+    def test_renamed_item_gets_new_strategy(self):
+        items = [Item("foo", 5, 10)]
+        gilded_rose = GildedRose(items)
+        gilded_rose.update_quality()
+        self.assertEqual(9, items[0].quality)
+
+        items[0].name = "Aged Brie"
+        gilded_rose.update_quality()
+        self.assertEqual(10, items[0].quality)
+
+    def test_added_item_gets_its_strategy(self):
+        items = [Item("foo", 5, 10)]
+        gilded_rose = GildedRose(items)
+        items.append(Item("Sulfuras, Hand of Ragnaros", 0, 80))
+        gilded_rose.update_quality()
+        self.assertEqual(80, items[1].quality)
+        self.assertEqual(0, items[1].sell_in)
+
+
+class GildedRoseQuiescentTest(unittest.TestCase):
+    def test_tracking_gives_same_result(self):
+        expected = make_items()
+        gilded_rose = GildedRose(expected)
+        tracked = GildedRose(make_items(), track_quiescent=True)
+        for day in range(30):
+            gilded_rose.update_quality()
+            tracked.update_quality()
+            if day % 7 == 0:
+                tracked.advance(3)
+                gilded_rose.advance(3)
+            if day % 10 == 0:
+                self.assertEqual(as_tuples(expected), as_tuples(tracked.items), "day=%s" % day)
+        self.assertEqual(as_tuples(expected), as_tuples(tracked.items))
+
+    def test_frozen_items_are_skipped(self):
+        calls = []
+
+        class CountingStrategy(NormalItemStrategy):
+            def update_quality(self, item):
+                calls.append(item.name)
+                super().update_quality(item)
+
+        registry = StrategyRegistry(default=CountingStrategy())
+        gilded_rose = GildedRose([Item("worn", 5, 0), Item("fresh", 5, 3)], registry, track_quiescent=True)
+        for _ in range(4):
+            gilded_rose.update_quality()
+
+        self.assertEqual(["worn", "fresh", "fresh", "fresh"], calls)
+        self.assertEqual([("worn", 1, 0), ("fresh", 1, 0)], as_tuples(gilded_rose.items))
+
+    def test_reading_states_keeps_items_frozen(self):
+        calls = []
+
+        class CountingStrategy(NormalItemStrategy):
+            def update_quality(self, item):
+                calls.append(item.name)
+                super().update_quality(item)
+
+        registry = StrategyRegistry(default=CountingStrategy())
+        gilded_rose = GildedRose([Item("worn", 5, 0), Item("fresh", 5, 3)], registry, track_quiescent=True)
+        for day in range(4):
+            expected = [("worn", 5 - day, 0), ("fresh", 5 - day, max(3 - day, 0))]
+            self.assertEqual(expected, as_tuples(gilded_rose.snapshot()))
+            self.assertEqual(expected, as_tuples(gilded_rose.states_at(0)))
+            self.assertEqual(expected[0], tuple(gilded_rose.state_at(0, 0)))
+            self.assertEqual(("worn", 3 - day, 0), tuple(gilded_rose.state_at(0, 2)))
+            gilded_rose.update_quality()
+
+        self.assertEqual(["worn", "fresh", "fresh", "fresh"], calls)
+
+
+class GildedRoseProjectionTest(unittest.TestCase):
+    def test_states_at_matches_advance_without_changing_items(self):
+        items = make_items()
+        gilded_rose = GildedRose(items)
+        for day in (0, 1, 11, 40):
+            expected = make_items()
+            GildedRose(expected).advance(day)
+            self.assertEqual(as_tuples(expected), [tuple(state) for state in gilded_rose.states_at(day)])
+            self.assertEqual(as_tuples(make_items()), as_tuples(items))
+
+    def test_state_at_by_index_or_item(self):
+        items = [Item("foo", 5, 10), Item("Aged Brie", 2, 0)]
+        gilded_rose = GildedRose(items)
+        self.assertEqual(("foo", 2, 7), gilded_rose.state_at(0, 3))
+        self.assertEqual("Aged Brie, -1, 4", repr(gilded_rose.state_at(items[1], 3)))
+        with self.assertRaises(ValueError):
+            gilded_rose.state_at(Item("foo", 5, 10), 3)
+
+    def test_projections_are_dropped_when_inventory_changes(self):
+        items = [Item("foo", 5, 10)]
+        gilded_rose = GildedRose(items)
+        self.assertEqual(("foo", 3, 8), gilded_rose.states_at(2)[0])
+        self.assertEqual(("foo", 3, 8), gilded_rose.state_at(0, 2))
+
+        gilded_rose.update_quality()
+        self.assertEqual(("foo", 2, 7), gilded_rose.states_at(2)[0])
+        gilded_rose.items[0].quality = 20
+        self.assertEqual(("foo", 2, 18), gilded_rose.state_at(0, 2))
+
+    def test_projections_follow_changes_to_the_list(self):
+        items = [Item("foo", 5, 10)]
+        gilded_rose = GildedRose(items)
+        projected = gilded_rose.states_at(2)
+        self.assertIs(projected[0], gilded_rose.states_at(2)[0])  # cached
+        self.assertEqual(1, len(gilded_rose.items))
+        self.assertIs(projected[0], gilded_rose.state_at(0, 2))  # still cached after reading items
+
+        items.append(Item("Aged Brie", 2, 0))
+        self.assertEqual(("Aged Brie", 0, 2), gilded_rose.state_at(len(items) - 1, 2))
+        self.assertEqual([("foo", 3, 8), ("Aged Brie", 0, 2)], [tuple(state) for state in gilded_rose.states_at(2)])
+        items[0].sell_in = 0
+        self.assertEqual(("foo", -2, 6), gilded_rose.state_at(0, 2))
+        self.assertEqual(("foo", -2, 6), gilded_rose.states_at(2)[0])
+        with self.assertRaises(IndexError):
+            gilded_rose.state_at(2, 2)
+
+
+class StrategyRegistryTest(unittest.TestCase):
+    def test_exact_prefix_and_pattern_precedence(self):
+        exact, short, long, pattern = (NormalItemStrategy() for _ in range(4))
+        registry = StrategyRegistry({"Conjured Mana Cake": exact})
+        registry.register_prefix("Conj", short)
+        registry.register_prefix("Conjured ", long)
+        registry.register_pattern(r"Conj.*|Mana .*", pattern)
+
+        self.assertIs(exact, registry.resolve("Conjured Mana Cake"))
+        self.assertIs(long, registry.resolve("Conjured Bread"))
+        self.assertIs(short, registry.resolve("Conjuror's Hat"))
+        self.assertIs(pattern, registry.resolve("Mana Potion"))
+        self.assertIs(registry.default, registry.resolve("Mana"))
+
+    def test_patterns_match_whole_name_in_registration_order(self):
+        first, second = AgedBrieStrategy(), NormalItemStrategy()
+        registry = StrategyRegistry()
+        registry.register_pattern(r"Aged \w+", first)
+        registry.register_pattern(r"Aged .*", second)
+
+        self.assertIs(first, registry.resolve("Aged Gouda"))
+        self.assertIs(second, registry.resolve("Aged Red Wine"))
+        self.assertIs(registry.default, registry.resolve("Very Aged Gouda"))
+
+    def test_registering_clears_memoized_names(self):
+        registry = StrategyRegistry()
+        self.assertIs(registry.default, registry.resolve("Aged Gouda"))
+        brie = AgedBrieStrategy()
+        registry.register_prefix("Aged ", brie)
+        self.assertIs(brie, registry.resolve("Aged Gouda"))
+
+    def test_family_registry_matches_conjured_and_backstage_families(self):
+        registry = family_registry()
+        self.assertIsInstance(registry.resolve("Conjured Mana Cake"), ConjuredItemStrategy)
+        self.assertIsInstance(registry.resolve("Backstage passes to a Sulfuras concert"),
+                              BackstagePassesStrategy)
+
+        items = [Item("Conjured Mana Cake", 3, 6)]
+        GildedRose(items, family_registry()).update_quality()
+        self.assertEqual(4, items[0].quality)
+
+
+class NameDictionaryTest(unittest.TestCase):
+    def test_interns_names_with_categories(self):
+        names = NameDictionary(family_registry())
+        self.assertEqual(0, names.intern("Aged Brie"))
+        self.assertEqual(1, names.intern("Conjured Mana Cake"))
+        self.assertEqual(0, names.intern("Aged Brie"))
+        self.assertEqual([AGED_BRIE, CONJURED], names.categories)
+        self.assertEqual("Conjured Mana Cake", names.name_of(1))
+
+        restored = NameDictionary.from_dict(names.to_dict())
+        self.assertEqual(1, restored.intern("Conjured Mana Cake"))
+        self.assertEqual(CONJURED, restored.category_of(1))
+        self.assertEqual(NORMAL, restored.category_of(restored.intern("foo")))
+        self.assertRaises(ValueError, NameDictionary.from_dict, {"names": ["a", "a"], "categories": [0, 0]})
+
+    def test_engines_share_a_dictionary(self):
+        names = NameDictionary()
+        first = GildedRose([Item("Aged Brie", 1, 1)], names=names)
+        second = GildedRose([Item("foo", 1, 1), Item("Aged Brie", 1, 1)], names=names)
+        second.update_quality()
+        self.assertEqual(["Aged Brie", "foo"], names.names)
+        self.assertEqual([1, 0], second._bound_ids)
+
+        first.items[0].name = "foo"
+        first.update_quality()
+        self.assertEqual(("foo", 0, 0), as_tuples(first.items)[0])
+        self.assertEqual(2, len(names))
+
+
+class GildedRoseSnapshotTest(unittest.TestCase):
+    def test_snapshots_keep_their_day(self):
+        for track_quiescent in (False, True):
+            gilded_rose = GildedRose(make_items(), track_quiescent=track_quiescent)
+            reference = GildedRose(make_items())
+            expected, snapshots = [], []
+            for days in (1, 1, 3, 1, 20, 1):
+                gilded_rose.advance(days)
+                reference.advance(days)
+                snapshots.append(gilded_rose.snapshot())
+                expected.append(reference.states_at(0))
+            for states, snapshot in zip(expected, snapshots):
+                self.assertEqual(states, list(snapshot))
+                self.assertEqual(len(states), len(snapshot))
+                self.assertEqual(states[-1], snapshot[-1])
+                self.assertEqual(as_tuples(states), as_tuples(snapshot.to_items()))
+            self.assertEqual(27, snapshots[-1].day)
+            self.assertRaises(IndexError, snapshots[0].__getitem__, len(expected[0]))
+
+    def test_unchanged_chunks_are_shared(self):
+        items = [Item("Sulfuras, Hand of Ragnaros", 0, 80) for _ in range(500)]
+        items += [Item("+5 Dexterity Vest", 10, 0) for _ in range(500)]
+        items.append(Item("Aged Brie", 2, 0))
+        gilded_rose = GildedRose(items)
+        gilded_rose.snapshot_chunk_size = 100
+        snapshots = []
+        for _ in range(365):
+            gilded_rose.update_quality()
+            snapshots.append(gilded_rose.snapshot())
+        chunks = {id(chunk) for snapshot in snapshots for chunk in snapshot._chunks}
+        # one copy of the static chunks, and one chunk of the brie per day until it reaches 50
+        self.assertEqual(10 + 26, len(chunks))
+        self.assertEqual(("Aged Brie", -363, 50), snapshots[-1][-1])
+
+        gilded_rose.items[0].quality = 79
+        self.assertEqual(("Sulfuras, Hand of Ragnaros", 0, 79), gilded_rose.snapshot()[0])
+        self.assertEqual(("Sulfuras, Hand of Ragnaros", 0, 80), snapshots[-1][0])
+
+
+class GildedRoseChangeFeedTest(unittest.TestCase):
+    def test_feed_lists_changed_items(self):
+        for track_quiescent in (False, True):
+            gilded_rose = GildedRose(make_items(), track_quiescent=track_quiescent, change_feed=True)
+            reference = GildedRose(make_items())
+            for days in (1, 1, 4, 1, 30, 1):
+                before = reference.states_at(0)
+                reference.advance(days)
+                after = reference.states_at(0)
+                expected = [(index, old, new) for index, (old, new) in enumerate(zip(before, after))
+                            if old.quality != new.quality or
+                            old.sell_in - new.sell_in != (0 if old.name.startswith("Sulfuras") else days)]
+                feed = gilded_rose.advance(days) if days > 1 else gilded_rose.update_quality()
+                self.assertIs(gilded_rose.changes, feed)
+                self.assertEqual(expected, list(feed))
+                self.assertEqual(len(expected), len(feed))
+
+    def test_packed_columns(self):
+        items = [Item("Aged Brie", 1, 50), Item("foo", 1, 3), Item("Sulfuras, Hand of Ragnaros", 1, 80)]
+        gilded_rose = GildedRose(items, change_feed=True)
+        packed = gilded_rose.update_quality().packed()
+        self.assertEqual([1], list(packed["index"]))
+        self.assertEqual(["foo"], [gilded_rose.names.name_of(name_id) for name_id in packed["name_id"]])
+        self.assertEqual(([1], [3], [0], [2]), (list(packed["old_sell_in"]), list(packed["old_quality"]),
+                                                list(packed["new_sell_in"]), list(packed["new_quality"])))
+        self.assertIsNone(GildedRose([Item("foo", 1, 3)]).update_quality())
+
+
+class GildedRoseJournalTest(unittest.TestCase):
+    def test_undo_and_redo_restore_states(self):
+        for track_quiescent in (False, True):
+            gilded_rose = GildedRose(make_items(), track_quiescent=track_quiescent, journal_size=3)
+            history = [as_tuples(gilded_rose.states_at(0))]
+            for days in (1, 5, 1, 30):
+                if days == 1:
+                    gilded_rose.update_quality()
+                else:
+                    gilded_rose.advance(days)
+                history.append(as_tuples(gilded_rose.states_at(0)))
+
+            for expected in reversed(history[1:-1]):
+                gilded_rose.undo()
+                self.assertEqual(expected, as_tuples(gilded_rose.items))
+            self.assertRaises(ValueError, gilded_rose.undo)  # the first update was evicted
+
+            gilded_rose.redo()
+            gilded_rose.redo()
+            self.assertEqual(history[3], as_tuples(gilded_rose.items))
+            gilded_rose.update_quality()
+            self.assertRaises(ValueError, gilded_rose.redo)
+            gilded_rose.undo()
+            self.assertEqual(history[3], as_tuples(gilded_rose.items))
+
+    def test_undo_needs_the_same_items(self):
+        gilded_rose = GildedRose([Item("foo", 1, 3)], journal_size=1)
+        gilded_rose.update_quality()
+        gilded_rose.items.append(Item("bar", 1, 3))
+        self.assertRaises(ValueError, gilded_rose.undo)
+        self.assertRaises(ValueError, GildedRose([]).undo)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import math
+import unittest
+
+from gilded_rose_enhanced import GildedRose, Item, ItemStrategy, default_registry
+from gilded_rose_parallel import ParallelGildedRose
+from test_gilded_rose_enhanced import make_items, as_tuples
+
+
+class ParallelGildedRoseTest(unittest.TestCase):
+    def test_parallel_update_keeps_order_and_results(self):
+        expected = make_items()
+        gilded_rose = GildedRose(expected)
+        with ParallelGildedRose(make_items(), workers=2, serial_threshold=0) as parallel:
+            parallel.min_chunk_size = 50
+            self.assertGreater(len(expected), 2 * parallel.chunk_size(len(expected)))
+            for _ in range(3):
+                gilded_rose.update_quality()
+                parallel.update_quality()
+            gilded_rose.advance(12)
+            parallel.advance(12)
+            self.assertEqual(as_tuples(expected), as_tuples(parallel.items))
+
+    def test_small_inventory_stays_serial(self):
+        parallel = ParallelGildedRose(make_items(), workers=2, serial_threshold=10 ** 9)
+        parallel.update_quality()
+        self.assertIsNone(parallel._executor)
+
+    def test_tiny_inventory_is_not_calibrated(self):
+        parallel = ParallelGildedRose([Item("foo", 1, 3)], workers=2)
+        parallel.update_quality()
+        self.assertIsNone(parallel._executor)
+        self.assertIsNone(parallel.serial_threshold)
+        self.assertEqual([("foo", 0, 2)], as_tuples(parallel.items))
+
+    def test_unpicklable_registry_runs_serially(self):
+        class LocalStrategy(ItemStrategy):  # local classes cannot be pickled
+            def update_quality(self, item):
+                item.quality += 2
+
+        registry = default_registry()
+        registry.register("foo", LocalStrategy())
+        with ParallelGildedRose([Item("foo", 1, 3)], registry, workers=2, serial_threshold=0) as parallel:
+            parallel.min_chunk_size = 0
+            parallel.update_quality()
+            self.assertIsNone(parallel._executor)
+            self.assertEqual([("foo", 1, 5)], as_tuples(parallel.items))
+            self.assertEqual(math.inf, parallel.calibrate(sample_size=100))
+
+    def test_registry_changes_reach_the_workers(self):
+        registry = default_registry()
+        with ParallelGildedRose(make_items(), registry, workers=2, serial_threshold=0) as parallel:
+            parallel.min_chunk_size = 50
+            parallel.update_quality()
+            registry.register("+5 Dexterity Vest", registry.resolve("Aged Brie"))
+            expected = as_tuples(parallel.items)
+            reference = GildedRose([Item(*row) for row in expected], registry)
+            reference.update_quality()
+            parallel.update_quality()
+            self.assertEqual(as_tuples(reference.items), as_tuples(parallel.items))
+
+    def test_calibrate_measures_a_threshold(self):
+        with ParallelGildedRose(make_items(), workers=2) as parallel:
+            threshold = parallel.calibrate(sample_size=4000)
+        self.assertGreaterEqual(threshold, 0)
+        self.assertEqual(threshold, parallel.serial_threshold)
+
+
+if __name__ == '__main__':
+    unittest.main()
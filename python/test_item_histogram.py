@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from gilded_rose_enhanced import GildedRose
+from item_histogram import ItemHistogram
+from test_gilded_rose_enhanced import make_items, as_tuples
+from golden import THIRTY_DAYS, render_days
+from texttest_fixture import fixture_items
+
+
+class ItemHistogramTest(unittest.TestCase):
+    def test_reproduces_thirty_days(self):
+        with open(THIRTY_DAYS) as golden:
+            expected = golden.read()
+        histogram = ItemHistogram.from_items(fixture_items())
+        self.assertEqual(expected, render_days(histogram.to_items, histogram.update_quality))
+
+    def test_matches_object_engine_as_multiset(self):
+        items = make_items() + make_items() + make_items()
+        histogram = ItemHistogram.from_items(items)
+        self.assertEqual(len(items), len(histogram))
+        gilded_rose = GildedRose(items)
+        for _ in range(15):
+            gilded_rose.update_quality()
+            histogram.update_quality()
+        histogram.advance(5)
+        gilded_rose.advance(5)
+        self.assertEqual(sorted(as_tuples(gilded_rose.items)), sorted(as_tuples(histogram.to_items())))
+
+    def test_states_merge_and_cost_follows_distinct_states(self):
+        histogram = ItemHistogram()
+        histogram.add("Aged Brie", 5, 49, count=10 ** 6)
+        histogram.add("Aged Brie", 3, 50, count=10 ** 6)
+        histogram.add("foo", 1, 1)
+        histogram.update_quality()
+        self.assertEqual([("Aged Brie", 4, 50, 10 ** 6), ("Aged Brie", 2, 50, 10 ** 6), ("foo", 0, 0, 1)],
+                         histogram.states())
+        histogram.add("Aged Brie", 2, 50)
+        histogram.update_quality()
+        self.assertEqual(("Aged Brie", 1, 50, 10 ** 6 + 1), histogram.states()[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
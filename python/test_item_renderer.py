@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import io
+import unittest
+
+from gilded_rose_enhanced import Item, GildedRose
+from item_renderer import DayRenderer
+from golden import THIRTY_DAYS
+from texttest_fixture import fixture_items
+
+
+def printed_days(items, days):
+    stream = io.StringIO()
+    for day in range(days + 1):
+        print("-------- day %s --------" % day, file=stream)
+        print("name, sellIn, quality", file=stream)
+        for item in items:
+            print(item, file=stream)
+        print("", file=stream)
+        GildedRose(items).update_quality()
+    return stream.getvalue().encode("utf-8")
+
+
+def rendered_days(items, days, chunk_size=1 << 16, max_lines=1 << 16):
+    stream = io.BytesIO()
+    with DayRenderer(stream, chunk_size=chunk_size, max_lines=max_lines) as renderer:
+        for day in range(days + 1):
+            renderer.render_day(day, items)
+            GildedRose(items).update_quality()
+    return stream.getvalue()
+
+
+class DayRendererTest(unittest.TestCase):
+    def test_reproduces_thirty_days(self):
+        with open(THIRTY_DAYS, "rb") as golden:
+            expected = golden.read()
+        stream = io.BytesIO()
+        with DayRenderer(stream, chunk_size=100) as renderer:
+            renderer.write_line("OMGHAI!")
+            items = fixture_items()
+            for day in range(31):
+                renderer.render_day(day, items)
+                GildedRose(items).update_quality()
+        self.assertEqual(expected, stream.getvalue())
+
+    def test_matches_print(self):
+        names = ["Aged Brie", "Élixir de la Mangouste", "Conjured Mana Cake", "Sulfuras, Hand of Ragnaros"]
+        for chunk_size in (1, 4096, 1 << 16):
+            self.assertEqual(printed_days([Item(name, 3, 10) for name in names], 12),
+                             rendered_days([Item(name, 3, 10) for name in names], 12, chunk_size))
+
+    def test_line_cache_smaller_than_inventory(self):
+        names = ["Aged Brie", "Elixir of the Mongoose", "Conjured Mana Cake"]
+        for max_lines in (1, 2, 5):
+            self.assertEqual(printed_days([Item(name, 3, 10) for name in names], 12),
+                             rendered_days([Item(name, 3, 10) for name in names], 12, max_lines=max_lines))
+
+    def test_renamed_items(self):
+        items = [Item("Aged Brie", 2, 0)]
+        stream = io.BytesIO()
+        with DayRenderer(stream, max_lines=1) as renderer:
+            renderer.render_day(0, items)
+            items[0].name = "Elixir of the Mongoose"
+            renderer.render_day(1, items)
+            items[0].name = "Aged Brie"
+            renderer.render_day(2, items)
+        self.assertEqual(b"Aged Brie, 2, 0\n\n-------- day 1 --------\nname, sellIn, quality\n"
+                         b"Elixir of the Mongoose, 2, 0\n\n-------- day 2 --------\nname, sellIn, quality\n"
+                         b"Aged Brie, 2, 0\n\n", stream.getvalue()[len(b"-------- day 0 --------\nname, sellIn, quality\n"):])
+
+
+if __name__ == '__main__':
+    unittest.main()
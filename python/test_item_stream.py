@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from gilded_rose_enhanced import GildedRose
+from item_stream import read_records, advance_records, write_records, run, main
+from test_gilded_rose_enhanced import make_items, as_tuples
+
+
+def csv_text(items):
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator="\n")
+    writer.writerow(["name", "sell_in", "quality", "shelf"])
+    writer.writerows([item.name, item.sell_in, item.quality, "A%d" % index] for index, item in enumerate(items))
+    return text.getvalue()
+
+
+class ItemStreamTest(unittest.TestCase):
+    def test_csv_records_match_object_engine(self):
+        expected = make_items()
+        GildedRose(expected).advance(12)
+        output = io.StringIO()
+        chunks = advance_records(read_records(io.StringIO(csv_text(make_items()))), 12, chunk_size=100)
+        self.assertEqual(len(expected), write_records(chunks, output, fields=("name", "sell_in", "quality", "shelf")))
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual("name,sell_in,quality,shelf", lines[0])
+        self.assertEqual(csv_text(expected).splitlines(), lines)
+
+    def test_jsonl_keeps_other_fields(self):
+        source = '{"name": "Aged Brie", "sell_in": 1, "quality": 3, "id": 7}\n\n{"name": "foo", "sell_in": 0, "quality": 3}\n'
+        output = io.StringIO()
+        write_records(advance_records(read_records(io.StringIO(source), "jsonl"), 2), output, "jsonl")
+        self.assertEqual([{"name": "Aged Brie", "sell_in": -1, "quality": 6, "id": 7},
+                          {"name": "foo", "sell_in": -2, "quality": 0}],
+                         [json.loads(line) for line in output.getvalue().splitlines()])
+
+    def test_missing_field(self):
+        records = read_records(io.StringIO('{"name": "foo", "quality": 3}\n'), "jsonl")
+        self.assertRaises(ValueError, list, records)
+        self.assertRaises(ValueError, list, read_records(io.StringIO(""), "xml"))
+
+    def test_malformed_records_report_their_line(self):
+        for text, fmt, message in (("name,sell_in,quality\nfoo,1,2\nbar,,2\n", "csv", "line 3: sell_in"),
+                                   ("name,sell_in,quality\nfoo,1,2\nbar,1\n", "csv", "line 3 has no quality"),
+                                   ('{"name": "foo", "sell_in": 1, "quality": 2}\n\n{"name": \n', "jsonl", "line 3"),
+                                   ('[1, 2]\n', "jsonl", "line 1")):
+            with self.assertRaisesRegex(ValueError, message):
+                list(read_records(io.StringIO(text), fmt))
+
+    def test_csv_header_is_fixed(self):
+        output = io.StringIO()
+        records = [{"name": "foo", "sell_in": 1, "quality": 2}, {"name": "bar", "quality": 2, "sell_in": 1}]
+        write_records([records], output)
+        self.assertEqual("name,sell_in,quality\nfoo,1,2\nbar,1,2\n", output.getvalue())
+        with self.assertRaisesRegex(ValueError, "record 2 has fields outside the CSV header: shelf"):
+            write_records([records[:1] + [dict(records[1], shelf="A1")]], io.StringIO())
+
+    def test_run_converts_between_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "items.csv")
+            target = os.path.join(directory, "items.jsonl")
+            with open(source, "w") as source_file:
+                source_file.write(csv_text(make_items()[:50]))
+            self.assertEqual(0, main([source, target, "--days", "3", "--chunk-size", "7"]))
+            count, seconds = run(source, target, days=3)
+            self.assertEqual(50, count)
+            with open(target) as target_file:
+                records = [json.loads(line) for line in target_file]
+            expected = make_items()[:50]
+            GildedRose(expected).advance(3)
+            self.assertEqual(as_tuples(expected),
+                             [(record["name"], record["sell_in"], record["quality"]) for record in records])
+
+            run(source, os.path.join(directory, "advanced.csv"), days=3)
+            with open(os.path.join(directory, "advanced.csv")) as target_file:
+                self.assertEqual("name,sell_in,quality,shelf", target_file.readline().strip())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from gilded_rose_enhanced import GildedRose
+from test_gilded_rose_enhanced import as_tuples, make_items
+
+try:
+    from item_table import ItemTable
+except ImportError:  # numpy is not installed
+    ItemTable = None
+
+
+@unittest.skipIf(ItemTable is None, "numpy is not installed")
+class ItemTableTest(unittest.TestCase):
+    def test_round_trip(self):
+        items = make_items()
+        self.assertEqual(as_tuples(items), as_tuples(ItemTable.from_items(items).to_items()))
+
+    def test_update_quality_matches_object_engine(self):
+        items = make_items()
+        gilded_rose = GildedRose(items)
+        table = ItemTable.from_items(items)
+        for day in range(20):
+            gilded_rose.update_quality()
+            table.update_quality()
+            self.assertEqual(as_tuples(items), as_tuples(table.to_items()), "day=%s" % day)
+
+
+if __name__ == '__main__':
+    unittest.main()
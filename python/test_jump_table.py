@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import itertools
+import unittest
+
+from gilded_rose_enhanced import Item, GildedRose, ItemStrategy, default_registry
+from jump_table import JumpTable, TabulatedStrategy, tabulated_registry
+from test_gilded_rose_enhanced import as_tuples
+
+
+class WineStrategy(ItemStrategy):
+    """Gains 1 quality a day up to 30 before the sell-by date, then loses 3 a day."""
+
+    def update_quality(self, item):
+        item.sell_in -= 1
+        if item.sell_in >= 0:
+            item.quality = min(30, item.quality + 1) if item.quality < 30 else item.quality
+        else:
+            item.quality = max(0, item.quality - 3)
+
+
+class RelicStrategy(ItemStrategy):
+    """Never ages; quality cycles 0..9."""
+    ages = False
+
+    def update_quality(self, item):
+        item.quality = (item.quality + 1) % 10
+
+
+class CountingStrategy(ItemStrategy):
+    def __init__(self):
+        self.calls = itertools.count()
+
+    def update_quality(self, item):
+        item.sell_in -= 1
+        item.quality = min(50, next(self.calls) % 7)
+
+
+class UnboundedStrategy(ItemStrategy):
+    def update_quality(self, item):
+        item.sell_in -= 1
+        item.quality += 100
+
+
+class FarThresholdStrategy(ItemStrategy):
+    def update_quality(self, item):
+        item.sell_in -= 1
+        if item.sell_in < 1000:
+            item.quality = max(0, item.quality - 1)
+
+
+def wine_items():
+    return [Item(name, sell_in, quality)
+            for name in ("Wine", "Relic")
+            for sell_in in (-500, -20, -1, 0, 3, 40, 64, 65, 70, 3000)
+            for quality in (-1, 0, 5, 29, 30, 50, 80)]
+
+
+class JumpTableTest(unittest.TestCase):
+    def test_jump_matches_repeated_application(self):
+        successors = [(3 * state + 1) % 17 for state in range(17)]
+        table = JumpTable(successors)
+        for steps in range(40):
+            state = 5
+            for _ in range(steps):
+                state = successors[state]
+            self.assertEqual(state, table.jump(5, steps))
+
+
+class TabulatedStrategyTest(unittest.TestCase):
+    def test_advance_matches_stepping(self):
+        registry = default_registry()
+        registry.register("Wine", WineStrategy())
+        registry.register("Relic", RelicStrategy())
+        tabulated = tabulated_registry(registry)
+        self.assertTrue(tabulated.resolve("Wine").tabulated)
+        self.assertTrue(tabulated.resolve("Relic").tabulated)
+        self.assertIs(registry.resolve("Aged Brie"), tabulated.resolve("Aged Brie"))
+        for days in (0, 1, 2, 7, 63, 64, 65, 100, 1234, 5000):
+            stepped = wine_items()
+            gilded_rose = GildedRose(stepped, registry)
+            for _ in range(days):
+                gilded_rose.update_quality()
+            jumped = wine_items()
+            GildedRose(jumped, tabulated).advance(days)
+            self.assertEqual(as_tuples(stepped), as_tuples(jumped), days)
+
+    def test_failed_checks_fall_back_to_stepping(self):
+        for strategy, reason in ((CountingStrategy(), "not deterministic"),
+                                 (UnboundedStrategy(), "quality leaves"),
+                                 (FarThresholdStrategy(), "beyond")):
+            tabulated = TabulatedStrategy(strategy)
+            self.assertFalse(tabulated.tabulated)
+            self.assertIn(reason, tabulated.reason)
+
+        stepped, jumped = Item("foo", 2000, 40), Item("foo", 2000, 40)
+        FarThresholdStrategy().advance(stepped, 1010)
+        TabulatedStrategy(FarThresholdStrategy()).advance(jumped, 1010)
+        self.assertEqual(as_tuples([stepped]), as_tuples([jumped]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from gilded_rose_enhanced import (
+    Item, GildedRose, ItemStrategy, StrategyRegistry, default_registry, family_registry,
+)
+from kernel_compiler import compile_kernel, registry_fingerprint, _code_cache
+from test_gilded_rose_enhanced import make_items, as_tuples
+
+
+class HalvingStrategy(ItemStrategy):
+    def update_quality(self, item):
+        item.sell_in -= 1
+        item.quality //= 2
+
+
+class KernelCompilerTest(unittest.TestCase):
+    def test_kernel_matches_strategy_dispatch(self):
+        for registry in (default_registry(), family_registry()):
+            expected = make_items() + [Item("Conjured Mana Cake", 3, 6)]
+            items = make_items() + [Item("Conjured Mana Cake", 3, 6)]
+            gilded_rose = GildedRose(expected, registry)
+            kernel = compile_kernel(registry)
+            for _ in range(20):
+                gilded_rose.update_quality()
+                kernel(items)
+            self.assertEqual(as_tuples(expected), as_tuples(items))
+
+    def test_custom_strategy_is_called(self):
+        registry = StrategyRegistry({"Halving": HalvingStrategy()})
+        items = [Item("Halving", 3, 40), Item("foo", 3, 40)]
+        compile_kernel(registry)(items)
+        self.assertEqual([("Halving", 2, 20), ("foo", 2, 39)], as_tuples(items))
+
+    def test_code_is_cached_by_fingerprint(self):
+        compile_kernel(default_registry())
+        cached = dict(_code_cache)
+        compile_kernel(default_registry())
+        self.assertEqual(cached, _code_cache)
+        self.assertIs(cached[registry_fingerprint(default_registry())],
+                      _code_cache[registry_fingerprint(default_registry())])
+
+
+if __name__ == '__main__':
+    unittest.main()
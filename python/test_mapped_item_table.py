@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from test_gilded_rose_enhanced import make_items, as_tuples
+from golden import THIRTY_DAYS, render_days
+from texttest_fixture import fixture_items
+
+try:
+    from item_table import ItemTable
+    from mapped_item_table import MappedItemTable
+except ImportError:  # numpy is not installed
+    MappedItemTable = None
+
+
+@unittest.skipIf(MappedItemTable is None, "numpy is not installed")
+class MappedItemTableTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "inventory.grit")
+
+    def test_reproduces_thirty_days(self):
+        with open(THIRTY_DAYS) as golden:
+            expected = golden.read()
+        with MappedItemTable.create(self.path, fixture_items()) as table:
+            self.assertEqual(expected, render_days(table.to_items, table.update_quality))
+
+    def test_updates_persist_in_the_file(self):
+        expected = ItemTable.from_items(make_items())
+        with MappedItemTable.create(self.path, make_items()) as table:
+            self.assertEqual(16 * len(expected), table.records.nbytes)
+            for _ in range(3):
+                table.update_quality()
+                expected.update_quality()
+        with MappedItemTable.open(self.path) as table:
+            self.assertEqual(as_tuples(expected.to_items()), as_tuples(table.to_items()))
+            self.assertEqual("Aged Brie", table.dictionary.name_of(1))
+
+    def test_close_with_a_view_held(self):
+        table = MappedItemTable.create(self.path, fixture_items())
+        view = table.sell_in[:3]
+        self.assertRaisesRegex(BufferError, "views taken from the table", table.close)
+        table.update_quality()
+        self.assertEqual([9, 1, 4], view.tolist())
+        del view
+        table.close()
+        table.close()
+        with MappedItemTable.open(self.path) as table:
+            self.assertEqual([19, 1, 6], table.quality[:3].tolist())
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as other:
+            other.write(b"name, sellIn, quality\n" * 3)
+        self.assertRaises(ValueError, MappedItemTable.open, self.path)
+        MappedItemTable.create(self.path, fixture_items()).close()
+        with open(self.path, "r+b") as inventory_file:
+            inventory_file.seek(4)
+            inventory_file.write(b"\x02\x00")
+        self.assertRaises(ValueError, MappedItemTable.open, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
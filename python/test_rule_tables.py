@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from gilded_rose_enhanced import Item, GildedRose
+from golden import THIRTY_DAYS, render_days
+from rule_tables import RuleSet
+from test_gilded_rose_enhanced import make_items, as_tuples
+from texttest_fixture import fixture_items
+
+try:
+    from item_table import ItemTable
+except ImportError:  # numpy is not installed
+    ItemTable = None
+
+
+class RuleTablesTest(unittest.TestCase):
+    def setUp(self):
+        with open(THIRTY_DAYS) as golden:
+            self.expected = golden.read()
+        self.rules = RuleSet.load()
+
+    def test_object_mode_reproduces_thirty_days(self):
+        items = fixture_items()
+        gilded_rose = GildedRose(items, self.rules.registry())
+        self.assertEqual(self.expected, render_days(lambda: items, gilded_rose.update_quality))
+
+    @unittest.skipIf(ItemTable is None, "numpy is not installed")
+    def test_numpy_kernel_reproduces_thirty_days(self):
+        table = ItemTable.from_items(fixture_items(), self.rules.registry(), self.rules.kernel())
+        self.assertEqual(self.expected, render_days(table.to_items, table.update_quality))
+
+    def test_builtin_rules_match_strategies(self):
+        expected = make_items()
+        gilded_rose = GildedRose(expected)
+        items = make_items()
+        ruled = GildedRose(items, self.rules.registry())
+        for _ in range(20):
+            gilded_rose.update_quality()
+            ruled.update_quality()
+        self.assertEqual(as_tuples(expected), as_tuples(items))
+
+    @unittest.skipIf(ItemTable is None, "numpy is not installed")
+    def test_numpy_kernel_matches_object_mode(self):
+        rules = RuleSet.from_dict({"categories": [
+            {"name": "normal", "default": True, "daily_delta": -1, "expired_multiplier": 3},
+            {"name": "wine", "match": {"prefix": ["Wine "]}, "daily_delta": 1, "max_quality": 70,
+             "bands": [{"below": 3, "delta": 4}]},
+            {"name": "relic", "match": {"pattern": ["Relic.*"]}, "immutable": True},
+        ]})
+        names = ["Bread", "Wine Merlot", "Relic of Old"]
+        items = [Item(name, sell_in, quality) for name in names for sell_in in (-1, 2, 6) for quality in (0, 5, 69)]
+        table = ItemTable.from_items(items, rules.registry(), rules.kernel())
+        gilded_rose = GildedRose(items, rules.registry())
+        for _ in range(8):
+            gilded_rose.update_quality()
+            table.update_quality()
+        self.assertEqual(as_tuples(items), as_tuples(table.to_items()))
+
+    def test_unknown_fields_are_rejected(self):
+        with self.assertRaises(ValueError):
+            RuleSet.from_dict({"categories": [{"default": True, "daily_detla": -1}]})
+
+
+if __name__ == '__main__':
+    unittest.main()
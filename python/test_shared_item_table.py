@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from gilded_rose_enhanced import Item
+from golden import THIRTY_DAYS, render_days
+from rule_tables import RuleSet
+from texttest_fixture import fixture_items
+
+try:
+    from item_table import ItemTable
+    from shared_item_table import SharedItemTable
+except ImportError:  # numpy is not installed
+    SharedItemTable = None
+
+
+def doubling_kernel(sell_in, quality, category):
+    quality *= 2
+
+
+@unittest.skipIf(SharedItemTable is None, "numpy is not installed")
+class SharedItemTableTest(unittest.TestCase):
+    def setUp(self):
+        with open(THIRTY_DAYS) as golden:
+            self.expected = golden.read()
+
+    def test_thirty_days_texttest(self):
+        with SharedItemTable.create(ItemTable.from_items(fixture_items())) as table:
+            self.assertEqual(self.expected, render_days(table.to_items, table.update_quality))
+
+    def test_thirty_days_texttest_in_worker_processes(self):
+        with SharedItemTable.create(ItemTable.from_items(fixture_items())) as table, \
+                ProcessPoolExecutor(2) as executor:
+            self.assertEqual(self.expected, render_days(table.to_items, lambda: table.update_quality(executor)))
+
+    def test_workers_follow_a_segment_created_again(self):
+        name = "grtest-%d" % os.getpid()
+        with ProcessPoolExecutor(2) as executor:
+            for quality in (10, 20):
+                with SharedItemTable.create(ItemTable.from_items([Item("foo", 5, quality)] * 4), name) as table:
+                    table.update_quality(executor, shards=2)
+                    self.assertEqual([quality - 1] * 4, table.quality.tolist())
+
+    def test_parallel_updates_leave_stderr_clean(self):
+        script = textwrap.dedent("""
+            from concurrent.futures import ProcessPoolExecutor
+            from item_table import ItemTable
+            from shared_item_table import SharedItemTable
+            from test_gilded_rose_enhanced import make_items
+
+            if __name__ == "__main__":
+                with ProcessPoolExecutor(2) as executor, \\
+                        SharedItemTable.create(ItemTable.from_items(make_items())) as table:
+                    for _ in range(10):
+                        table.update_quality(executor, shards=3)
+        """)
+        result = subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, timeout=60)
+        self.assertEqual((0, b""), (result.returncode, result.stderr))
+
+    def test_keeps_the_kernel_of_the_table(self):
+        rules = RuleSet.from_dict({"categories": [{"default": True, "daily_delta": 3}]})
+        items = [Item("foo", 5, 4)] * 3
+        with SharedItemTable.create(ItemTable.from_items(items, rules.registry(), rules.kernel())) as table:
+            table.update_quality()
+            self.assertEqual([7] * 3, table.quality.tolist())
+            with ProcessPoolExecutor(2) as executor:
+                self.assertRaises(ValueError, table.update_quality, executor)
+        with SharedItemTable.create(ItemTable.from_items(items, kernel=doubling_kernel)) as table, \
+                ProcessPoolExecutor(2) as executor:
+            table.update_quality(executor, shards=3)
+            self.assertEqual([8] * 3, table.quality.tolist())
+
+    def test_attached_reader_sees_updates_without_copy(self):
+        with SharedItemTable.create(ItemTable.from_items(fixture_items())) as table:
+            reader = SharedItemTable.attach(table.name)
+            table.update_quality()
+            self.assertEqual([repr(item) for item in table.to_items()],
+                             [repr(item) for item in reader.to_items()])
+            reader.quality[0] = 33
+            self.assertEqual(33, table.quality[0])
+            reader.close()
+
+    def test_close_with_a_view_held(self):
+        with SharedItemTable.create(ItemTable.from_items(fixture_items())) as table:
+            view = table.quality[:3]
+            self.assertRaisesRegex(BufferError, "views taken from the table", table.close)
+            table.update_quality()
+            self.assertEqual([19, 1, 6], view.tolist())
+            del view
+
+    def test_attached_reader_loads_the_name_dictionary(self):
+        with SharedItemTable.create(ItemTable.from_items(fixture_items())) as table:
+            reader = SharedItemTable.attach(table.name)
+            self.assertEqual(table.dictionary.to_dict(), reader.dictionary.to_dict())
+            self.assertEqual("Aged Brie", reader.dictionary.name_of(1))
+            self.assertEqual([item.name for item in fixture_items()], reader.names)
+            reader.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
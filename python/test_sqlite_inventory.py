@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+import gilded_rose
+from sqlite_inventory import UPDATE_QUALITY, UPDATE_QUALITY_STATEMENTS, SqliteInventory, load_schema
+from test_gilded_rose_enhanced import NAMES, as_tuples
+from golden import THIRTY_DAYS, render_days
+from texttest_fixture import fixture_items
+
+
+def legacy_items():
+    return [gilded_rose.Item(name, sell_in, quality)
+            for name in NAMES + ["Conjured Mana Cake"]
+            for sell_in in range(-3, 16)
+            for quality in (-2, 0, 1, 7, 48, 49, 50, 80)]
+
+
+def generated_rows(count, seed):
+    generator = random.Random(seed)
+    return [(generator.choice(NAMES + ["Conjured Mana Cake"]),
+             None if generator.random() < 0.05 else generator.randint(-20, 40),
+             generator.randint(-5, 85))
+            for _ in range(count)]
+
+
+def table_of(rows):
+    inventory = SqliteInventory()
+    with inventory.connection:
+        inventory.connection.executemany("INSERT INTO item (name, sellIn, quality) VALUES (?, ?, ?)", rows)
+    return inventory
+
+
+def contents(inventory):
+    return inventory.connection.execute("SELECT name, sellIn, quality FROM item ORDER BY rowid").fetchall()
+
+
+class SqliteInventoryTest(unittest.TestCase):
+    def test_schema_drops_database_statements(self):
+        schema = load_schema()
+        self.assertIn("CREATE TABLE item", schema)
+        self.assertNotIn("CREATE DATABASE", schema)
+        self.assertNotIn("\\connect", schema)
+
+    def test_reproduces_thirty_days(self):
+        with open(THIRTY_DAYS) as golden:
+            expected = golden.read()
+        with SqliteInventory.from_items(fixture_items()) as inventory:
+            self.assertEqual(expected, render_days(inventory.to_items, inventory.update_quality))
+
+    def test_matches_legacy_engine(self):
+        expected = legacy_items()
+        legacy = gilded_rose.GildedRose(expected)
+        with SqliteInventory.from_items(legacy_items()) as inventory:
+            self.assertEqual(len(expected), len(inventory))
+            for days in (1, 1, 5, 20):
+                for _ in range(days):
+                    legacy.update_quality()
+                inventory.advance(days)
+                self.assertEqual(as_tuples(expected), as_tuples(inventory.to_items()))
+
+    def test_single_statement_matches_statements(self):
+        for seed in range(5):
+            rows = generated_rows(2000, seed)
+            with table_of(rows) as by_statements, table_of(rows) as single:
+                for _ in range(40):
+                    for statement in UPDATE_QUALITY_STATEMENTS:
+                        by_statements.connection.execute(statement)
+                    single.connection.execute(UPDATE_QUALITY)
+                    self.assertEqual(contents(by_statements), contents(single))
+
+    def test_advance_matches_daily_updates(self):
+        rows = generated_rows(2000, 7)
+        with table_of(rows) as daily:
+            for days in range(45):
+                with table_of(rows) as advanced:
+                    advanced.advance(days)
+                    self.assertEqual(contents(daily), contents(advanced))
+                daily.update_quality()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+import fixture_server
+import texttest_client
+import texttest_fixture
+from golden import THIRTY_DAYS
+
+
+def listening(path):
+    # the socket file appears at bind, before the server chmods it and listens
+    with socket.socket(socket.AF_UNIX) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def answers_of(stream):
+    stream.seek(0)
+    answers = []
+    while True:
+        header = stream.readline()
+        if not header:
+            return answers
+        status, length = map(int, header.split())
+        answers.append((status, stream.read(length)))
+
+
+class TexttestFixtureTest(unittest.TestCase):
+    def setUp(self):
+        with open(THIRTY_DAYS, "rb") as golden:
+            self.expected = golden.read()
+
+    def test_renders_thirty_days(self):
+        output = io.BytesIO()
+        texttest_fixture.render(output, 30)
+        self.assertEqual(self.expected, output.getvalue())
+
+    def test_renders_inventory_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "items.jsonl")
+        with open(path, "w", encoding="utf-8") as inventory:
+            inventory.write('{"name": "Aged Brie", "sell_in": 2, "quality": 0}\n')
+        output = io.BytesIO()
+        texttest_fixture.render(output, 3, path, "csv")
+        self.assertEqual(b"name,sell_in,quality\nAged Brie,-1,4\n", output.getvalue())
+
+    def test_serves_requests_until_stopped(self):
+        requests = io.BytesIO(b'{"days": 30}\n\n{"format": "xml"}\n[30]\n{"stop": true}\n{"days": 1}\n')
+        answers = io.BytesIO()
+        self.assertTrue(fixture_server.serve_stream(requests, answers))
+        (status, output), (error, message), (bad, _), stop = answers_of(answers)
+        self.assertEqual((0, self.expected), (status, output))
+        self.assertEqual(1, error)
+        self.assertIn(b"unknown output format 'xml'", message)
+        self.assertEqual(1, bad)
+        self.assertEqual((0, b""), stop)
+
+    def test_stops_when_sources_change(self):
+        requests = io.BytesIO(b'{"days": 1}\n{"days": 2}\n')
+        answers = io.BytesIO()
+        stamps = fixture_server.source_stamps()
+        self.assertIn(os.path.abspath(fixture_server.__file__), stamps)
+        self.assertFalse(fixture_server.serve_stream(io.BytesIO(b'{"days": 1}\n'), io.BytesIO(), stamps))
+        stamps[os.path.abspath(fixture_server.__file__)] -= 1
+        self.assertTrue(fixture_server.serve_stream(requests, answers, stamps))
+        [(status, _)] = answers_of(answers)
+        self.assertEqual(fixture_server.STALE, status)
+
+    def test_client_request_fields(self):
+        self.assertEqual({"days": 30}, texttest_client.parse_request(["30"]))
+        self.assertEqual({"days": -1, "format": "csv", "inventory": os.path.abspath("items.csv")},
+                         texttest_client.parse_request(["-1", "--format=csv", "--inventory", "items.csv"]))
+        self.assertRaises(ValueError, texttest_client.parse_request, ["--bogus"])
+        fields = {"days": 3, "inventory": 'C:\\a "b"\n', "format": "jsonl"}
+        self.assertEqual(fields, json.loads(texttest_client.encode_request(fields)))
+
+    @unittest.skipIf(not hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+    def test_serves_client_on_socket(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "fixture.sock")
+        server = threading.Thread(target=fixture_server.serve_socket, args=(path,))
+        server.start()
+        self.addCleanup(server.join, 5)
+        deadline = time.monotonic() + 5
+        while not listening(path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        try:
+            self.assertEqual((0, self.expected), texttest_client.request(path, {"days": 30}))
+            self.assertEqual(0o600, os.stat(path).st_mode & 0o777)
+            self.assertRaises(OSError, fixture_server.serve_socket, path)
+        finally:
+            texttest_client.stop(path)
+        server.join(5)
+        self.assertFalse(server.is_alive())
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
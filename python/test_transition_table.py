@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from gilded_rose_enhanced import Item, GildedRose, ItemStrategy, default_registry, family_registry
+from rule_tables import RuleSet
+from test_gilded_rose_enhanced import make_items, as_tuples
+from transition_table import TransitionTables
+
+try:
+    from item_table import ItemTable
+except ImportError:  # numpy is not installed
+    ItemTable = None
+
+
+def far_items():
+    return make_items() + [Item(name, sell_in, 20) for name in ("foo", "Aged Brie")
+                           for sell_in in (-1000, 1000)]
+
+
+class HalvingStrategy(ItemStrategy):
+    def update_quality(self, item):
+        item.sell_in -= 1
+        item.quality //= 2
+
+
+def daily_delta_registry(daily_delta):
+    return RuleSet.from_dict({"categories": [{"default": True, "daily_delta": daily_delta}]}).registry()
+
+
+def halving_registry():
+    registry = default_registry()
+    registry.register("Halving", HalvingStrategy())
+    return registry
+
+
+class TransitionTablesTest(unittest.TestCase):
+    def test_lookups_match_object_engine(self):
+        for registry in (None, family_registry()):
+            tables = TransitionTables(registry, min_sell_in=-2, max_sell_in=12)
+            expected = far_items()
+            gilded_rose = GildedRose(expected, registry)
+            items = far_items()
+            for _ in range(25):
+                gilded_rose.update_quality()
+                tables.update_quality(items)
+                self.assertEqual(as_tuples(expected), as_tuples(items))
+
+    @unittest.skipIf(ItemTable is None, "numpy is not installed")
+    def test_kernel_matches_object_engine(self):
+        tables = TransitionTables()
+        expected = far_items()
+        gilded_rose = GildedRose(expected)
+        table = ItemTable.from_items(far_items(), kernel=tables.kernel())
+        for _ in range(25):
+            gilded_rose.update_quality()
+            table.update_quality()
+            self.assertEqual(as_tuples(expected), as_tuples(table.to_items()))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tables.bin")
+            built = TransitionTables.load_or_build(path)
+            loaded = TransitionTables.load(path)
+            self.assertEqual(built.next_quality, loaded.next_quality)
+            self.assertEqual(built.sell_in_change, loaded.sell_in_change)
+            self.assertRaises(ValueError, TransitionTables.load, path, halving_registry())
+
+            rebuilt = TransitionTables.load_or_build(path, halving_registry())
+            items = [Item("Halving", 3, 40)]
+            TransitionTables.load(path, halving_registry()).update_quality(items)
+            self.assertEqual([("Halving", 2, 20)], as_tuples(items))
+            self.assertEqual(len(built.next_quality) * 6 // 5, len(rebuilt.next_quality))
+
+    def test_strategies_configured_differently_rebuild(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tables.bin")
+            TransitionTables.load_or_build(path, daily_delta_registry(-1))
+            self.assertRaises(ValueError, TransitionTables.load, path, daily_delta_registry(3))
+            items = [Item("foo", 5, 4)]
+            TransitionTables.load_or_build(path, daily_delta_registry(3)).update_quality(items)
+            self.assertEqual([("foo", 4, 7)], as_tuples(items))
+
+    def test_edited_table_rows_are_rejected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tables.bin")
+            tables = TransitionTables(min_sell_in=-2, max_sell_in=12)
+            tables.next_quality[10] += 1  # the "long expired" bucket
+            tables.save(path)
+            self.assertRaises(ValueError, TransitionTables.load, path)
+            rebuilt = TransitionTables.load_or_build(path, min_sell_in=-2, max_sell_in=12)
+            self.assertEqual(TransitionTables(min_sell_in=-2, max_sell_in=12).next_quality, rebuilt.next_quality)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Runs a TextTest case through a long-lived `texttest_fixture.py --serve` process.
+
+Takes the command line of texttest_fixture.py, sends it as one request to the fixture
+server on a Unix socket and prints the answer, so each case costs a small interpreter
+start instead of importing the engine again. When no server answers, one is started in
+the background and left running for the following cases, and restarted when the sources
+it runs have changed. The socket is $GILDED_ROSE_FIXTURE_SOCKET, or gr-texttest-UID.sock
+in the temporary directory; a socket owned by another user is never used.
+
+    python texttest_client.py 30
+
+Stop the server with `python texttest_client.py --stop`.
+"""
+import os
+import socket
+import sys
+import tempfile
+import time
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "texttest_fixture.py")
+STARTUP_TIMEOUT = 10.0
+STALE = 2  # answer status of a server whose sources changed, see fixture_server.py
+
+
+def _json_string(text):
+    # json is left out: importing it costs more than a request to the server
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+    return '"%s"' % "".join(char if char >= " " else "\\u%04x" % ord(char) for char in escaped)
+
+
+def encode_request(fields):
+    """
+    Encodes a request as one line of JSON.
+    """
+    members = ("%s: %s" % (_json_string(key), value if isinstance(value, int) else _json_string(value))
+               for key, value in fields.items())
+    return ("{%s}\n" % ", ".join(members)).encode("utf-8")
+
+
+def socket_path():
+    path = os.environ.get("GILDED_ROSE_FIXTURE_SOCKET")
+    if path:
+        return path
+    return os.path.join(tempfile.gettempdir(), "gr-texttest-%d.sock" % os.getuid())
+
+
+def parse_request(argv):
+    """
+    Turns the command line of texttest_fixture.py into a request.
+
+    Raises:
+        ValueError: If an argument is not one the fixture takes.
+    """
+    request = {}
+    arguments = iter(argv)
+    for argument in arguments:
+        option, _, value = argument.partition("=")
+        if option in ("--inventory", "--format"):
+            value = value or next(arguments, None)
+            if value is None:
+                raise ValueError("%s needs a value" % option)
+            request[option[2:]] = os.path.abspath(value) if option == "--inventory" else value
+        elif "days" not in request and argument.lstrip("-").isdigit():
+            request["days"] = int(argument)
+        else:
+            raise ValueError("unexpected argument %r" % argument)
+    return request
+
+
+def start_server(path):
+    import subprocess
+    with open(os.devnull, "r+b") as devnull:
+        subprocess.Popen([sys.executable, FIXTURE, "--serve", path],
+                         stdin=devnull, stdout=devnull, stderr=devnull, start_new_session=True)
+
+
+def connect(path, start=True):
+    """
+    Connects to the fixture server, starting one when none answers and `start` is true.
+    """
+    deadline = None
+    while True:
+        try:
+            owner = os.stat(path).st_uid
+        except OSError:
+            owner = None
+        if owner is not None and owner != os.getuid():
+            raise OSError("%s belongs to another user" % path)
+        connection = socket.socket(socket.AF_UNIX)
+        try:
+            connection.connect(path)
+            return connection
+        except OSError:
+            connection.close()
+            if not start:
+                raise
+            if deadline is None:
+                start_server(path)
+                deadline = time.monotonic() + STARTUP_TIMEOUT
+            elif time.monotonic() > deadline:
+                raise
+            time.sleep(0.01)
+
+
+def _send(path, fields):
+    with connect(path) as connection, connection.makefile("rwb") as stream:
+        stream.write(encode_request(fields))
+        stream.flush()
+        header = stream.readline().split()
+        if len(header) != 2:
+            raise OSError("the fixture server closed the connection")
+        status, length = int(header[0]), int(header[1])
+        return status, stream.read(length)
+
+
+def request(path, fields):
+    """
+    Sends one request and returns (status, answer bytes).
+
+    A server whose sources changed stops and removes its socket, so the request is sent
+    once more, to a new server.
+    """
+    status, answer = _send(path, fields)
+    if status == STALE:
+        status, answer = _send(path, fields)
+    return status, answer
+
+
+def stop(path):
+    """
+    Stops the server answering on the socket, if any.
+    """
+    try:
+        with connect(path, start=False) as connection:
+            connection.sendall(b'{"stop": true}\n')
+            connection.recv(1)
+    except OSError:
+        pass
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = socket_path()
+    if argv == ["--stop"]:
+        stop(path)
+        return 0
+    try:
+        fields = parse_request(argv)
+    except ValueError as error:
+        print("texttest_client.py: %s" % error, file=sys.stderr)
+        return 2
+    status, answer = request(path, fields)
+    if status:
+        sys.stderr.write(answer.decode("utf-8", "replace") + "\n")
+        return status
+    sys.stdout.buffer.write(answer)
+    sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
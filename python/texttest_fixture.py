@@ -1,11 +1,30 @@
 # -*- coding: utf-8 -*-
-from __future__ import print_function
+"""
+Prints the items of the Gilded Rose day by day, for the TextTest approval tests.
+
+    python texttest_fixture.py [DAYS] [--inventory FILE] [--format {texttest,csv,jsonl}]
+
+With --serve, the fixture stays up and answers requests instead, so that a test suite
+starts Python and imports the engine once rather than for every case:
+
+    python texttest_fixture.py --serve            # requests on stdin, answers on stdout
+    python texttest_fixture.py --serve PATH       # requests on the Unix socket PATH
+
+The request format is described in `fixture_server.py`, which only the server imports: the
+plain fixture that TextTest runs loads no more than the engine and the renderer.
+`texttest_client.py` sends the request of its command line and prints the answer,
+restarting the server when its sources changed.
+"""
+import sys
 
 from gilded_rose_enhanced import *
+from item_renderer import DayRenderer
 
-if __name__ == "__main__":
-    print ("OMGHAI!")
-    items = [
+OUTPUT_FORMATS = ("texttest", "csv", "jsonl")
+
+
+def fixture_items():
+    return [
              Item(name="+5 Dexterity Vest", sell_in=10, quality=20),
              Item(name="Aged Brie", sell_in=2, quality=0),
              Item(name="Elixir of the Mongoose", sell_in=5, quality=7),
@@ -17,14 +36,83 @@ if __name__ == "__main__":
              Item(name="Conjured Mana Cake", sell_in=3, quality=6),  # <-- :O
             ]
 
-    days = 10
-    import sys
-    if len(sys.argv) > 1:
-        days = int(sys.argv[1]) + 1
-    for day in range(days):
-        print("-------- day %s --------" % day)
-        print("name, sellIn, quality")
-        for item in items:
-            print(item)
-        print("")
-        GildedRose(items).update_quality()
+
+def load_inventory(path):
+    """
+    Reads the items of a CSV (with a header row) or JSON Lines inventory file.
+    """
+    from item_stream import read_records
+    fmt = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+    with open(path, newline="", encoding="utf-8") as inventory_file:
+        return [Item(record["name"], record["sell_in"], record["quality"])
+                for record in read_records(inventory_file, fmt)]
+
+
+def render(stream, days=None, inventory=None, fmt="texttest"):
+    """
+    Writes the output of the fixture to a binary stream.
+
+    Args:
+        stream (file): A binary stream.
+        days (int, optional): The last day shown. Defaults to 9.
+        inventory (str, optional): A CSV or JSON Lines file of items. Defaults to the
+            fixture items.
+        fmt (str, optional): "texttest" for the listing of every day, or "csv" or "jsonl"
+            for the items on the last day.
+
+    Raises:
+        ValueError: If the format is unknown, or `days` is negative with "csv" or "jsonl".
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError("unknown output format %r, expected one of %s" % (fmt, ", ".join(OUTPUT_FORMATS)))
+    days = 9 if days is None else int(days)
+    items = fixture_items() if inventory is None else load_inventory(inventory)
+    if fmt == "texttest":
+        # snapshots read the items without moving those at a fixed point back into the updates
+        gilded_rose = GildedRose(items, track_quiescent=True)
+        with DayRenderer(stream) as renderer:
+            renderer.write_line("OMGHAI!")
+            for day in range(days + 1):
+                renderer.render_day(day, gilded_rose.snapshot())
+                gilded_rose.update_quality()
+        return
+    import io
+    from item_stream import write_records
+    GildedRose(items).advance(days)
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    write_records([[{"name": item.name, "sell_in": item.sell_in, "quality": item.quality} for item in items]],
+                  text, fmt)
+    text.flush()
+    text.detach()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) <= 1 and all(arg.lstrip("-").isdigit() for arg in argv):
+        # the TextTest command line: days at most, parsed without importing argparse
+        sys.stdout.flush()
+        render(sys.stdout.buffer, int(argv[0]) if argv else None)
+        return 0
+    import argparse
+    parser = argparse.ArgumentParser(description="Print the Gilded Rose items day by day.")
+    parser.add_argument("days", nargs="?", type=int, help="the last day shown (default 9)")
+    parser.add_argument("--inventory", help="a CSV or JSON Lines file of items (default the fixture items)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="texttest",
+                        help="the listing of every day, or the items on the last day (default texttest)")
+    parser.add_argument("--serve", nargs="?", const="-", metavar="SOCKET",
+                        help='answer requests on a Unix socket, or on stdin when omitted or "-"')
+    args = parser.parse_args(argv)
+    if args.serve is not None:
+        import fixture_server
+        if args.serve == "-":
+            fixture_server.serve_stream(sys.stdin.buffer, sys.stdout.buffer, fixture_server.source_stamps())
+        else:
+            fixture_server.serve_socket(args.serve)
+    else:
+        sys.stdout.flush()
+        render(sys.stdout.buffer, args.days, args.inventory, args.format)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
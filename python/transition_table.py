@@ -0,0 +1,340 @@
+
+"""
+    This module contains precomputed transition tables for the daily update.
+
+    Each strategy is a function of (sell_in, quality) over a small domain: quality lies in
+    0..80, and the rules only look at sell_in close to the sell-by date. A `TransitionTables`
+    object runs every strategy of a registry once over that domain and records, for each
+    (strategy, sell_in bucket, quality), the next quality and the change of sell_in. The daily
+    update then becomes a table lookup, in pure Python for item lists and with a NumPy gather
+    for `ItemTable` columns.
+
+    sell_in values from `min_sell_in` to `max_sell_in` get a bucket each; values above share
+    a "far future" bucket and values below a "long expired" bucket. Strategies must therefore
+    behave the same for every sell_in beyond the window, as the built-in ones do, and depend
+    on the name only through the registry. Items whose quality is outside the tabulated range
+    are updated by their strategy.
+
+    The tables can be saved to disk and loaded again, so that warm starts skip the tabulation.
+    Saved tables only load for strategies that still update a few probe items the same way,
+    and whose rows at the edges of the sell_in window still match the saved ones.
+
+    Classes:
+        TransitionTables: Next-state tables of the strategies of a registry.
+
+    Functions:
+        strategy_fingerprint: Identifies the strategies that saved tables were built for.
+
+"""
+import json
+import struct
+import zlib
+from array import array
+
+from gilded_rose_enhanced import Item, default_registry
+
+try:
+    import numpy as np
+except ImportError:  # the NumPy kernel is optional
+    np = None
+
+_MAGIC = b"GRTT"
+_HEADER = struct.Struct("<4sI")  # magic, size of the JSON description in bytes
+
+# states run through each strategy for its fingerprint, around the usual rule thresholds
+_PROBE_SELL_INS = (-1000, -2, -1, 0, 1, 2, 5, 6, 10, 11, 1000)
+_PROBE_QUALITIES = (0, 1, 2, 25, 48, 49, 50, 79, 80)
+
+
+def _probe_checksum(strategy):
+    states = array("i")
+    for sell_in in _PROBE_SELL_INS:
+        for quality in _PROBE_QUALITIES:
+            item = Item("", sell_in, quality)
+            strategy.update_quality(item)
+            states.append(item.sell_in)
+            states.append(item.quality)
+    return zlib.crc32(states.tobytes())
+
+
+def strategy_fingerprint(registry):
+    """
+    Returns the class name and a probe checksum of each distinct strategy of a registry,
+    in table order.
+
+    The checksum covers the updates of a few items around the sell-by date, so strategies
+    of one class configured differently, or whose code changed, differ. Saved tables record
+    the fingerprint, and only load for registries with the same one.
+    """
+    return ["%s.%s:%08x" % (type(strategy).__module__, type(strategy).__qualname__, _probe_checksum(strategy))
+            for strategy in registry.strategies()]
+
+
+class TransitionTables:
+    """
+    Next-state tables of every strategy of a registry.
+
+    The tables are flat arrays indexed by `(table * buckets + bucket) * qualities + quality`,
+    where `table` is the position of the strategy in `registry.strategies()` and bucket 0 is
+    the "long expired" bucket.
+
+    Attributes:
+        registry (StrategyRegistry): The tabulated strategies.
+        min_sell_in (int): The lowest sell_in with a bucket of its own.
+        max_sell_in (int): The highest sell_in with a bucket of its own.
+        max_quality (int): The highest tabulated quality; qualities start at 0.
+        next_quality (array.array): The quality after one day, for each cell.
+        sell_in_change (array.array): The change of sell_in after one day, for each cell.
+
+    Methods:
+        update_quality(items): Updates a list of items by one day with table lookups.
+        kernel(): Builds a NumPy function updating ItemTable columns with table gathers.
+        save(path): Writes the tables to a file.
+        load(path, registry=None): Reads tables written by `save`.
+        load_or_build(path, registry=None, ...): Loads saved tables, or builds and saves them.
+    """
+
+    def __init__(self, registry=None, min_sell_in=-16, max_sell_in=64, max_quality=80, cells=None):
+        """
+        Tabulates the strategies of a registry.
+
+        Args:
+            registry (StrategyRegistry, optional): The strategies to tabulate. Defaults to
+                `default_registry()`.
+            min_sell_in (int, optional): The lowest sell_in with a bucket of its own.
+            max_sell_in (int, optional): The highest sell_in with a bucket of its own.
+            max_quality (int, optional): The highest tabulated quality.
+            cells (tuple, optional): Precomputed (next_quality, sell_in_change) arrays, as
+                read by `load`. The strategies are run when omitted.
+
+        Raises:
+            ValueError: If the sell_in window is empty or max_quality is negative.
+        """
+        if min_sell_in > max_sell_in:
+            raise ValueError("min_sell_in must not exceed max_sell_in")
+        if max_quality < 0:
+            raise ValueError("max_quality must not be negative, got %s" % max_quality)
+        self.registry = registry if registry is not None else default_registry()
+        self.min_sell_in = min_sell_in
+        self.max_sell_in = max_sell_in
+        self.max_quality = max_quality
+        self._strategies = self.registry.strategies()
+        self._buckets = max_sell_in - min_sell_in + 3
+        self._qualities = max_quality + 1
+        if cells is None:
+            cells = self._tabulate()
+        self.next_quality, self.sell_in_change = cells
+        self._tables = {}  # name -> (strategy, offset of its table)
+
+    def _row(self, strategy, sell_in):
+        next_quality = array("i")
+        sell_in_change = array("i")
+        for quality in range(self._qualities):
+            item = Item("", sell_in, quality)
+            strategy.update_quality(item)
+            next_quality.append(item.quality)
+            sell_in_change.append(item.sell_in - sell_in)
+        return next_quality, sell_in_change
+
+    def _tabulate(self):
+        next_quality = array("i")
+        sell_in_change = array("i")
+        # bucket 0 is represented by min_sell_in - 1, the last bucket by max_sell_in + 1
+        sell_ins = range(self.min_sell_in - 1, self.max_sell_in + 2)
+        for strategy in self._strategies:
+            for sell_in in sell_ins:
+                row_quality, row_change = self._row(strategy, sell_in)
+                next_quality.extend(row_quality)
+                sell_in_change.extend(row_change)
+        return next_quality, sell_in_change
+
+    def _edge_rows_match(self):
+        # the first and last buckets and the sell-by date, run again through the strategies
+        low = self.min_sell_in - 1
+        high = self.max_sell_in + 1
+        sell_ins = sorted({low, high} | {sell_in for sell_in in (-1, 0, 1) if low <= sell_in <= high})
+        qualities = self._qualities
+        for index, strategy in enumerate(self._strategies):
+            for sell_in in sell_ins:
+                start = (index * self._buckets + sell_in - low) * qualities
+                row_quality, row_change = self._row(strategy, sell_in)
+                if self.next_quality[start:start + qualities] != row_quality \
+                        or self.sell_in_change[start:start + qualities] != row_change:
+                    return False
+        return True
+
+    def _table_of(self, name):
+        table = self._tables.get(name)
+        if table is None:
+            strategy = self.registry.resolve(name)
+            index = next(index for index, known in enumerate(self._strategies) if known is strategy)
+            table = self._tables[name] = (strategy, index * self._buckets * self._qualities)
+        return table
+
+    def update_quality(self, items):
+        """
+        Updates a list of items in place by one day.
+
+        Gives the same results as `GildedRose(items, registry).update_quality()`.
+
+        Args:
+            items (list): The items to update.
+
+        Returns:
+            None
+        """
+        table_of = self._table_of
+        tables = self._tables
+        next_quality = self.next_quality
+        sell_in_change = self.sell_in_change
+        low = self.min_sell_in - 1
+        high = self.max_sell_in + 1
+        qualities = self._qualities
+        for item in items:
+            strategy, offset = tables.get(item.name) or table_of(item.name)
+            quality = item.quality
+            sell_in = item.sell_in
+            if 0 <= quality < qualities:
+                if sell_in < low:
+                    cell = offset + quality
+                elif sell_in > high:
+                    cell = offset + (high - low) * qualities + quality
+                else:
+                    cell = offset + (sell_in - low) * qualities + quality
+                item.quality = next_quality[cell]
+                item.sell_in = sell_in + sell_in_change[cell]
+            else:
+                strategy.update_quality(item)
+
+    def kernel(self):
+        """
+        Builds a function updating sell_in, quality and category columns in place by one day.
+
+        The category codes select the tables, so every strategy of the registry must have a
+        distinct category code, e.g. `ItemTable.from_items(items, registry, tables.kernel())`.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If a strategy has no category code, or two share one.
+
+        Returns:
+            function: kernel(sell_in, quality, category).
+        """
+        if np is None:
+            raise ImportError("the table kernel needs numpy")
+        categories = [strategy.category for strategy in self._strategies]
+        if None in categories or len(set(categories)) != len(categories):
+            raise ValueError("every strategy needs a distinct category code")
+        table_of = np.zeros(max(categories) + 1, dtype=np.intp)
+        table_of[categories] = range(len(categories))
+        shape = (len(categories), self._buckets, self._qualities)
+        next_quality = np.array(self.next_quality, dtype=np.int32).reshape(shape)
+        sell_in_change = np.array(self.sell_in_change, dtype=np.int32).reshape(shape)
+        strategies = self._strategies
+        low = self.min_sell_in - 1
+        high = self.max_sell_in + 1
+        max_quality = self.max_quality
+
+        def kernel(sell_in, quality, category):
+            tables = table_of[category]
+            buckets = np.clip(sell_in, low, high) - low
+            outside = (quality < 0) | (quality > max_quality)
+            cells = (tables, buckets, np.clip(quality, 0, max_quality))
+            updated_sell_in = sell_in + sell_in_change[cells]
+            updated_quality = next_quality[cells]
+            for row in np.flatnonzero(outside).tolist():
+                item = Item("", int(sell_in[row]), int(quality[row]))
+                strategies[tables[row]].update_quality(item)
+                updated_sell_in[row] = item.sell_in
+                updated_quality[row] = item.quality
+            sell_in[:] = updated_sell_in
+            quality[:] = updated_quality
+
+        return kernel
+
+    def _description(self):
+        return {
+            "strategies": strategy_fingerprint(self.registry),
+            "min_sell_in": self.min_sell_in,
+            "max_sell_in": self.max_sell_in,
+            "max_quality": self.max_quality,
+        }
+
+    def save(self, path):
+        """
+        Writes the tables to a file.
+
+        Args:
+            path (str): The file to write.
+        """
+        description = json.dumps(self._description()).encode("utf-8")
+        with open(path, "wb") as table_file:
+            table_file.write(_HEADER.pack(_MAGIC, len(description)))
+            table_file.write(description)
+            table_file.write(self.next_quality.tobytes())
+            table_file.write(self.sell_in_change.tobytes())
+
+    @classmethod
+    def load(cls, path, registry=None):
+        """
+        Reads tables written by `save`.
+
+        Args:
+            path (str): The file to read.
+            registry (StrategyRegistry, optional): The registry the tables were built for.
+                Defaults to `default_registry()`.
+
+        Raises:
+            ValueError: If the file holds no tables, or tables of other strategies: another
+                fingerprint, or rows at the edges of the sell_in window that the strategies
+                no longer give.
+
+        Returns:
+            TransitionTables: The tables, without running the strategies.
+        """
+        if registry is None:
+            registry = default_registry()
+        with open(path, "rb") as table_file:
+            data = table_file.read()
+        if len(data) < _HEADER.size:
+            raise ValueError("%s holds no transition tables" % path)
+        magic, size = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("%s holds no transition tables" % path)
+        description = json.loads(data[_HEADER.size:_HEADER.size + size].decode("utf-8"))
+        if description["strategies"] != strategy_fingerprint(registry):
+            raise ValueError("%s was built for other strategies" % path)
+        next_quality = array("i")
+        sell_in_change = array("i")
+        cells = data[_HEADER.size + size:]
+        middle = len(cells) // 2
+        next_quality.frombytes(cells[:middle])
+        sell_in_change.frombytes(cells[middle:])
+        tables = cls(registry, description["min_sell_in"], description["max_sell_in"],
+                     description["max_quality"], (next_quality, sell_in_change))
+        if len(next_quality) != len(tables._strategies) * tables._buckets * tables._qualities:
+            raise ValueError("%s holds truncated transition tables" % path)
+        if not tables._edge_rows_match():
+            raise ValueError("%s disagrees with the strategies of the registry" % path)
+        return tables
+
+    @classmethod
+    def load_or_build(cls, path, registry=None, min_sell_in=-16, max_sell_in=64, max_quality=80):
+        """
+        Loads the tables saved in a file, or builds them and saves them there.
+
+        Tables saved for other strategies or another domain are rebuilt and overwritten.
+
+        Returns:
+            TransitionTables: The tables.
+        """
+        try:
+            tables = cls.load(path, registry)
+        except (OSError, ValueError):
+            tables = None
+        if tables is not None and (tables.min_sell_in, tables.max_sell_in, tables.max_quality) \
+                == (min_sell_in, max_sell_in, max_quality):
+            return tables
+        tables = cls(registry, min_sell_in, max_sell_in, max_quality)
+        tables.save(path)
+        return tables